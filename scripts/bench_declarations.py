@@ -0,0 +1,61 @@
+# Compare the declaration outline of a file with counting brackets from each declaration.
+
+import argparse
+import timeit
+
+from mkdocstrings_handlers.go._internal.helpers import _extract_go_block
+from mkdocstrings_handlers.go._internal.sources import _scan_declarations
+
+_FUNCTION = """\
+func Handle{index}(w http.ResponseWriter, r *http.Request) error {{
+\tif r.Method != "POST" {{
+\t\treturn fmt.Errorf("method %s: want {{POST}}", r.Method)
+\t}}
+\tfor _, header := range []string{{"Accept", "Content-Type"}} {{
+\t\tw.Header().Set(header, r.Header.Get(header))
+\t}}
+\treturn nil
+}}
+"""
+
+
+def _generate(functions: int) -> tuple[str, list[int]]:
+    """Generate a Go source file, and the first line of each function."""
+    chunks = ["package handlers\n\n"]
+    starts = []
+    line = 3
+    for index in range(functions):
+        chunk = _FUNCTION.format(index=index) + "\n"
+        starts.append(line)
+        line += chunk.count("\n")
+        chunks.append(chunk)
+    return "".join(chunks), starts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the declaration outline with counting brackets.")
+    parser.add_argument("-n", "--number", type=int, default=5, help="Number of rounds.")
+    parser.add_argument("--functions", type=int, default=5000, help="Number of functions in the generated file.")
+    args = parser.parse_args()
+
+    text, starts = _generate(args.functions)
+    lines = text.splitlines(keepends=True)
+    print(f"file:     {len(lines)} lines, {len(starts)} functions")
+
+    def outline() -> list[list[str]]:
+        spans = _scan_declarations(text).spans
+        return [lines[start - 1 : spans[start]] for start in starts]
+
+    def brackets() -> list[list[str]]:
+        return [_extract_go_block(lines, start, "func") for start in starts]
+
+    if outline() != brackets():
+        raise SystemExit("The outline and bracket counting extract different blocks")
+
+    for name, function in (("outline", outline), ("brackets", brackets)):
+        seconds = timeit.timeit(function, number=args.number) / args.number
+        print(f"{name + ':':9} {seconds:10.3f} s per file")
+
+
+if __name__ == "__main__":
+    main()
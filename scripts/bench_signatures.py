@@ -0,0 +1,46 @@
+# Compare the in-process signature wrapper with golines subprocesses.
+
+import argparse
+import timeit
+
+from mkdocstrings_handlers.go._internal.formatting import _Formatter
+from mkdocstrings_handlers.go._internal.signatures import _wrap_signature
+
+_SIGNATURES = [
+    "func Handle(w http.ResponseWriter, r *http.Request, next func(http.ResponseWriter, *http.Request)) ()",
+    "func Map[T, U any](items []T, transform func(T) (U, error)) (results []U, err error)",
+    "func NewServer(address string, handlers map[string]Handler, options ...Option) (*Server, error)",
+    "func Parse(input []byte, strict bool) (node *Node, warnings []Warning, err error)",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the signature wrapper with golines.")
+    parser.add_argument("-n", "--number", type=int, default=20, help="Number of rounds.")
+    parser.add_argument("--line-length", type=int, default=60, help="Maximum line length.")
+    parser.add_argument("--golines", default="~/go/bin/golines", help="Path to the golines executable.")
+    args = parser.parse_args()
+
+    def python() -> None:
+        for signature in _SIGNATURES:
+            _wrap_signature(signature, args.line_length)
+
+    per_signature = timeit.timeit(python, number=args.number) / args.number / len(_SIGNATURES)
+    print(f"python:  {per_signature * 1e6:10.1f} µs per signature")
+
+    formatter = _Formatter()
+    formatter.configure("golines", args.golines, cache=None)
+    if not formatter.available:
+        print(f"golines: not found at {args.golines}")
+        return
+
+    def golines() -> None:
+        for signature in _SIGNATURES:
+            formatter._run(signature, args.line_length)
+
+    per_signature = timeit.timeit(golines, number=args.number) / args.number / len(_SIGNATURES)
+    print(f"golines: {per_signature * 1e6:10.1f} µs per signature")
+
+
+if __name__ == "__main__":
+    main()
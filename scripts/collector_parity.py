@@ -0,0 +1,75 @@
+# Compare the Python collector with godocjson on Go packages, for example the standard library.
+
+import argparse
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+
+from mkdocstrings_handlers.go._internal.parser import _parse_package
+
+
+def _differences(expected: object, actual: object, path: str = "") -> list[str]:
+    if type(expected) is not type(actual):
+        return [f"{path}: {expected!r} != {actual!r}"]
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        keys = sorted(set(expected) | set(actual))
+        return [diff for key in keys for diff in _differences(expected.get(key), actual.get(key), f"{path}.{key}")]
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: {len(expected)} items != {len(actual)} items"]
+        return [
+            diff for index, pair in enumerate(zip(expected, actual)) for diff in _differences(*pair, f"{path}[{index}]")
+        ]
+    return [] if expected == actual else [f"{path}: {expected!r} != {actual!r}"]
+
+
+def _without_fields(data: dict) -> dict:
+    for typ in data["types"]:
+        typ.pop("fields", None)
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the Python collector with godocjson.")
+    parser.add_argument("roots", nargs="+", help="Directories searched for Go packages.")
+    parser.add_argument("--godocjson", default="~/go/bin/godocjson", help="Path to the godocjson executable.")
+    args = parser.parse_args()
+    godocjson = os.path.expanduser(args.godocjson)
+
+    directories = sorted(
+        Path(directory)
+        for root in args.roots
+        for directory, _, filenames in os.walk(root)
+        if "testdata" not in Path(directory).parts and any(name.endswith(".go") for name in filenames)
+    )
+    timings = {"godocjson": 0.0, "python": 0.0}
+    compared = failed = 0
+    for directory in directories:
+        start = time.perf_counter()
+        result = subprocess.run([godocjson, directory], capture_output=True, text=True, check=False)  # noqa: S603
+        timings["godocjson"] += time.perf_counter() - start
+        if result.returncode or not result.stdout:
+            continue
+        start = time.perf_counter()
+        actual = _without_fields(_parse_package(directory))
+        timings["python"] += time.perf_counter() - start
+        expected = json.loads(result.stdout)
+        # With several packages in a directory, godocjson documents any of them.
+        if expected["name"] != actual["name"]:
+            continue
+        compared += 1
+        if differences := _differences(expected, actual):
+            failed += 1
+            print(f"{directory}:")
+            for difference in differences[:10]:
+                print(f"  {difference}")
+
+    print(f"{compared - failed}/{compared} packages identical")
+    for name, seconds in timings.items():
+        print(f"{name + ':':10} {seconds:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
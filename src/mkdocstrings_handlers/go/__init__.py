@@ -6,11 +6,8 @@ from mkdocstrings_handlers.go._internal.config import (
     GoInputOptions,
     GoOptions,
 )
-from mkdocstrings_handlers.go._internal.handler import (
-    GoHandler,
-    _find_dicts_with_value,
-    get_handler,
-)
+from mkdocstrings_handlers.go._internal.handler import GoHandler, get_handler
+from mkdocstrings_handlers.go._internal.helpers import _find_dicts_with_value
 from mkdocstrings_handlers.go._internal.rendering import (
     do_format_code,
     do_format_const_signature,
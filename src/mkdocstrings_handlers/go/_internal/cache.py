@@ -0,0 +1,231 @@
+# Persistent caches shared between builds.
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from mkdocstrings import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_logger = get_logger(__name__)
+
+
+def _default_cache_dir() -> Path:
+    """Return the user-level cache directory of the handler.
+
+    Returns:
+        The cache directory, honoring `XDG_CACHE_HOME`.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "mkdocstrings-go"
+
+
+def _file_identity(path: Path) -> str:
+    """Describe a file by its location, size and modification time.
+
+    Parameters:
+        path: The file to describe.
+
+    Returns:
+        A string that changes whenever the file is replaced or rebuilt.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return f"{path}:missing"
+    return f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _tree_identity(directories: Iterable[str | Path]) -> str:
+    """Describe the files of directory trees by their location, size and modification time.
+
+    Parameters:
+        directories: The directories to describe, missing ones are ignored.
+
+    Returns:
+        A hexadecimal digest that changes whenever a file is added, removed or modified.
+    """
+    digest = hashlib.sha256()
+    for directory in directories:
+        for root, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                digest.update(_file_identity(Path(root, filename)).encode())
+                digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _hash_package(directory: Path, *salt: str, files: Iterable[str] | None = None) -> str:
+    """Hash the contents of the Go files of a package directory.
+
+    Parameters:
+        directory: The package directory.
+        *salt: Additional strings mixed into the hash (tool versions, paths...).
+        files: The names of the Go files of the package, when already known. Listed from the directory otherwise.
+
+    Returns:
+        A hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    for part in salt:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    if files is None:
+        files = (entry.name for entry in os.scandir(directory) if entry.name.endswith(".go") and entry.is_file())
+    for name in sorted(files):
+        digest.update(name.encode())
+        digest.update(b"\0")
+        with open(os.path.join(directory, name), "rb") as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+class _DiskCache:
+    """A size-bounded cache of JSON documents on disk, evicting least recently used entries first."""
+
+    def __init__(self, directory: Path, max_size: int) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            directory: The directory holding the cache entries.
+            max_size: The maximum total size of the entries, in bytes.
+        """
+        self.directory = directory
+        """The directory holding the cache entries."""
+        self.max_size = max_size
+        """The maximum total size of the entries, in bytes."""
+        self._size: int | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Any:
+        """Return the document stored under the given key.
+
+        Parameters:
+            key: The cache key.
+
+        Returns:
+            The cached document, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with path.open(encoding="utf-8") as file:
+                value = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            _logger.debug("Dropping unreadable cache entry %s: %s", path, error)
+            path.unlink(missing_ok=True)
+            return None
+        # Touch the entry so that eviction drops the least recently used ones first.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a document under the given key.
+
+        Parameters:
+            key: The cache key.
+            value: The JSON-serializable document.
+        """
+        path = self._path(key)
+        data = json.dumps(value).encode()
+        # Write atomically so that concurrent builds never read partial entries.
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError as error:
+            _logger.debug("Could not write cache entry %s: %s", path, error)
+            return
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            # Rewritten entries replace their previous size in the running total.
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+        except OSError as error:
+            _logger.debug("Could not write cache entry %s: %s", path, error)
+            Path(tmp).unlink(missing_ok=True)
+            return
+        if self._size is not None:
+            self._size += len(data) - replaced
+        self._evict()
+
+    def _evict(self) -> None:
+        # The running total never underestimates the size between scans, so a scan is needed only once it exceeds the limit.
+        if self._size is not None and self._size <= self.max_size:
+            return
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+
+
+class _MemoryCache:
+    """A cache of objects in memory, evicting least recently used entries first."""
+
+    def __init__(self, max_entries: int) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            max_entries: The maximum number of entries.
+        """
+        self.max_entries = max_entries
+        """The maximum number of entries."""
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """Return the object stored under the given key.
+
+        Parameters:
+            key: The cache key.
+
+        Returns:
+            The cached object, or None on a miss.
+        """
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store an object under the given key.
+
+        Parameters:
+            key: The cache key.
+            value: The object.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,555 @@
+# Engines collecting the documentation data of Go packages.
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass, replace
+from functools import cached_property
+from os.path import expanduser
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, Literal
+
+from mkdocstrings import get_logger
+
+from mkdocstrings_handlers.go._internal.cache import _default_cache_dir, _file_identity, _hash_package
+from mkdocstrings_handlers.go._internal.debug import _get_version
+from mkdocstrings_handlers.go._internal.parser import _parse_package
+from mkdocstrings_handlers.go._internal.workers import _build_worker, _WorkerPool
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+_logger = get_logger(__name__)
+
+_Engine = Literal["auto", "godocjson", "python", "snapshot", "worker"]
+
+# Keys of the documentation data holding paths, made relative to the package directory in snapshots.
+_PATH_KEYS = frozenset(("importPath", "packageImportPath", "filename", "filenames"))
+_SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class _Capabilities:
+    """What a collector engine provides, and how it is best called."""
+
+    line_numbers: bool
+    """Whether functions and values come with their file and line, needed to show their source."""
+    fields: bool
+    """Whether the fields of struct types are collected."""
+    batching: bool
+    """Whether several packages are best collected in a single call, rather than one call per package in parallel."""
+    persistent: bool
+    """Whether the engine keeps its results across builds itself, so that the package cache is bypassed."""
+
+
+@dataclass(frozen=True)
+class _CollectorOptions:
+    """The settings collector engines are created from."""
+
+    godocjson_path: str = "~/go/bin/godocjson"
+    """The path of the godocjson executable."""
+    snapshot: Path | None = None
+    """The snapshot file, if any."""
+    cache_dir: Path | None = None
+    """The directory of the persistent caches, where the worker command is built."""
+    workers: int | None = None
+    """The maximum number of packages collected concurrently."""
+
+
+class _Collector(abc.ABC):
+    """Collect the documentation data of Go packages, in the shape of godocjson output."""
+
+    name: ClassVar[str]
+    """The name of the engine, as selected in the configuration."""
+    capabilities: ClassVar[_Capabilities]
+    """What the engine provides."""
+
+    def __init__(self, options: _CollectorOptions) -> None:
+        """Initialize the engine.
+
+        Parameters:
+            options: The collector settings.
+        """
+        self.options = options
+        """The collector settings."""
+
+    @property
+    def available(self) -> bool:
+        """Whether the engine can run in this environment."""
+        return True
+
+    @property
+    def identity(self) -> str:
+        """A string that changes whenever the engine could produce different data."""
+        return _get_version()
+
+    @abc.abstractmethod
+    def collect(self, directory: Path) -> dict:
+        """Collect the documentation data of a package.
+
+        Parameters:
+            directory: The package directory.
+
+        Returns:
+            The documentation data.
+        """
+
+    async def collect_async(self, directory: Path) -> dict:
+        """Collect the documentation data of a package, without blocking the event loop.
+
+        Parameters:
+            directory: The package directory.
+
+        Returns:
+            The documentation data.
+        """
+        return await asyncio.to_thread(self.collect, directory)
+
+    def collect_many(self, directories: Sequence[Path]) -> dict[Path, dict | Exception]:
+        """Collect the documentation data of several packages.
+
+        Parameters:
+            directories: The package directories.
+
+        Returns:
+            The data of each package, or the error raised while collecting it.
+        """
+        results: dict[Path, dict | Exception] = {}
+        for directory in directories:
+            try:
+                results[directory] = self.collect(directory)
+            except Exception as error:  # noqa: BLE001
+                results[directory] = error
+        return results
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources of the engine, at the end of the build."""
+
+
+_COLLECTORS: dict[str, type[_Collector]] = {}
+
+
+def _register_collector(cls: type[_Collector]) -> type[_Collector]:
+    """Register a collector engine, selectable by its name.
+
+    With the `auto` engine, registered engines are tried in registration order.
+
+    Parameters:
+        cls: The engine class.
+
+    Returns:
+        The engine class.
+    """
+    _COLLECTORS[cls.name] = cls
+    return cls
+
+
+@_register_collector
+class _GodocjsonCollector(_Collector):
+    """Run the godocjson command once per package."""
+
+    name = "godocjson"
+    capabilities = _Capabilities(line_numbers=True, fields=False, batching=False, persistent=False)
+
+    @property
+    def executable(self) -> str:
+        """The path of the godocjson executable."""
+        return expanduser(self.options.godocjson_path)
+
+    @property
+    def available(self) -> bool:
+        """Whether godocjson is installed."""
+        return shutil.which(self.executable) is not None
+
+    @property
+    def identity(self) -> str:
+        """The identity of the godocjson executable and of the handler."""
+        return f"{_file_identity(Path(self.executable))}:{_get_version()}"
+
+    def collect(self, directory: Path) -> dict:
+        """Run the godocjson command and return parsed JSON output.
+
+        Parameters:
+            directory: The package directory to pass to godocjson.
+
+        Returns:
+            The parsed JSON documentation data.
+
+        Raises:
+            RuntimeError: If the subprocess call fails.
+            ValueError: If the resulting output is empty.
+        """
+        try:
+            result = subprocess.run(  # noqa: S603
+                [self.executable, directory],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"godocjson failed:\n{e.stderr.strip()}") from e
+        return self._result(result.stdout)
+
+    async def collect_async(self, directory: Path) -> dict:
+        """Run the godocjson command in a subprocess awaited by the event loop.
+
+        Parameters:
+            directory: The package directory to pass to godocjson.
+
+        Returns:
+            The parsed JSON documentation data.
+
+        Raises:
+            RuntimeError: If the subprocess call fails.
+        """
+        process = await asyncio.create_subprocess_exec(
+            self.executable,
+            str(directory),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode:
+            raise RuntimeError(f"godocjson failed:\n{stderr.decode(errors='replace').strip()}")
+        return self._result(stdout.decode())
+
+    @staticmethod
+    def _result(stdout: str) -> dict:
+        """Parse the output of godocjson.
+
+        Parameters:
+            stdout: The output of godocjson.
+
+        Returns:
+            The parsed JSON documentation data.
+
+        Raises:
+            ValueError: If the output is empty.
+        """
+        if not stdout:
+            raise ValueError("Provided package contains empty file")
+        return json.loads(stdout)
+
+
+@_register_collector
+class _PythonCollector(_Collector):
+    """Parse Go files in-process, without any Go tooling."""
+
+    name = "python"
+    # Parsing holds the GIL: packages are parsed one after the other rather than in threads.
+    capabilities = _Capabilities(line_numbers=True, fields=True, batching=True, persistent=False)
+
+    def collect(self, directory: Path) -> dict:
+        """Parse the Go files of a package.
+
+        Parameters:
+            directory: The package directory.
+
+        Returns:
+            The documentation data.
+        """
+        return _parse_package(directory)
+
+
+def _relocate(data: Any, old: str, new: str) -> Any:
+    """Replace the directory prefix of the paths in documentation data.
+
+    Parameters:
+        data: The documentation data of a package, or part of it.
+        old: The directory prefix to replace.
+        new: The replacement prefix.
+
+    Returns:
+        A copy of the data with relocated paths.
+    """
+    if isinstance(data, list):
+        return [_relocate(value, old, new) for value in data]
+    if not isinstance(data, dict):
+        return data
+    relocated = {}
+    for key, value in data.items():
+        if key not in _PATH_KEYS:
+            relocated[key] = _relocate(value, old, new)
+        elif isinstance(value, list):
+            relocated[key] = [_relocate_path(path, old, new) for path in value]
+        else:
+            relocated[key] = _relocate_path(value, old, new)
+    return relocated
+
+
+def _relocate_path(path: str, old: str, new: str) -> str:
+    return new + path[len(old) :] if isinstance(path, str) and path.startswith(old) else path
+
+
+@_register_collector
+class _SnapshotCollector(_Collector):
+    """Read packages from a snapshot file, collecting new and modified ones with a live engine.
+
+    The snapshot maps package directories, relative to the snapshot file, to the hash of their Go files
+    and their documentation data with relative paths. It can be committed or cached by CI, to build
+    without Go tooling. Packages collected live are added to the snapshot, written back when the build ends.
+    """
+
+    name = "snapshot"
+    capabilities = _Capabilities(line_numbers=True, fields=True, batching=True, persistent=True)
+
+    def __init__(self, options: _CollectorOptions) -> None:
+        """Initialize the engine.
+
+        Parameters:
+            options: The collector settings.
+        """
+        super().__init__(options)
+        self.hits = 0
+        """The number of packages read from the snapshot."""
+        self._packages: dict[str, dict] | None = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether a snapshot file is configured."""
+        return self.options.snapshot is not None
+
+    @cached_property
+    def live(self) -> _Collector:
+        """The engine collecting the packages missing from the snapshot, or modified since."""
+        return _select_collector("auto", replace(self.options, snapshot=None))
+
+    @property
+    def root(self) -> Path:
+        """The directory package paths are relative to."""
+        return (self.options.snapshot or Path()).parent
+
+    def _load(self) -> dict[str, dict]:
+        if self._packages is None:
+            packages = {}
+            try:
+                with open(self.options.snapshot or "", encoding="utf-8") as file:
+                    snapshot = json.load(file)
+                if snapshot.get("version") == _SNAPSHOT_VERSION:
+                    packages = snapshot["packages"]
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError) as error:
+                _logger.warning("Ignoring unreadable snapshot %s: %s", self.options.snapshot, error)
+            self._packages = packages
+        return self._packages
+
+    def _key(self, directory: Path) -> str:
+        return os.path.relpath(os.path.realpath(directory), os.path.realpath(self.root)).replace(os.sep, "/")
+
+    def collect(self, directory: Path) -> dict:
+        """Read a package from the snapshot, or collect it with the live engine.
+
+        Parameters:
+            directory: The package directory.
+
+        Returns:
+            The documentation data.
+        """
+        key = self._key(directory)
+        digest = _hash_package(directory)
+        with self._lock:
+            entry = self._load().get(key)
+            hit = entry is not None and entry.get("hash") == digest
+            if hit:
+                self.hits += 1
+        if hit:
+            return _relocate(entry["data"], "", str(directory))  # type: ignore[index]
+
+        data = self.live.collect(directory)
+        entry = {"hash": digest, "data": _relocate(data, str(directory), "")}
+        with self._lock:
+            self._load()[key] = entry
+            self._dirty = True
+        return data
+
+    def close(self) -> None:
+        """Write the snapshot back, if packages were collected live."""
+        if "live" in self.__dict__:
+            self.live.close()
+        if not self._dirty or self.options.snapshot is None:
+            return
+        path = self.options.snapshot
+        data = json.dumps({"version": _SNAPSHOT_VERSION, "packages": self._packages}, sort_keys=True)
+        # Write atomically so that concurrent builds never read partial snapshots.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError as error:
+            _logger.warning("Could not write snapshot %s: %s", path, error)
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(tmp, path)
+        except OSError as error:
+            _logger.warning("Could not write snapshot %s: %s", path, error)
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            return
+        self._dirty = False
+        _logger.debug("Wrote %d packages to snapshot %s (%d read from it)", len(self._packages or ()), path, self.hits)
+
+
+@_register_collector
+class _WorkerCollector(_Collector):
+    """Send packages to a pool of long-running workers, documenting them like godocjson.
+
+    The worker command is built with `go build` into the cache directory, on first use.
+    It is never picked automatically, since the Python parser is always available.
+    Packages the workers do not document in time are documented by the godocjson command instead.
+    """
+
+    name = "worker"
+    capabilities = _Capabilities(line_numbers=True, fields=False, batching=True, persistent=False)
+
+    def __init__(self, options: _CollectorOptions) -> None:
+        """Initialize the engine.
+
+        Parameters:
+            options: The collector settings.
+        """
+        super().__init__(options)
+        self._pool: _WorkerPool | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def go(self) -> str | None:
+        """The path of the go command, if installed."""
+        return shutil.which("go")
+
+    @property
+    def available(self) -> bool:
+        """Whether Go is installed, to build the worker."""
+        return self.go is not None
+
+    @property
+    def identity(self) -> str:
+        """The identity of the go command and of the handler."""
+        return f"{_file_identity(Path(self.go or ''))}:{_get_version()}"
+
+    @property
+    def pool(self) -> _WorkerPool:
+        """The pool of workers, built and started on first use."""
+        with self._lock:
+            if self._pool is None:
+                executable = _build_worker(self.go or "go", self.options.cache_dir or _default_cache_dir())
+                self._pool = _WorkerPool(executable, self.options.workers or os.cpu_count() or 1)
+            return self._pool
+
+    def collect(self, directory: Path) -> dict:
+        """Document a package with one of the workers.
+
+        Parameters:
+            directory: The package directory.
+
+        Returns:
+            The parsed JSON documentation data.
+        """
+        try:
+            response = self.pool.request(directory)
+        except TimeoutError as error:
+            return self._fallback(directory, error)
+        return self._result(response)
+
+    def collect_many(self, directories: Sequence[Path]) -> dict[Path, dict | Exception]:
+        """Document several packages with all the workers in parallel.
+
+        Parameters:
+            directories: The package directories.
+
+        Returns:
+            The data of each package, or the error raised while collecting it.
+        """
+        results: dict[Path, dict | Exception] = {}
+        for directory, response in zip(directories, self.pool.map(directories)):
+            try:
+                if isinstance(response, TimeoutError):
+                    results[directory] = self._fallback(directory, response)
+                else:
+                    results[directory] = response if isinstance(response, Exception) else self._result(response)
+            except Exception as error:  # noqa: BLE001
+                results[directory] = error
+        return results
+
+    def _fallback(self, directory: Path, error: TimeoutError) -> dict:
+        """Document a package with the godocjson command, after a worker timed out on it.
+
+        Parameters:
+            directory: The package directory.
+            error: The timeout of the worker.
+
+        Returns:
+            The parsed JSON documentation data.
+
+        Raises:
+            RuntimeError: If godocjson is not installed.
+        """
+        fallback = _GodocjsonCollector(self.options)
+        if not fallback.available:
+            raise RuntimeError(f"godocjson worker timed out on {directory}: {error}") from error
+        _logger.warning("godocjson worker timed out on %s, running godocjson instead", directory)
+        return fallback.collect(directory)
+
+    @staticmethod
+    def _result(response: dict) -> dict:
+        """Return the documentation data of a worker response, with the errors of godocjson.
+
+        Parameters:
+            response: The worker response.
+
+        Returns:
+            The documentation data.
+
+        Raises:
+            RuntimeError: If the worker could not parse the package.
+            ValueError: If the package is empty.
+        """
+        if "error" in response:
+            raise RuntimeError(f"godocjson failed:\n{response['error']}")
+        if not response.get("package"):
+            raise ValueError("Provided package contains empty file")
+        return response["package"]
+
+    def close(self) -> None:
+        """Stop the workers."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+
+def _select_collector(engine: _Engine, options: _CollectorOptions) -> _Collector:
+    """Create the collector engine of a build.
+
+    Parameters:
+        engine: The engine name, or `auto` for the first available registered engine:
+            snapshots when a snapshot file is configured, then godocjson, then the Python parser.
+        options: The collector settings.
+
+    Returns:
+        The engine.
+    """
+    if engine != "auto":
+        collector = _COLLECTORS[engine](options)
+        if collector.available:
+            return collector
+        _logger.warning("Collector %s is not available, choosing one automatically", engine)
+    # Engines are tried in registration order, except the persistent snapshot engine, which wraps the others:
+    # it goes first. The worker engine, registered after the always available Python parser, is never reached.
+    for cls in sorted(_COLLECTORS.values(), key=lambda cls: not cls.capabilities.persistent):
+        collector = cls(options)
+        if collector.available:
+            _logger.debug("Collecting packages with %s", collector.name)
+            return collector
+    return _PythonCollector(options)
@@ -298,6 +298,93 @@ class GoInputConfig:
         _Field(description="The paths in which to search for Go packages."),
     ] = field(default_factory=lambda: ["."])
 
+    prefetch: Annotated[
+        bool,
+        _Field(description="Whether to parse all packages referenced in the documentation pages in parallel."),
+    ] = True
+
+    workers: Annotated[
+        int | None,
+        _Field(description="The maximum number of packages parsed concurrently. Defaults to the number of CPUs."),
+    ] = None
+
+    discovery: Annotated[
+        Literal["auto", "go", "scan", "none"],
+        _Field(
+            description="""How packages are discovered in the search paths.
+
+            `go` lists them with a single `go list` per search path, `scan` walks the file system,
+            `auto` uses `go list` when it works and walks the file system otherwise.
+            With `none`, each package is looked up separately.
+            """,
+        ),
+    ] = "auto"
+
+    collector: Annotated[
+        Literal["auto", "godocjson", "python", "snapshot", "worker"],
+        _Field(
+            description="""How the documentation of packages is collected.
+
+            `godocjson` runs the godocjson command once per package, `python` parses Go files in-process,
+            without any Go tooling. `worker` sends packages to long-running processes documenting them
+            like godocjson, built with Go on first use. `snapshot` reads packages from the `snapshot` file, collecting
+            new and modified ones live. `auto` picks `snapshot` when a snapshot file is configured,
+            then `godocjson` if it is installed, then `python`.
+            Struct fields are only collected by the `python` collector, and snapshots made with it.
+            """,
+        ),
+    ] = "auto"
+
+    snapshot: Annotated[
+        str | None,
+        _Field(
+            description="""A file of collected packages, relative to the configuration file.
+
+            Packages collected live are added to it at the end of the build, so that it can be committed
+            or cached to build without Go tooling.
+            """,
+        ),
+    ] = None
+
+    formatter: Annotated[
+        Literal["auto", "golines", "gofmt", "python", "none"],
+        _Field(
+            description="""The formatter of source code and signatures.
+
+            Source code is formatted by `golines` or `gofmt`, signatures are always wrapped in-process,
+            unless the formatter is `none`. With `python`, only signatures are formatted.
+            `auto` picks the first installed one of `golines` and `gofmt`, then `python`.
+            """,
+        ),
+    ] = "auto"
+
+    formatter_path: Annotated[
+        str | None,
+        _Field(
+            description="The path of the formatter executable. Defaults to `~/go/bin/golines`, then the `PATH`.",
+        ),
+    ] = None
+
+    cache: Annotated[
+        bool,
+        _Field(description="Whether to persist parsed packages, formatted code and rendered HTML across builds."),
+    ] = True
+
+    cache_dir: Annotated[
+        str | None,
+        _Field(
+            description="""The directory of the persistent caches, relative to the configuration file.
+
+            Defaults to `mkdocstrings-go` in the user cache directory (`XDG_CACHE_HOME` or `~/.cache`).
+            """,
+        ),
+    ] = None
+
+    cache_size: Annotated[
+        int,
+        _Field(description="The maximum size of each persistent cache, in megabytes."),
+    ] = 100
+
     @classmethod
     def coerce(cls, **data: Any) -> MutableMapping[str, Any]:
         """Coerce data."""
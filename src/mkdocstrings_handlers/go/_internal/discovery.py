@@ -0,0 +1,233 @@
+# Discovery of the Go packages under the search paths.
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from mkdocstrings import get_logger
+
+from mkdocstrings_handlers.go._internal.packages import _MODULE_RE, _SKIPPED_DIRS, _read
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+_logger = get_logger(__name__)
+
+_Discovery = Literal["auto", "go", "scan", "none"]
+
+# Only the fields we use are computed and printed by `go list`.
+_GO_LIST_FIELDS = (
+    "ImportPath",
+    "Dir",
+    "Name",
+    "GoFiles",
+    "CgoFiles",
+    "IgnoredGoFiles",
+    "TestGoFiles",
+    "XTestGoFiles",
+    "Imports",
+    "Error",
+)
+# Never download modules or toolchains while listing packages.
+_GO_ENV = {"GOPROXY": "off", "GOTOOLCHAIN": "local"}
+_GO_FILES_FIELDS = ("GoFiles", "CgoFiles", "IgnoredGoFiles", "TestGoFiles", "XTestGoFiles")
+_CHUNK_SIZE = 64 * 1024
+
+_PACKAGE_RE = re.compile(r"^package\s+(\w+)", re.MULTILINE)
+# The imports are declared before any other top-level declaration.
+_HEADER_END_RE = re.compile(r"^(?:func|type|var|const)\b", re.MULTILINE)
+_IMPORT_RE = re.compile(r"^import\s*(?:\(([^)]*)\)|[\w.]*\s*(\"[^\"]+\"))", re.MULTILINE)
+_IMPORT_PATH_RE = re.compile(r"\"([^\"]+)\"")
+
+
+@dataclass(frozen=True)
+class _Package:
+    """A Go package found under a search path."""
+
+    import_path: str
+    """The import path of the package."""
+    directory: Path
+    """The directory of the package."""
+    name: str
+    """The name of the package, from its package clause."""
+    go_files: tuple[str, ...]
+    """The names of all the Go files of the package, tests included, sorted."""
+    imports: tuple[str, ...]
+    """The import paths of the packages it imports, sorted."""
+
+
+def _decode_stream(chunks: Iterable[str]) -> Iterator[dict]:
+    """Decode a stream of concatenated JSON objects, as printed by `go list -json`.
+
+    Parameters:
+        chunks: The text of the stream, in chunks of any size.
+
+    Yields:
+        The decoded objects, as soon as they are complete.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+            yield obj
+        buffer = buffer[position:]
+    if buffer.strip():
+        raise ValueError("Truncated JSON stream")
+
+
+def _go_list(root: str, go: str) -> Iterator[_Package]:
+    """List the packages under a search path with `go list`.
+
+    Parameters:
+        root: The search path, within a Go module or workspace.
+        go: The path of the go executable.
+
+    Yields:
+        The packages, as `go list` prints them.
+
+    Raises:
+        RuntimeError: If `go list` fails, for example outside of a module.
+    """
+    command = [go, "list", "-e", f"-json={','.join(_GO_LIST_FIELDS)}", "./..."]
+    # Errors go to a file: a full stderr pipe would block `go list` while we read its output.
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as stderr:
+        with subprocess.Popen(  # noqa: S603
+            command,
+            cwd=root,
+            env={**os.environ, **_GO_ENV},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+        ) as process:
+            stdout = process.stdout
+            if stdout is None:
+                raise RuntimeError("Could not read the output of go list")
+            for data in _decode_stream(iter(lambda: stdout.read(_CHUNK_SIZE), "")):
+                if not data.get("Dir"):
+                    # Patterns matching nothing, for example outside of modules, are reported as packages.
+                    if error := data.get("Error"):
+                        raise RuntimeError(f"go list failed in {root}: {error.get('Err', error)}")
+                    continue
+                yield _Package(
+                    import_path=data.get("ImportPath", ""),
+                    directory=Path(data["Dir"]),
+                    name=data.get("Name", ""),
+                    go_files=tuple(sorted({name for field in _GO_FILES_FIELDS for name in data.get(field) or ()})),
+                    imports=tuple(sorted(data.get("Imports") or ())),
+                )
+        if process.returncode:
+            stderr.seek(0)
+            raise RuntimeError(f"go list failed in {root}:\n{stderr.read().strip()}")
+
+
+def _parse_header(path: str) -> tuple[str, set[str]]:
+    """Read the package name and the imports of a Go file.
+
+    Parameters:
+        path: The Go file.
+
+    Returns:
+        The package name (empty if not found) and the imported paths.
+    """
+    text = _read(path) or ""
+    if match := _HEADER_END_RE.search(text):
+        text = text[: match.start()]
+    package = _PACKAGE_RE.search(text)
+    imports: set[str] = set()
+    for group, single in _IMPORT_RE.findall(text):
+        imports.update(_IMPORT_PATH_RE.findall(group) if group else (single.strip('"'),))
+    return (package[1] if package else ""), imports
+
+
+def _scan(root: str) -> Iterator[_Package]:
+    """List the packages under a search path by walking the file system, like the go command would.
+
+    Import paths are derived from the closest module above each directory, or from the search path.
+
+    Parameters:
+        root: The search path.
+
+    Yields:
+        The packages, in walking order.
+    """
+    modules: dict[str, tuple[str, str]] = {}
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in _SKIPPED_DIRS and not name.startswith((".", "_")))
+        module = modules.get(os.path.dirname(directory), ("", root))
+        if "go.mod" in filenames and (match := _MODULE_RE.search(_read(os.path.join(directory, "go.mod")) or "")):
+            module = (match[1], directory)
+        modules[directory] = module
+
+        go_files = sorted(name for name in filenames if name.endswith(".go"))
+        if not go_files:
+            continue
+        name = ""
+        imports: set[str] = set()
+        for filename in go_files:
+            # Like the go command, ignore files starting with a dot or an underscore.
+            if filename.endswith("_test.go") or filename.startswith((".", "_")):
+                continue
+            package, file_imports = _parse_header(os.path.join(directory, filename))
+            name = name or package
+            imports |= file_imports
+        module_path, module_dir = module
+        relative = os.path.relpath(directory, module_dir).replace(os.sep, "/")
+        import_path = "/".join(part for part in (module_path, relative) if part and part != ".")
+        yield _Package(
+            import_path=import_path or ".",
+            directory=Path(directory),
+            name=name,
+            go_files=tuple(go_files),
+            imports=tuple(sorted(imports)),
+        )
+
+
+def _discover(roots: Sequence[str], method: _Discovery = "auto") -> list[tuple[str, _Package]]:
+    """List the packages under the search paths.
+
+    Parameters:
+        roots: The search paths, by order of precedence.
+        method: How to list packages: with `go list` (`go`), by walking the file system (`scan`),
+            or with `go list` when it is installed and works in the search path, walking the file system otherwise (`auto`).
+
+    Returns:
+        The packages, with the search path they were found in.
+    """
+    if method == "none":
+        return []
+    go = shutil.which("go") if method in ("auto", "go") else None
+    if method == "go" and go is None:
+        _logger.warning("The go command was not found, packages are discovered by walking the file system")
+
+    packages: list[tuple[str, _Package]] = []
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        found = None
+        if go is not None:
+            try:
+                found = list(_go_list(root, go))
+            except (OSError, RuntimeError, ValueError) as error:
+                _logger.debug("Could not list packages with go: %s", error)
+        if found is None:
+            found = list(_scan(root))
+        _logger.debug("Discovered %d Go packages in %s", len(found), root)
+        packages.extend((root, package) for package in found)
+    return packages
@@ -0,0 +1,313 @@
+# Formatting of Go code with external formatters.
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import shutil
+import subprocess
+import threading
+from os.path import expanduser
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from mkdocstrings import get_logger
+
+from mkdocstrings_handlers.go._internal.cache import _file_identity
+from mkdocstrings_handlers.go._internal.debug import _get_version
+from mkdocstrings_handlers.go._internal.signatures import _wrap_signature
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from mkdocstrings_handlers.go._internal.cache import _DiskCache
+
+_logger = get_logger(__name__)
+
+_Backend = Literal["golines", "gofmt", "python", "none"]
+
+# Where to look for formatter executables, when no path is configured.
+_EXECUTABLES: dict[str, tuple[str, ...]] = {
+    "golines": ("~/go/bin/golines", "golines"),
+    "gofmt": ("gofmt",),
+}
+
+# Snippets formatted together are separated by marker comments, then split back on them.
+_MARKER = "// mkdocstrings-go: snippet {}"
+_MARKER_RE = re.compile(r"^[ \t]*// mkdocstrings-go: snippet (\d+)[ \t]*\n", re.MULTILINE)
+
+
+def _find_executable(backend: str, path: str | None = None) -> str | None:
+    """Find the executable of a formatter backend.
+
+    Parameters:
+        backend: The backend name.
+        path: An explicit path (or name) of the executable.
+
+    Returns:
+        The path of the executable, or None if it is not installed.
+    """
+    for candidate in (path,) if path else _EXECUTABLES[backend]:
+        if executable := shutil.which(expanduser(candidate)):
+            return executable
+    return None
+
+
+def _probe_version(executable: str) -> str:
+    """Return the version of a formatter executable.
+
+    Parameters:
+        executable: The path of the executable.
+
+    Returns:
+        The version it reports, or the identity of the file when it reports none.
+    """
+    try:
+        result = subprocess.run(  # noqa: S603
+            [executable, "--version"],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        result = None
+    if result and result.returncode == 0 and result.stdout.strip():
+        return result.stdout.strip().splitlines()[0]
+    return _file_identity(Path(executable))
+
+
+class _Formatter:
+    """Format Go code with the backend chosen once per build, on first use.
+
+    Source blocks are formatted by an external formatter (golines or gofmt),
+    signatures are wrapped in-process. Results are remembered by a hash of the snippet,
+    the line length and the backend version, optionally on disk, and snippets
+    can be formatted in batches: one process formats all the snippets of a render pass.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the formatter, without any backend until it is configured."""
+        self.runs = 0
+        """The number of formatter processes spawned."""
+        self.cache: _DiskCache | None = None
+        """The persistent cache of formatted snippets, if any."""
+        self._formatted: dict[str, str] = {}
+        self._settings: tuple[Literal["auto"] | _Backend, str | None] = ("none", None)
+        self._selected: tuple[_Backend, str | None, str] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> _Backend:
+        """The backend in use."""
+        return self._select()[0]
+
+    @property
+    def executable(self) -> str | None:
+        """The path of the backend executable, for external backends."""
+        return self._select()[1]
+
+    @property
+    def version(self) -> str:
+        """The version of the backend."""
+        return self._select()[2]
+
+    @property
+    def available(self) -> bool:
+        """Whether source blocks can be formatted."""
+        return self.executable is not None
+
+    def configure(
+        self,
+        backend: Literal["auto"] | _Backend = "auto",
+        path: str | None = None,
+        cache: _DiskCache | None = None,
+    ) -> None:
+        """Set the backend, chosen and probed once per build when code is first formatted.
+
+        Parameters:
+            backend: The backend to use, `auto` to use the first installed one of golines and gofmt,
+                or the in-process engine if none is installed.
+            path: The path of the golines or gofmt executable (of golines with `auto`).
+            cache: The persistent cache of formatted snippets, or None to keep results in memory only.
+        """
+        with self._lock:
+            self.cache = cache
+            self._settings = (backend, path)
+            self._selected = None
+
+    def _select(self) -> tuple[_Backend, str | None, str]:
+        # Finding and probing executables spawns processes: only done when needed.
+        with self._lock:
+            if self._selected is None:
+                self._selected = self._find_backend(*self._settings)
+                _logger.debug("Formatting with %s (%s)", self._selected[0], self._selected[2])
+            return self._selected
+
+    @staticmethod
+    def _find_backend(
+        backend: Literal["auto"] | _Backend,
+        path: str | None,
+    ) -> tuple[_Backend, str | None, str]:
+        executable = None
+        if backend == "auto":
+            backend = "python"
+            for candidate in ("golines", "gofmt"):
+                if found := _find_executable(candidate, path if candidate == "golines" else None):
+                    backend, executable = candidate, found
+                    break
+        elif backend in _EXECUTABLES:
+            executable = _find_executable(backend, path)
+            if executable is None:
+                _logger.warning("Formatter %s not found, source code will not be formatted", backend)
+                backend = "python"
+        # The executable may have been installed or upgraded since the previous build.
+        return backend, executable, _probe_version(executable) if executable else _get_version()
+
+    def _command(self, line_length: int) -> list[str]:
+        self.runs += 1
+        executable = self.executable or ""
+        return [executable] if self.backend == "gofmt" else [executable, f"--max-len={line_length}"]
+
+    def _run(self, code: str, line_length: int) -> str:
+        result = subprocess.run(  # noqa: S603
+            self._command(line_length),
+            input=code,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        return result.stdout
+
+    async def _run_async(self, code: str, line_length: int) -> str:
+        process = await asyncio.create_subprocess_exec(
+            *self._command(line_length),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate(code.encode())
+        return stdout.decode()
+
+    def _key(self, code: str, line_length: int) -> str:
+        digest = hashlib.sha256()
+        # Snippets are formatted wrapped in a file with markers: the wrapper is part of the result.
+        for part in (self.backend, self.version, _MARKER, str(line_length), code):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _lookup(self, key: str) -> str | None:
+        formatted = self._formatted.get(key)
+        if formatted is None and self.cache is not None:
+            formatted = self.cache.get(key)
+            if isinstance(formatted, str):
+                self._formatted[key] = formatted
+            else:
+                formatted = None
+        return formatted
+
+    def _store(self, key: str, formatted: str) -> None:
+        self._formatted[key] = formatted
+        # Failures are not persisted: they usually mean golines is missing or broken.
+        if formatted and self.cache is not None:
+            self.cache.set(key, formatted)
+
+    def format_signature(self, signature: str, line_length: int) -> str:
+        """Wrap a function signature to the line length.
+
+        Parameters:
+            signature: The signature.
+            line_length: The maximum line length.
+
+        Returns:
+            The wrapped signature, or the signature unchanged when formatting is disabled.
+        """
+        # Signatures are wrapped in-process: no need to find the backend executable.
+        if self._settings[0] == "none":
+            return signature
+        return _wrap_signature(signature, line_length)
+
+    def format(self, code: str, line_length: int) -> str:
+        """Format a snippet of source code.
+
+        Parameters:
+            code: The Go code to format.
+            line_length: The maximum line length.
+
+        Returns:
+            The formatted code, or an empty string if formatting failed.
+        """
+        key = self._key(code, line_length)
+        formatted = self._lookup(key)
+        if formatted is None:
+            # Snippets are wrapped like in batches, so that results never depend on how they were formatted.
+            pending = {key: code}
+            if not (self.available and self._store_batch(pending, self._run(self._batch(pending), line_length))):
+                self._store(key, "")
+            formatted = self._formatted[key]
+        return formatted
+
+    def format_many(self, snippets: Iterable[str], line_length: int) -> None:
+        """Format snippets in as few formatter runs as possible.
+
+        Results are remembered, so that later calls to [`format`][] with the same snippets are free.
+        If the batch fails, snippets are formatted one by one.
+
+        Parameters:
+            snippets: The Go code snippets to format.
+            line_length: The maximum line length.
+        """
+        pending = self._pending(snippets, line_length)
+        if len(pending) > 1 and self.available:
+            if self._store_batch(pending, self._run(self._batch(pending), line_length)):
+                return
+            _logger.debug("Batch formatting of %d snippets failed, formatting them one by one", len(pending))
+        for code in pending.values():
+            self.format(code, line_length)
+
+    async def format_many_async(self, snippets: Iterable[str], line_length: int) -> None:
+        """Format snippets like [`format_many`][], with formatter processes awaited by the event loop.
+
+        Parameters:
+            snippets: The Go code snippets to format.
+            line_length: The maximum line length.
+        """
+        pending = self._pending(snippets, line_length)
+        if not pending or not self.available:
+            return
+        if len(pending) > 1:
+            if self._store_batch(pending, await self._run_async(self._batch(pending), line_length)):
+                return
+            _logger.debug("Batch formatting of %d snippets failed, formatting them one by one", len(pending))
+        for key, code in pending.items():
+            single = {key: code}
+            if not self._store_batch(single, await self._run_async(self._batch(single), line_length)):
+                self._store(key, "")
+
+    def _pending(self, snippets: Iterable[str], line_length: int) -> dict[str, str]:
+        pending = {}
+        for code in dict.fromkeys(snippets):
+            key = self._key(code, line_length)
+            if self._lookup(key) is None:
+                pending[key] = code
+        return pending
+
+    @staticmethod
+    def _batch(pending: dict[str, str]) -> str:
+        # A package clause makes the batch a valid Go file, whatever the snippets.
+        return "package snippets\n\n" + "\n".join(
+            f"{_MARKER.format(index)}\n{code.strip()}\n" for index, code in enumerate(pending.values())
+        )
+
+    def _store_batch(self, pending: dict[str, str], output: str) -> bool:
+        parts = _MARKER_RE.split(output)
+        # `split` yields the header, then (index, code) pairs.
+        if parts[1::2] != [str(index) for index in range(len(pending))]:
+            return False
+        for key, formatted in zip(pending, parts[2::2]):
+            formatted = formatted.strip("\n")  # noqa: PLW2901
+            self._store(key, f"{formatted}\n" if formatted else "")
+        return True
@@ -2,30 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import copy
+import functools
 import glob
+import hashlib
 import json
 import os
-import subprocess
 import sys
-from os.path import expanduser
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
+from xml.etree.ElementTree import Element
 
 from mkdocs.exceptions import PluginError
 from mkdocstrings import BaseHandler, CollectorItem, get_logger
 
 from mkdocstrings_handlers.go._internal import rendering
+from mkdocstrings_handlers.go._internal.cache import (
+    _default_cache_dir,
+    _DiskCache,
+    _hash_package,
+    _MemoryCache,
+    _tree_identity,
+)
+from mkdocstrings_handlers.go._internal.collectors import _CollectorOptions, _select_collector
 from mkdocstrings_handlers.go._internal.config import GoConfig, GoOptions
+from mkdocstrings_handlers.go._internal.debug import _get_version
+from mkdocstrings_handlers.go._internal.discovery import _discover, _Package
+from mkdocstrings_handlers.go._internal.formatting import _Formatter
 from mkdocstrings_handlers.go._internal.helpers import (
     _extract_go_block,
-    _find_dicts_with_value,
-    _find_string_in_go_files,
+    _find_autodoc_identifiers,
+    _freeze,
     _get_rel_path,
     _inject_code_info,
+    _stable_default,
 )
+from mkdocstrings_handlers.go._internal.index import _SymbolIndex
+from mkdocstrings_handlers.go._internal.packages import _ModuleTrie, _PackageIndex
+from mkdocstrings_handlers.go._internal.signatures import _add_signatures
+from mkdocstrings_handlers.go._internal.sources import _DeclarationIndex, _SourceCache
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Mapping, MutableMapping
+    from collections.abc import AsyncIterator, Hashable, Iterable, Iterator, Mapping, MutableMapping
 
     from mkdocs.config.defaults import MkDocsConfig
     from mkdocstrings import HandlerOptions
@@ -48,6 +70,32 @@ else:
 
 _logger = get_logger(__name__)
 
+# The distributions rendering HTML from the collected data: their upgrades invalidate rendered fragments.
+_RENDERING_DISTRIBUTIONS = ("mkdocstrings-go", "mkdocstrings", "Markdown", "pymdown-extensions", "Pygments")
+
+
+@contextlib.asynccontextmanager
+async def _acquire_async(lock: threading.Lock) -> AsyncIterator[None]:
+    """Hold a thread lock without blocking the event loop while waiting for it.
+
+    Parameters:
+        lock: The lock to acquire.
+
+    Yields:
+        Nothing, once the lock is acquired. It is released on exit.
+    """
+    acquire = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+    try:
+        await asyncio.shield(acquire)
+    except asyncio.CancelledError:
+        # The thread still gets the lock: release it as soon as it does.
+        acquire.add_done_callback(lambda _: lock.release())
+        raise
+    try:
+        yield
+    finally:
+        lock.release()
+
 
 class GoHandler(BaseHandler):
     """The Go handler class."""
@@ -74,6 +122,7 @@ class GoHandler(BaseHandler):
         base_dir: Path,
         *,
         godocjson_path: str = "~/go/bin/godocjson",
+        docs_dir: str | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the handler.
@@ -81,6 +130,8 @@ class GoHandler(BaseHandler):
         Parameters:
             config: The handler configuration.
             base_dir: The base directory of the project.
+            godocjson_path: The path to the godocjson executable.
+            docs_dir: The documentation directory, scanned for identifiers to prefetch.
             **kwargs: Arguments passed to the parent constructor.
         """
         super().__init__(**kwargs)
@@ -93,6 +144,8 @@ class GoHandler(BaseHandler):
         """The global configuration options."""
         self.godocjson_path = godocjson_path
         """The path to go parser"""
+        self.docs_dir = docs_dir
+        """The documentation directory."""
 
         paths = config.paths or []
 
@@ -105,21 +158,68 @@ class GoHandler(BaseHandler):
         if not paths:
             paths.append(str(base_dir))
 
-        # Initialize search paths from `sys.path`, eliminating empty paths.
-        search_paths = [path for path in sys.path if path]
-
-        for path in reversed(paths):
+        # Only search the configured paths: Python's `sys.path` never contains Go packages.
+        search_paths: list[str] = []
+        for path in paths:
             # If it's not absolute, make path relative to the config file path, then make it absolute.
             if not os.path.isabs(path):
                 path = os.path.abspath(base_dir / path)  # noqa: PLW2901
-            # Remove pre-listed paths.
-            if path in search_paths:
-                search_paths.remove(path)
-            # Give precedence to user-provided paths.
-            search_paths.insert(0, path)
+            # Keep the first occurrence of duplicated paths, which takes precedence.
+            if path not in search_paths:
+                search_paths.append(path)
 
         self._paths = search_paths
+        self._locations = _PackageIndex(search_paths)
+        # Packages are discovered, and modules scanned, on first use.
+        self._discovered: dict[str, Path] | None = None
+        self._tree: list[tuple[str, _Package]] = []
+        self._package_files: dict[Path, tuple[str, ...]] = {}
+        self._modules: _ModuleTrie | None = None
         self._collected: dict[str, CollectorItem] = {}
+        self._options: dict[Hashable, GoOptions] = {}
+        self._packages: dict[Path, dict] = {}
+        self._indexes: dict[Path, _SymbolIndex] = {}
+        self._sources = _SourceCache()
+        self._declarations = _DeclarationIndex(self._sources)
+        # Collection can run in several threads: shared state is guarded by these locks.
+        self._packages_lock = threading.Lock()
+        self._package_locks: dict[Path, threading.Lock] = {}
+        self._collected_lock = threading.Lock()
+        self._discovery_lock = threading.Lock()
+        self._prefetch_lock = threading.Lock()
+        self._prefetched = not (config.prefetch and docs_dir)
+
+        self.cache_dir = base_dir / os.path.expanduser(config.cache_dir) if config.cache_dir else _default_cache_dir()
+        """The directory of the persistent caches."""
+        self._package_cache = (
+            _DiskCache(self.cache_dir / "packages", config.cache_size * 1024 * 1024) if config.cache else None
+        )
+        self._collector = _select_collector(
+            config.collector,
+            _CollectorOptions(
+                godocjson_path=godocjson_path,
+                snapshot=base_dir / os.path.expanduser(config.snapshot) if config.snapshot else None,
+                cache_dir=self.cache_dir,
+                workers=config.workers,
+            ),
+        )
+        # Parsed packages depend on the collector and on the handler post-processing, not only on sources.
+        self._package_salt = (self._collector.name, self._collector.identity)
+        # Rendered HTML, keyed by its inputs: in memory for this handler, on disk across builds.
+        self._fragments = _MemoryCache(max_entries=1024)
+        self._fragment_cache = (
+            _DiskCache(self.cache_dir / "html", config.cache_size * 1024 * 1024) if config.cache else None
+        )
+        self._highlights = rendering._HighlightCache()
+        self._fragment_salt: str | None = None
+        self._fragment_hits = self._fragment_misses = 0
+        # The formatter backend is only looked for when code is first formatted, or HTML first rendered.
+        self._formatter = _Formatter()
+        self._formatter.configure(
+            config.formatter,
+            config.formatter_path,
+            _DiskCache(self.cache_dir / "format", config.cache_size * 1024 * 1024) if config.cache else None,
+        )
 
     def get_options(self, local_options: Mapping[str, Any]) -> HandlerOptions:
         """Get combined default, global and local options.
@@ -135,10 +235,20 @@ class GoHandler(BaseHandler):
             **local_options.get("extra", {}),
         }
         options = {**self.global_options, **local_options, "extra": extra}
+        # Most directives share the same options: validate each distinct set once.
         try:
-            return GoOptions.from_data(**options)
+            key = _freeze(options)
+        except TypeError:
+            key = None
+        if key is not None and key in self._options:
+            return self._options[key]
+        try:
+            result = GoOptions.from_data(**options)
         except Exception as error:
             raise PluginError(f"Invalid options: {error}") from error
+        if key is not None:
+            self._options[key] = result
+        return result
 
     def collect(self, identifier: str, options: GoOptions) -> CollectorItem:
         """Collect the documentation for the given identifier.
@@ -153,28 +263,133 @@ class GoHandler(BaseHandler):
         if not identifier:
             raise ValueError("Identifier cannot be empty!")
 
-        _ = options or self.get_options({})
+        options = options or self.get_options({})
+
+        self._ensure_prefetched()
+
+        if self._is_pattern(identifier):
+            return self._collect_tree(identifier, options)
 
-        pkg_path, obj, method, base_dir = self._parse_identifier(identifier)
-        self._pkg_path = pkg_path
+        valid_path, pkg_path, obj, method = self._resolve_identifier(identifier)
 
-        valid_path = self._resolve_valid_path(pkg_path, base_dir)
-        raw_data = self._run_godocjson(valid_path)
+        raw_data = self._load_package(valid_path)
 
-        filtered = [raw_data] if not obj else self._filter_data(raw_data, obj, method)
+        filtered = [raw_data] if not obj else self._filter_data(self._index_package(valid_path), obj, method)
 
         if not filtered:
             raise ValueError(f"No data found for identifier: '{identifier}'")
 
-        item = filtered[0]
-        self._collected[identifier] = item
+        # The cached package tree is shared by every identifier of the package,
+        # so work on a copy before injecting code snippets into it.
+        item = copy.deepcopy(filtered[0])
 
-        code, path = self._get_code_snippet_and_path(item, method or obj)
+        # Source snippets are only rendered with `show_source`: skip reading source files otherwise.
+        code, path = (
+            self._get_code_snippet_and_path(item, method or obj, pkg_path=pkg_path)
+            if options.show_source
+            else (None, None)
+        )
         item["code"] = code
         item["relative_path"] = path
 
+        with self._collected_lock:
+            self._collected[identifier] = item
+        return item
+
+    async def collect_async(self, identifier: str, options: GoOptions) -> CollectorItem:
+        """Collect the documentation for the given identifier, without blocking the event loop.
+
+        Packages are collected with subprocesses awaited by the event loop, source files are read
+        in the default executor, and source blocks are formatted ahead of rendering.
+        The result is the same as with [`collect`][mkdocstrings_handlers.go.GoHandler.collect].
+
+        Parameters:
+            identifier: The identifier of the object to collect.
+            options: The options to use for the collection.
+
+        Returns:
+            The collected item.
+        """
+        if not identifier:
+            raise ValueError("Identifier cannot be empty!")
+        options = options or self.get_options({})
+
+        directories = await asyncio.to_thread(self._package_directories, identifier)
+        if self._is_pattern(identifier):
+            # Packages of a tree that cannot be collected are skipped, with a warning, by `collect`.
+            await asyncio.gather(*map(self._load_package_async, directories), return_exceptions=True)
+        else:
+            await asyncio.gather(*map(self._load_package_async, directories))
+
+        item = await asyncio.to_thread(self.collect, identifier, options)
+        if options.show_source and options.format_code:
+            await self._formatter.format_many_async(
+                [obj["code"] for obj in rendering._iter_objects(item) if obj.get("code")],
+                options.line_length,
+            )
         return item
 
+    async def collect_many_async(
+        self,
+        identifiers: Iterable[str],
+        options: GoOptions | None = None,
+        *,
+        concurrency: int | None = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """Collect the documentation of many identifiers concurrently.
+
+        The packages of all the identifiers are collected first, each once, at most `concurrency` at a time.
+
+        Parameters:
+            identifiers: The identifiers of the objects to collect.
+            options: The options to use for the collection.
+            concurrency: The maximum number of packages collected at the same time. Defaults to the `workers` setting.
+            return_exceptions: Whether to return the errors raised for some identifiers instead of raising the first one,
+                like [`asyncio.gather`][].
+
+        Returns:
+            The collected items, in the order of the identifiers.
+        """
+        identifiers = list(identifiers)
+        options = options or self.get_options({})
+        semaphore = asyncio.Semaphore(concurrency or self.config.workers or os.cpu_count() or 1)
+
+        def package_directories() -> dict[Path, Path]:
+            directories: dict[Path, Path] = {}
+            for identifier in identifiers:
+                # Errors are raised again when the identifier is collected.
+                with contextlib.suppress(Exception):
+                    for directory in self._package_directories(identifier):
+                        directories.setdefault(directory.resolve(), directory)
+            return directories
+
+        async def load(directory: Path) -> None:
+            async with semaphore:
+                await self._load_package_async(directory)
+
+        async def collect(identifier: str) -> CollectorItem:
+            async with semaphore:
+                return await self.collect_async(identifier, options)
+
+        directories = await asyncio.to_thread(package_directories)
+        await asyncio.gather(*map(load, directories.values()), return_exceptions=True)
+        return await asyncio.gather(*map(collect, identifiers), return_exceptions=return_exceptions)
+
+    def _package_directories(self, identifier: str) -> list[Path]:
+        """Find the directories of the packages documented by an identifier.
+
+        Parameters:
+            identifier: The identifier of the object to collect.
+
+        Returns:
+            The package directories.
+        """
+        self._ensure_prefetched()
+        if self._is_pattern(identifier):
+            return [directory for _, directory in self._expand_pattern(identifier)]
+        return [self._resolve_identifier(identifier)[0]]
+
     def render(self, data: CollectorItem, options: GoOptions) -> str:
         """Render the documentation using a Jinja template.
 
@@ -185,16 +400,63 @@ class GoHandler(BaseHandler):
         Returns:
             The rendered documentation as a string.
         """
+        key = self._fragment_key(data, options)
+        fragment = self._fragments.get(key)
+        if fragment is None and self._fragment_cache is not None:
+            fragment = self._fragment_cache.get(key)
+        if fragment is not None:
+            self._fragment_hits += 1
+            html, headings = fragment
+            # Register the headings again, as the `heading` filter does, for the table of contents.
+            self._headings.extend(Element(tag, attributes) for tag, attributes in headings)
+            return html
+
+        self._fragment_misses += 1
+        first_heading = len(self._headings)
         template = rendering.do_get_template(self.env, data)
+        rendering._prepare_formatting(data, options, self._formatter)
 
         # All the following variables will be available in the Jinja templates.
-        return template.render(
+        html = template.render(
             config=options,
             data=data,  # You might want to rename `data` into something more specific.
             heading_level=options.heading_level,
             root=True,
         )
 
+        fragment = (html, [(heading.tag, dict(heading.attrib)) for heading in self._headings[first_heading:]])
+        self._fragments.set(key, fragment)
+        if self._fragment_cache is not None:
+            self._fragment_cache.set(key, fragment)
+        return html
+
+    def _fragment_key(self, data: CollectorItem, options: GoOptions) -> str:
+        """Hash everything the rendered HTML of an object depends on.
+
+        Parameters:
+            data: The collected documentation data.
+            options: The rendering options.
+
+        Returns:
+            A hexadecimal digest.
+        """
+        if self._fragment_salt is None:
+            # Computed on the first render, once the Markdown configuration is known.
+            self._fragment_salt = json.dumps(
+                [
+                    [_get_version(dist) for dist in _RENDERING_DISTRIBUTIONS],
+                    self._formatter.backend,
+                    self._formatter.version,
+                    _tree_identity(self.env.loader.searchpath),  # type: ignore[union-attr]
+                    self.mdx,
+                    self.mdx_config,
+                ],
+                default=_stable_default,
+            )
+        digest = hashlib.sha256(self._fragment_salt.encode())
+        digest.update(json.dumps([data, vars(options)], sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
     def get_aliases(self, identifier: str) -> tuple[str, ...]:
         """Get aliases for the given identifier.
 
@@ -204,13 +466,25 @@ class GoHandler(BaseHandler):
         Returns:
             A tuple containing the identifier's name or an empty tuple if not found.
         """
-        try:
-            data = self._collected[identifier]
-        except KeyError:
+        with self._collected_lock:
+            data = self._collected.get(identifier)
+        if data is None:
             return ()
         # Update the following code to return the canonical identifier and any aliases.
         return data["name"]
 
+    def teardown(self) -> None:
+        """Release the collector and report cache statistics at the end of the build."""
+        self._collector.close()
+        _logger.debug(
+            "Source cache: %d hits, %d misses (%d files kept)",
+            self._sources.hits,
+            self._sources.misses,
+            len(self._sources),
+        )
+        _logger.debug("Rendered HTML cache: %d hits, %d misses", self._fragment_hits, self._fragment_misses)
+        _logger.debug("Highlight cache: %d hits, %d misses", self._highlights.hits, self._highlights.misses)
+
     def update_env(self, config: dict) -> None:  # noqa: ARG002
         """Update the Jinja environment with any custom settings/filters/options for this handler.
 
@@ -223,120 +497,403 @@ class GoHandler(BaseHandler):
 
         self.env.filters["format_types"] = rendering.do_format_types
 
-        self.env.filters["format_signature"] = rendering.do_format_signature
+        self.env.filters["format_signature"] = rendering._with_formatter(rendering.do_format_signature, self._formatter)
         self.env.filters["get_template"] = rendering.do_get_template
         self.env.filters["format_struct_signature"] = rendering.do_format_struct_signature
         self.env.filters["format_const_signature"] = rendering.do_format_const_signature
-        self.env.filters["format_code"] = rendering.do_format_code
+        self.env.filters["format_code"] = rendering._with_formatter(rendering.do_format_code, self._formatter)
+        # The `highlight` filter is replaced on every page, the cache is kept for the whole build.
+        self.env.filters["highlight"] = self._highlights.wrap(self.env.filters["highlight"])
 
-    def _parse_identifier(
-        self,
-        identifier: str,
-    ) -> tuple[str, str | None, str | None, str | None]:
-        """Parse the identifier into components.
+    def _resolve_identifier(self, identifier: str) -> tuple[Path, str, str | None, str | None]:
+        """Split an identifier into a package and an object, and find the package directory.
+
+        The package path is everything up to the last slash, followed by the first dot-separated part
+        of the last segment, or by more parts when they are part of the package path (`gopkg.in/yaml.v3.Node`).
 
         Parameters:
-            identifier: The full identifier string (e.g., 'pkg.Type.Method').
+            identifier: The full identifier string (e.g., 'pkg.Type.Method' or 'github.com/org/repo/pkg.Type').
 
         Returns:
-            A tuple of (pkg_path, object name, method name, base_dir).
+            A tuple of (package directory, package path, object name, method name).
+
+        Raises:
+            ValueError: When the identifier has too many parts.
         """
-        pkg_path, *objects = identifier.split(".")
-        obj = method = None
-        base_dir = None  # Not used anymore in path logic
+        head, slash, tail = identifier.rpartition("/")
+        parts = tail.split(".")
+        error: FileNotFoundError | None = None
+        for size in range(1, len(parts) + 1):
+            objects = parts[size:]
+            if len(objects) > self.MAX_OBJECT_PARTS:
+                continue
+            pkg_path = head + slash + ".".join(parts[:size])
+            try:
+                valid_path = self._resolve_valid_path(pkg_path)
+            except FileNotFoundError as exc:
+                error = error or exc
+                continue
+            obj, method = (*objects, None, None)[:2]
+            return valid_path, pkg_path, obj, method
+
+        if error is None or len(parts) - 1 > self.MAX_OBJECT_PARTS:
+            raise ValueError(f"Invalid FQN: '{identifier}'. Max format: 'package.Type.Method'")
+        raise error
+
+    def _resolve_valid_path(self, pkg_path: str) -> Path:
+        """Resolve the directory of a Go package.
+
+        Packages discovered in the search paths are found by import path or by path relative to their search path.
+        Other full import paths are resolved through the modules found in the search paths,
+        other paths relative to the search paths.
+
+        Parameters:
+            pkg_path: The Go package path to search for.
+
+        Returns:
+            The resolved package path as a Path object.
 
-        if len(objects) > self.MAX_OBJECT_PARTS:
-            raise ValueError(
-                f"Invalid FQN: '{identifier}'. Max format: 'package.Type.Method'",
+        Raises:
+            FileNotFoundError: If the path could not be resolved.
+        """
+        with self._discovery_lock:
+            if self._discovered is None:
+                self._discovered = self._discover_packages()
+            valid_path = self._discovered.get(pkg_path)
+            if valid_path is not None:
+                return valid_path
+            if self._modules is None:
+                self._modules = _ModuleTrie.scan(self._paths)
+        valid_path = self._modules.resolve(pkg_path) or self._locations.find(pkg_path)
+        if valid_path is None:
+            raise FileNotFoundError(
+                f"No valid package path found for '{pkg_path}'\nPaths tried: {self._paths}",
             )
+        return valid_path
 
-        if len(objects) == self.MAX_OBJECT_PARTS:
-            obj, method = objects
-        elif len(objects) == 1:
-            obj = objects[0]
+    def _discover_packages(self) -> dict[str, Path]:
+        """List the packages of all search paths at once, to find them without probing the file system.
 
-        return pkg_path, obj, method, base_dir
+        The Go files of the packages are kept, to hash them for the persistent cache without listing directories.
 
-    def _resolve_valid_path(self, pkg_path: str, _: str | None = None) -> Path:
-        """Resolve the valid Go package path based on configured search paths.
+        Returns:
+            The package directories by import path and by path relative to their search path,
+            the first search path taking precedence.
+        """
+        discovered: dict[str, Path] = {}
+        self._tree = _discover(self._paths, self.config.discovery)
+        for root, package in self._tree:
+            discovered.setdefault(package.import_path, package.directory)
+            relative = os.path.relpath(os.path.realpath(package.directory), os.path.realpath(root))
+            if relative != os.curdir:
+                discovered.setdefault(relative.replace(os.sep, "/"), package.directory)
+            self._package_files.setdefault(package.directory.resolve(), package.go_files)
+        return discovered
+
+    def _load_package(self, valid_path: Path) -> dict:
+        """Load the documentation data of a package, collecting it at most once per build.
+
+        Unchanged packages are read back from the persistent cache without collecting them again.
+        Signatures are then attached to the functions, types and constants of the package.
 
         Parameters:
-            pkg_path: The Go package path to search for.
-            _: Optional base directory (currently unused).
+            valid_path: The resolved package directory.
 
         Returns:
-            The resolved package path as a Path object.
+            The parsed godocjson documentation data, shared by all identifiers of the package.
+        """
+        key = valid_path.resolve()
+        with self._packages_lock:
+            if key in self._packages:
+                return self._packages[key]
+            lock = self._package_locks.setdefault(key, threading.Lock())
+
+        # Threads collecting the same package wait for the first one.
+        with lock:
+            with self._packages_lock:
+                if key in self._packages:
+                    return self._packages[key]
+            data = self._collect_packages([valid_path])[valid_path]
+            if isinstance(data, Exception):
+                raise data
+            return self._store_package(valid_path, data)
+
+    def _store_package(self, valid_path: Path, data: dict) -> dict:
+        """Attach signatures to collected documentation data, and keep it for the rest of the build.
 
-        Raises:
-            FileNotFoundError: If the path could not be resolved.
+        Parameters:
+            valid_path: The package directory.
+            data: The collected documentation data.
+
+        Returns:
+            The documentation data kept for the package.
         """
-        for base in self._paths:
-            candidate = Path(base) / pkg_path
-            if candidate.is_dir():
-                return candidate
+        _add_signatures(data)
+        with self._packages_lock:
+            return self._packages.setdefault(valid_path.resolve(), data)
+
+    def _collect_packages(self, directories: list[Path]) -> dict[Path, dict | Exception]:
+        """Collect packages with the configured collector, reading unchanged ones from the persistent cache.
+
+        Parameters:
+            directories: The package directories.
+
+        Returns:
+            The documentation data of each package, or the error raised while collecting it.
+        """
+        results: dict[Path, dict | Exception] = {}
+        cache_keys: dict[Path, str] = {}
+        missing = []
+        for directory in directories:
+            cache_key, cached = self._cached_package(directory)
+            if cached is None:
+                if cache_key is not None:
+                    cache_keys[directory] = cache_key
+                missing.append(directory)
+            else:
+                results[directory] = cached
+
+        if missing:
+            for directory, data in self._collector.collect_many(missing).items():
+                if self._package_cache is not None and directory in cache_keys and not isinstance(data, Exception):
+                    self._package_cache.set(cache_keys[directory], data)
+                results[directory] = data
+        return results
+
+    def _cached_package(self, directory: Path) -> tuple[str | None, dict | None]:
+        """Look a package up in the persistent cache.
+
+        Parameters:
+            directory: The package directory.
 
-        raise FileNotFoundError(
-            f"No valid package path found for '{pkg_path}'\nPaths tried: {self._paths}",
+        Returns:
+            The cache key of the package, or None when the package cache is not used,
+            and the cached documentation data, if any.
+        """
+        # Persistent collectors keep their results themselves.
+        if self._package_cache is None or self._collector.capabilities.persistent:
+            return None, None
+        cache_key = _hash_package(
+            directory,
+            str(directory),
+            *self._package_salt,
+            files=self._package_files.get(directory.resolve()),
         )
+        return cache_key, self._package_cache.get(cache_key)
 
-    def _run_godocjson(self, valid_path: Path) -> dict:
-        """Run the godocjson command and return parsed JSON output.
+    async def _load_package_async(self, valid_path: Path) -> dict:
+        """Load the documentation data of a package like [`_load_package`][], without blocking the event loop.
 
         Parameters:
-            valid_path: The valid package path to pass to godocjson.
+            valid_path: The resolved package directory.
 
         Returns:
-            The parsed JSON documentation data.
+            The parsed documentation data, shared by all identifiers of the package.
+        """
+        key = valid_path.resolve()
+        with self._packages_lock:
+            if (data := self._packages.get(key)) is not None:
+                return data
+            lock = self._package_locks.setdefault(key, threading.Lock())
+
+        # Coroutines and threads collecting the same package wait for the first one.
+        async with _acquire_async(lock):
+            with self._packages_lock:
+                if (data := self._packages.get(key)) is not None:
+                    return data
+            cache_key, data = await asyncio.to_thread(self._cached_package, valid_path)
+            if data is None:
+                data = await self._collector.collect_async(valid_path)
+                if self._package_cache is not None and cache_key is not None:
+                    await asyncio.to_thread(self._package_cache.set, cache_key, data)
+            return self._store_package(valid_path, data)
+
+    def _ensure_prefetched(self) -> None:
+        """Prefetch packages before the first collection, other threads waiting until it is done."""
+        if self._prefetched:
+            return
+        with self._prefetch_lock:
+            if not self._prefetched:
+                self._prefetch()
+                self._prefetched = True
+
+    def _prefetch(self) -> None:
+        """Parse all packages referenced in the documentation pages, in parallel.
+
+        Failures are ignored here: they are reported when the faulty identifier is collected.
+        """
+        directories: dict[Path, Path] = {}
+        for identifier in _find_autodoc_identifiers(self.docs_dir or "", self.name):
+            if self._is_pattern(identifier):
+                for _, valid_path in self._expand_pattern(identifier):
+                    directories.setdefault(valid_path.resolve(), valid_path)
+                continue
+            try:
+                valid_path, *_ = self._resolve_identifier(identifier)
+            except (ValueError, FileNotFoundError):
+                continue
+            directories.setdefault(valid_path.resolve(), valid_path)
+
+        pending = [path for key, path in directories.items() if key not in self._packages]
+        if not pending:
+            return
+
+        _logger.debug("Prefetching %d Go packages", len(pending))
+        _, errors = self._load_packages(pending)
+        for path, error in errors.items():
+            _logger.debug("Could not prefetch %s: %s", path, error)
+
+    def _load_packages(self, directories: list[Path]) -> tuple[dict[Path, dict], dict[Path, BaseException]]:
+        """Load packages in parallel, or in a single call to collectors batching packages.
 
-        Raises:
-            RuntimeError: If the subprocess call fails.
-            ValueError: If the resulting output is empty.
+        Parameters:
+            directories: The package directories.
+
+        Returns:
+            The data of the packages loaded, and the errors of the others, by directory.
         """
-        try:
-            result = subprocess.run(  # noqa: S603
-                [expanduser(self.godocjson_path), valid_path],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            if not result.stdout:
-                raise ValueError("Provided package contains empty file")
+        if self._collector.capabilities.batching:
+            with self._packages_lock:
+                loaded = {
+                    path: self._packages[path.resolve()] for path in directories if path.resolve() in self._packages
+                }
+            collected = self._collect_packages([path for path in directories if path not in loaded])
+            batch_errors: dict[Path, BaseException] = {}
+            for path, data in collected.items():
+                if isinstance(data, Exception):
+                    batch_errors[path] = data
+                else:
+                    loaded[path] = self._store_package(path, data)
+            return loaded, batch_errors
+
+        with ThreadPoolExecutor(max_workers=self.config.workers or os.cpu_count()) as pool:
+            futures = {path: pool.submit(self._load_package, path) for path in directories}
+        loaded = {}
+        errors = {}
+        for path, future in futures.items():
+            if error := future.exception():
+                errors[path] = error
+            else:
+                loaded[path] = future.result()
+        return loaded, errors
+
+    @staticmethod
+    def _is_pattern(identifier: str) -> bool:
+        return identifier == "..." or identifier.endswith("/...")
+
+    def _expand_pattern(self, pattern: str) -> list[tuple[str, Path]]:
+        """Find the packages matched by a wildcard identifier, like `./...` or `example.com/app/internal/...`.
+
+        The prefix before `/...` is matched against the import paths of the discovered packages,
+        and against their paths relative to their search path.
 
-            return json.loads(result.stdout)
+        Parameters:
+            pattern: The wildcard identifier.
 
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"godocjson failed:\n{e.stderr.strip()}") from e
+        Returns:
+            The matching packages, as their path relative to their search path and their directory.
+        """
+        prefix = pattern[:-3].rstrip("/")
+        prefix = "" if prefix == "." else prefix[2:] if prefix.startswith("./") else prefix
+        with self._discovery_lock:
+            if self._discovered is None:
+                self._discovered = self._discover_packages()
+        # Wildcards need the list of packages, even when packages are looked up one by one otherwise.
+        tree = self._tree if self.config.discovery != "none" else _discover(self._paths, "scan")
+
+        matches: dict[Path, tuple[str, Path]] = {}
+        for root, package in tree:
+            relative = os.path.relpath(os.path.realpath(package.directory), os.path.realpath(root))
+            relative = "" if relative == os.curdir else relative.replace(os.sep, "/")
+            if not prefix or any(
+                path == prefix or path.startswith(prefix + "/") for path in (relative, package.import_path)
+            ):
+                matches.setdefault(package.directory.resolve(), (relative, package.directory))
+        return list(matches.values())
+
+    def _collect_tree(self, pattern: str, options: GoOptions) -> CollectorItem:
+        """Collect all the packages matched by a wildcard identifier.
+
+        Packages are parsed in parallel, then assembled one after the other.
+        Packages that cannot be parsed are skipped with a warning.
 
-    def _filter_data(self, data: dict, obj: str, method: str | None) -> list:
+        Parameters:
+            pattern: The wildcard identifier.
+            options: The options to use for the collection.
+
+        Returns:
+            The collected item, holding the packages.
+        """
+        packages = self._expand_pattern(pattern)
+        if not packages:
+            raise ValueError(f"No packages found for identifier: '{pattern}'")
+
+        loaded, errors = self._load_packages([directory for _, directory in packages])
+        for path, error in errors.items():
+            _logger.warning("Skipping package %s: %s", path, error)
+
+        items = []
+        for pkg_path, directory in packages:
+            if directory not in loaded:
+                continue
+            item = copy.deepcopy(loaded[directory])
+            if options.show_source:
+                self._get_code_snippet_and_path(item, pkg_path=pkg_path)
+            items.append(item)
+
+        tree = {"type": "packages", "name": pattern, "packages": items}
+        with self._collected_lock:
+            self._collected[pattern] = tree
+        return tree
+
+    def _index_package(self, valid_path: Path) -> _SymbolIndex:
+        """Return the symbol index of a package, building it once per build.
+
+        Parameters:
+            valid_path: The resolved package directory.
+
+        Returns:
+            The symbol index of the package.
+        """
+        key = valid_path.resolve()
+        with self._packages_lock:
+            if key in self._indexes:
+                return self._indexes[key]
+
+        index = _SymbolIndex(self._load_package(valid_path))
+        if index.ambiguous:
+            _logger.info("Package %s declares ambiguous names: %s", valid_path, ", ".join(index.ambiguous))
+
+        with self._packages_lock:
+            return self._indexes.setdefault(key, index)
+
+    def _filter_data(self, index: _SymbolIndex, obj: str, method: str | None) -> list:
         """Filter the documentation data for a specific object or method.
 
         Parameters:
-            data: The raw godocjson documentation data.
+            index: The symbol index of the package.
             obj: The object name to filter for (e.g., a type or constant).
             method: Optional method name to further narrow the result.
 
         Returns:
-            A list of matching documentation dictionaries.
+            A list holding the matching documentation dictionary, or an empty list.
         """
-        if method:
-            # First find the type (receiver), then the method
-            type_matches = _find_dicts_with_value(data, "name", obj)
-            return _find_dicts_with_value(type_matches, "name", method)
-
-        # Try to match constants/vars by 'names'; fall back to 'name' for types, interfaces
-        by_names = _find_dicts_with_value(data, "names", obj)
-        return by_names or _find_dicts_with_value(data, "name", obj)
+        match = index.lookup(obj, method)
+        return [match] if match is not None else []
 
     def _get_code_snippet_and_path(
         self,
         item: dict,
         obj: str | None = None,
+        *,
+        pkg_path: str,
     ) -> tuple[str | None, str | None]:
         """Extract the Go code block and source path for a given item.
 
         Parameters:
             item: The documentation item dictionary.
             obj: Optional name of the object to locate in the source.
+            pkg_path: The package path of the collected identifier, that relative paths start from.
 
         Returns:
             A tuple of (code block as a string, relative path to source file).
@@ -345,7 +902,7 @@ class GoHandler(BaseHandler):
 
         if type_name == "package":
             # Package-level injection (possibly modifies the item in-place)
-            _inject_code_info(item, self._get_code_snippet_and_path)
+            _inject_code_info(item, functools.partial(self._get_code_snippet_and_path, pkg_path=pkg_path))
             return None, None
 
         # Determine source path and line number
@@ -354,14 +911,15 @@ class GoHandler(BaseHandler):
 
         # Extract and return code snippet
         try:
-            with open(path) as f:
-                lines = f.readlines()
+            lines = self._sources.lines(path)
         except FileNotFoundError as err:
             raise FileNotFoundError(f"Source file not found at: {path}") from err
 
-        block = _extract_go_block(lines, start_line=line_nr, block_type=type_name)
+        # Declarations spans are computed once per file, falling back to counting brackets from the line.
+        end = self._declarations.outline(path).spans.get(line_nr)
+        block = lines[line_nr - 1 : end] if end else _extract_go_block(lines, start_line=line_nr, block_type=type_name)
         code = "".join(block)
-        rel_path = _get_rel_path(self._pkg_path, path) if path else None
+        rel_path = _get_rel_path(pkg_path, path) if path else None
 
         return code, rel_path
 
@@ -387,7 +945,7 @@ class GoHandler(BaseHandler):
         if type_name == "type":
             if obj is None:
                 raise ValueError("Object name is required for resolving type location")
-            result = _find_string_in_go_files(item["packageImportPath"], obj)
+            result = self._declarations.find_type(item["packageImportPath"], obj)
             if result is None:
                 raise FileNotFoundError(
                     f"Could not find '{obj}' in {item['packageImportPath']}",
@@ -422,5 +980,6 @@ def get_handler(
     return GoHandler(
         config=GoConfig.from_data(**handler_config),
         base_dir=base_dir,
+        docs_dir=tool_config.docs_dir,
         **kwargs,
     )
@@ -1,6 +1,18 @@
+import functools
+import json
 import os
+import re
+from collections.abc import Hashable, Iterator, Mapping, Sequence
+from itertools import islice
 from typing import Any, Callable, Optional, Union
 
+# Same syntax as the mkdocstrings autodoc processor.
+_AUTODOC_RE = re.compile(r"^(?:#{1,6} *|)::: ?(?P<name>.+?) *$", flags=re.MULTILINE)
+# Fenced code blocks, where autodoc instructions are only examples.
+_FENCE_RE = re.compile(r"^ {0,3}(?P<fence>`{3,}|~{3,})")
+# The `handler` option, in the indented YAML block following an autodoc instruction.
+_HANDLER_RE = re.compile(r"""^(?P<indent>[ \t]+)handler:[ \t]*(?P<quote>["']?)(?P<name>[\w.-]+)(?P=quote)[ \t]*$""")
+
 
 # --- JSON Utilities ---
 def _find_dicts_with_value(obj: Any, target_key: str, target_value: str) -> list[dict]:
@@ -33,33 +45,133 @@ def _find_dicts_with_value(obj: Any, target_key: str, target_value: str) -> list
 
 
 # --- Filesystem Utilities ---
-def _find_string_in_go_files(
-    search_dir: str,
-    search_string: str,
-) -> Optional[tuple[str, int]]:
-    """Search for a string in Go files within a directory.
+def _freeze(obj: Any) -> Hashable:
+    """Convert a JSON-like value to a canonical, hashable form.
+
+    Mappings compare equal whatever the order of their keys,
+    and values of different types never compare equal (`1`, `1.0` and `True`).
 
     Parameters:
-        search_dir: The root directory to search.
-        search_string: The string to search for in the files.
+        obj: The value to convert.
 
     Returns:
-        A tuple of the file path and line number of the first match, or None if not found.
+        A hashable value.
+
+    Raises:
+        TypeError: When the value contains unhashable objects other than mappings, lists, tuples and sets.
     """
-    for root, _, files in os.walk(search_dir):
-        for file in files:
-            if file.endswith(".go"):
-                filepath = os.path.join(root, file)
+    if isinstance(obj, Mapping):
+        items = ((str(key), _freeze(value)) for key, value in obj.items())
+        return (dict, tuple(sorted(items, key=lambda item: item[0])))
+    if isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(_freeze(value) for value in obj))
+    if isinstance(obj, (set, frozenset)):
+        return (frozenset, frozenset(_freeze(value) for value in obj))
+    hash(obj)
+    return (type(obj), obj)
+
+
+def _stable_default(obj: Any) -> Any:
+    """Describe an object that is not JSON-serializable, the same way in every process.
+
+    Used as the `default` of `json.dumps`, instead of `str` whose output
+    contains memory addresses for functions and most objects.
+
+    Parameters:
+        obj: The object to describe.
+
+    Returns:
+        A JSON-serializable description: functions and classes by their import path,
+        partial functions with their arguments, Markdown extensions with their configuration,
+        other objects by the import path of their class.
+    """
+    if isinstance(obj, functools.partial):
+        return [_stable_default(obj.func), obj.args, obj.keywords]
+    if hasattr(obj, "__qualname__") and (callable(obj) or isinstance(obj, type)):
+        return f"{getattr(obj, '__module__', None)}.{obj.__qualname__}"
+    description = f"{type(obj).__module__}.{type(obj).__qualname__}"
+    if callable(getattr(obj, "getConfigs", None)):
+        # Markdown extensions.
+        return [description, obj.getConfigs()]
+    if isinstance(obj, (set, frozenset)):
+        return sorted(json.dumps(value, sort_keys=True, default=_stable_default) for value in obj)
+    return description
+
+
+def _find_autodoc_identifiers(docs_dir: str, handler: str = "go") -> list[str]:
+    """Find the identifiers of the `:::` autodoc instructions of a handler in Markdown pages.
+
+    Instructions in fenced code blocks, and those selecting another handler with the `handler` option, are skipped.
+
+    Parameters:
+        docs_dir: The documentation directory to scan.
+        handler: The name of the handler.
+
+    Returns:
+        The identifiers, in order of appearance and without duplicates.
+    """
+    identifiers: dict[str, None] = {}
+    for root, _, files in os.walk(docs_dir):
+        for file in sorted(files):
+            if file.endswith(".md"):
                 try:
-                    with open(filepath, encoding="utf-8", errors="ignore") as f:
-                        for i, line in enumerate(f, start=1):
-                            stripped = line.strip()
-                            if search_string in stripped and not stripped.startswith(
-                                "//",
-                            ):
-                                return filepath, i
-                except FileNotFoundError:
+                    with open(os.path.join(root, file), encoding="utf-8", errors="ignore") as f:
+                        content = f.read()
+                except OSError:
                     continue
+                identifiers.update(dict.fromkeys(_scan_autodoc_instructions(content, handler)))
+    return list(identifiers)
+
+
+def _scan_autodoc_instructions(content: str, handler: str) -> Iterator[str]:
+    """Find the identifiers of the autodoc instructions of a handler in a Markdown page.
+
+    Parameters:
+        content: The contents of the page.
+        handler: The name of the handler.
+
+    Yields:
+        The identifiers, in order of appearance.
+    """
+    lines = content.splitlines()
+    fence = ""
+    for number, line in enumerate(lines):
+        if fence:
+            # A fence is closed by a fence of the same character, at least as long, and nothing else.
+            match = _FENCE_RE.match(line)
+            if (
+                match
+                and match["fence"][0] == fence[0]
+                and len(match["fence"]) >= len(fence)
+                and not line[match.end() :].strip()
+            ):
+                fence = ""
+            continue
+        if match := _FENCE_RE.match(line):
+            fence = match["fence"]
+            continue
+        if (match := _AUTODOC_RE.match(line)) and _instruction_handler(lines, number + 1) in (None, handler):
+            yield match["name"]
+
+
+def _instruction_handler(lines: Sequence[str], start: int) -> Optional[str]:
+    """Read the `handler` option of an autodoc instruction.
+
+    Parameters:
+        lines: The lines of the page.
+        start: The index of the line following the instruction.
+
+    Returns:
+        The handler name, or None when the instruction uses the default handler.
+    """
+    indent = None
+    for line in islice(lines, start, None):
+        if not line.strip() or not line[0].isspace():
+            break
+        current = len(line) - len(line.lstrip())
+        indent = current if indent is None else indent
+        if current == indent and (match := _HANDLER_RE.match(line)):
+            return match["name"]
     return None
 
 
@@ -78,7 +190,7 @@ def _get_rel_path(pkg_path: str, path: str) -> str:
 
 
 # --- Go Code Utilities ---
-def _extract_go_block(lines: list[str], start_line: int, block_type: str) -> list[str]:
+def _extract_go_block(lines: Sequence[str], start_line: int, block_type: str) -> list[str]:
     """Extract a Go code block from source lines based on block type.
 
     Parameters:
@@ -106,7 +218,7 @@ def _extract_go_block(lines: list[str], start_line: int, block_type: str) -> lis
     depth = 0
     found_start = False
 
-    for line in lines[start_line:]:
+    for line in islice(lines, start_line, None):
         block.append(line)
         if opener in line:
             depth += line.count(opener)
@@ -0,0 +1,74 @@
+# Name index of the objects of a godocjson package tree.
+
+from __future__ import annotations
+
+
+def _describe(obj: dict) -> str:
+    location = f"{obj.get('filename') or obj.get('packageImportPath', '')}:{obj.get('line', 0)}"
+    return f"{obj.get('type')} at {location}"
+
+
+class _SymbolIndex:
+    """Index of a package's objects by name, built once per package.
+
+    Package-level names map to consts, vars, types and funcs (including the funcs godocjson
+    associates with a type, like constructors). Type members are indexed by receiver and name.
+    """
+
+    def __init__(self, package: dict) -> None:
+        """Index the given package.
+
+        Parameters:
+            package: The godocjson data of a package.
+        """
+        self._objects: dict[str, list[dict]] = {}
+        self._members: dict[tuple[str, str], list[dict]] = {}
+        self._methods: dict[str, list[dict]] = {}
+
+        self._add_values(package)
+        for func in package.get("funcs") or ():
+            self._objects.setdefault(func["name"], []).append(func)
+        for type_ in package.get("types") or ():
+            self._objects.setdefault(type_["name"], []).append(type_)
+            self._add_values(type_)
+            for method in type_.get("methods") or ():
+                self._members.setdefault((type_["name"], method["name"]), []).append(method)
+                self._methods.setdefault(method["name"], []).append(method)
+            for func in type_.get("funcs") or ():
+                self._objects.setdefault(func["name"], []).append(func)
+                self._members.setdefault((type_["name"], func["name"]), []).append(func)
+
+        self.ambiguous = sorted(name for name, objects in self._objects.items() if len(objects) > 1)
+        """Package-level names declared more than once (for example in files with different build constraints)."""
+
+    def _add_values(self, parent: dict) -> None:
+        for kind in ("consts", "vars"):
+            for value in parent.get(kind) or ():
+                for name in value.get("names") or ():
+                    self._objects.setdefault(name, []).append(value)
+
+    def lookup(self, obj: str, method: str | None = None) -> dict | None:
+        """Find an object by name.
+
+        Parameters:
+            obj: The name of a package-level object, or of the receiver type when `method` is given.
+            method: Optional name of a method (or associated func) of the `obj` type.
+
+        Returns:
+            The documentation data of the object, or None if there is no such object.
+
+        Raises:
+            ValueError: When the name matches several objects.
+        """
+        if method:
+            name = f"{obj}.{method}"
+            matches = self._members.get((obj, method), [])
+        else:
+            name = obj
+            # Methods can be referenced without their receiver, as long as the name is unique.
+            matches = self._objects.get(obj) or self._methods.get(obj, [])
+
+        if len(matches) > 1:
+            candidates = ", ".join(_describe(match) for match in matches)
+            raise ValueError(f"Ambiguous name '{name}', it matches several objects: {candidates}")
+        return matches[0] if matches else None
@@ -0,0 +1,202 @@
+# Location of package directories under the search paths.
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+_MODULE_RE = re.compile(r"^\s*module\s+\"?([^\s\"]+)", re.MULTILINE)
+# Local replacements only: `replace example.com/mod [v1.2.3] => ../mod`.
+_REPLACE_RE = re.compile(r"^\s*(?:replace\s+)?([^\s(]+)(?:\s+\S+)?\s+=>\s+(\.{1,2}/\S*|/\S*)\s*$", re.MULTILINE)
+_USE_RE = re.compile(r"^\s*(?:use\s+)?(\.{1,2}/\S*|\.|/\S*)\s*$", re.MULTILINE)
+_COMMENT_RE = re.compile(r"//.*$", re.MULTILINE)
+# Directories ignored by the go command, and dependencies.
+_SKIPPED_DIRS = frozenset(("testdata", "vendor", "node_modules"))
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _deepest_existing_ancestor(root: str, path: str) -> str:
+    """Return the deepest existing directory above a path, stopping at the root.
+
+    Parameters:
+        root: The search path.
+        path: A path under the root.
+
+    Returns:
+        The deepest existing ancestor of the path, or the root itself.
+    """
+    root = os.path.normpath(root)
+    ancestor = os.path.dirname(os.path.normpath(path))
+    while ancestor not in (root, os.path.dirname(ancestor)) and not os.path.isdir(ancestor):
+        ancestor = os.path.dirname(ancestor)
+    return ancestor
+
+
+class _PackageIndex:
+    """Locate package directories under the search paths, remembering hits and misses.
+
+    Each lookup records the directories whose content decides its outcome, with their modification time:
+    the ancestors of the missing candidates in the search paths tried, and the parent of the directory found.
+    A lookup is only done again once one of these directories changes, that is when a package directory
+    appears or disappears (during `mkdocs serve` for example).
+    """
+
+    def __init__(self, roots: Sequence[str]) -> None:
+        """Initialize the index.
+
+        Parameters:
+            roots: The search paths, by order of precedence.
+        """
+        self.roots = list(roots)
+        """The search paths, by order of precedence."""
+        self._entries: dict[str, tuple[Path | None, tuple[tuple[str, int], ...]]] = {}
+
+    def _probe(self, pkg_path: str) -> tuple[Path | None, tuple[tuple[str, int], ...]]:
+        witnesses = []
+        for root in self.roots:
+            candidate = os.path.join(root, pkg_path)
+            if os.path.isdir(candidate):
+                parent = os.path.dirname(os.path.normpath(candidate))
+                witnesses.append((parent, _mtime(parent)))
+                return Path(root) / pkg_path, tuple(witnesses)
+            ancestor = _deepest_existing_ancestor(root, candidate)
+            witnesses.append((ancestor, _mtime(ancestor)))
+        return None, tuple(witnesses)
+
+    def find(self, pkg_path: str) -> Path | None:
+        """Find the directory of a package.
+
+        Parameters:
+            pkg_path: The package path, relative to the search paths.
+
+        Returns:
+            The package directory in the first search path containing it, or None if there is none.
+        """
+        entry = self._entries.get(pkg_path)
+        if entry is None or any(_mtime(path) != mtime for path, mtime in entry[1]):
+            entry = self._entries[pkg_path] = self._probe(pkg_path)
+        return entry[0]
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return _COMMENT_RE.sub("", file.read())
+    except OSError:
+        return None
+
+
+def _find_go_mods(root: str) -> Iterator[str]:
+    """Find the module directories under a search path, like the go command would.
+
+    Parameters:
+        root: The search path.
+
+    Yields:
+        Directories containing a `go.mod` file.
+    """
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in _SKIPPED_DIRS and not name.startswith((".", "_")))
+        if "go.mod" in filenames:
+            yield directory
+
+
+class _Node:
+    __slots__ = ("children", "directory")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.directory: Path | None = None
+
+
+class _ModuleTrie:
+    """Map import paths to package directories, through the modules found in the search paths.
+
+    Modules are read from the `go.mod` files under the search paths, from the `use` directives
+    of `go.work` files at their root, and from the local `replace` directives of those modules.
+    Import paths are resolved against the longest matching module path, segment by segment,
+    then against the shorter enclosing module paths when the package is not in that module.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty trie."""
+        self._root = _Node()
+
+    @classmethod
+    def scan(cls, roots: Sequence[str]) -> _ModuleTrie:
+        """Build the trie of the modules found in search paths.
+
+        Parameters:
+            roots: The search paths, by order of precedence.
+
+        Returns:
+            The trie.
+        """
+        trie = cls()
+        for root in roots:
+            directories = list(_find_go_mods(root))
+            workspace = _read(os.path.join(root, "go.work"))
+            if workspace:
+                directories.extend(os.path.normpath(os.path.join(root, use)) for use in _USE_RE.findall(workspace))
+            for directory in directories:
+                trie._add_module(directory)
+        return trie
+
+    def _add_module(self, directory: str) -> None:
+        go_mod = _read(os.path.join(directory, "go.mod"))
+        if go_mod is None or not (match := _MODULE_RE.search(go_mod)):
+            return
+        self.add(match[1], Path(directory))
+        for module_path, target in _REPLACE_RE.findall(go_mod):
+            self.add(module_path, Path(os.path.normpath(os.path.join(directory, target))))
+
+    def add(self, module_path: str, directory: Path) -> None:
+        """Register a module directory, unless the module is already known.
+
+        Parameters:
+            module_path: The module path, for example `github.com/org/repo`.
+            directory: The directory of the module.
+        """
+        node = self._root
+        for segment in module_path.strip("/").split("/"):
+            node = node.children.setdefault(segment, _Node())
+        if node.directory is None:
+            node.directory = directory
+
+    def resolve(self, import_path: str) -> Path | None:
+        """Find the directory of a package.
+
+        Parameters:
+            import_path: The full import path of the package.
+
+        Returns:
+            The package directory, or None if no module contains it.
+        """
+        segments = import_path.strip("/").split("/")
+        node = self._root
+        found = []
+        for depth, segment in enumerate(segments):
+            child = node.children.get(segment)
+            if child is None:
+                break
+            node = child
+            if node.directory is not None:
+                found.append((node.directory, depth + 1))
+        # Nested modules (`example.com/app/tools` in `example.com/app`) do not contain all the packages
+        # under their path: fall back to the enclosing modules, from the longest to the shortest.
+        for module_directory, depth in reversed(found):
+            directory = module_directory.joinpath(*segments[depth:])
+            if directory.is_dir():
+                return directory
+        return None
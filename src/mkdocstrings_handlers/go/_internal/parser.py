@@ -0,0 +1,989 @@
+# Collection of Go package documentation in Python, in the same shape as godocjson.
+
+from __future__ import annotations
+
+import os
+import re
+from functools import partial
+from itertools import count
+from typing import TYPE_CHECKING, Any, Union
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+_TOKEN_RE = re.compile(
+    r"""
+    [\ \t\r\f]*
+    (?:
+        (?P<newline>\n)
+        |(?P<comment>//[^\n]*|/\*.*?\*/)
+        |(?P<literal>"(?:\\.|[^"\\\n])*"|`[^`]*`|'(?:\\.|[^'\\\n])*'|\.?\d(?:[eEpP][+-]|[\w.])*)
+        |(?P<ident>[^\W\d]\w*)
+        |(?P<op>\.\.\.|<<=|>>=|&\^=|&&|\|\||<-|\+\+|--|[-+*/%&|^<>=!:]=|<<|>>|&\^|.)
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# Only braces matter in function bodies, as long as they are not in literals or comments.
+_BLOCK_RE = re.compile(r"""[{}]|"(?:\\.|[^"\\\n])*"|`[^`]*`|'(?:\\.|[^'\\\n])*'|//[^\n]*|/\*.*?\*/""", re.DOTALL)
+_KEYWORDS = frozenset(
+    (
+        *("break", "case", "chan", "const", "continue", "default", "defer", "else", "fallthrough", "for", "func"),
+        *("go", "goto", "if", "import", "interface", "map", "package", "range", "return", "select", "struct"),
+        *("switch", "type", "var"),
+    ),
+)
+# Tokens after which a newline ends the statement, see https://go.dev/ref/spec#Semicolons.
+_SEMICOLON_KEYWORDS = frozenset(("break", "continue", "fallthrough", "return"))
+_SEMICOLON_OPS = frozenset(("++", "--", ")", "]", "}"))
+_TYPE_START = frozenset(("*", "[", "(", "<-", "map", "chan", "func", "struct", "interface", "..."))
+_PREDECLARED_TYPES = frozenset(
+    (
+        *("any", "bool", "byte", "comparable", "complex64", "complex128", "error", "float32", "float64"),
+        *("int", "int8", "int16", "int32", "int64", "rune", "string"),
+        *("uint", "uint8", "uint16", "uint32", "uint64", "uintptr"),
+    ),
+)
+# Directives like `//go:generate` are not part of documentation.
+_DIRECTIVE_RE = re.compile(r"(?:line |extern |export |[a-z0-9]+:[a-z0-9])")
+# The printer of godocjson keeps structs and interfaces with a single small member on one line.
+_ONE_LINE_MAX_SIZE = 30
+
+
+class _Token:
+    __slots__ = ("kind", "line", "text")
+
+    def __init__(self, kind: str, text: str, line: int) -> None:
+        self.kind = kind
+        self.text = text
+        self.line = line
+
+
+class _Comment:
+    __slots__ = ("end", "index", "own_line", "start", "text")
+
+    def __init__(self, text: str, start: int, index: int, *, own_line: bool) -> None:
+        self.text = text
+        self.start = start
+        self.end = start + text.count("\n")
+        self.index = index
+        self.own_line = own_line
+
+
+def _ends_statement(token: _Token) -> bool:
+    if token.kind == "ident":
+        return token.text not in _KEYWORDS or token.text in _SEMICOLON_KEYWORDS
+    return token.kind == "literal" or token.text in _SEMICOLON_OPS
+
+
+def _skip_block(text: str, position: int) -> int:
+    """Find the end of a block, skipping strings and comments that could contain braces.
+
+    Parameters:
+        text: The Go source.
+        position: The position following the opening brace.
+
+    Returns:
+        The position of the closing brace.
+    """
+    depth = 1
+    for match in _BLOCK_RE.finditer(text, position):
+        brace = match.group()
+        if brace == "{":
+            depth += 1
+        elif brace == "}":
+            depth -= 1
+            if depth == 0:
+                return match.start()
+    return len(text)
+
+
+def _tokenize(text: str) -> tuple[list[_Token], list[_Comment]]:
+    """Split Go source into tokens and comments, inserting semicolons like the Go scanner.
+
+    Function bodies are skipped: they are replaced with a pair of braces.
+
+    Parameters:
+        text: The Go source.
+
+    Returns:
+        The tokens, and the comments with the index of the token following them.
+    """
+    tokens: list[_Token] = []
+    comments: list[_Comment] = []
+    line = 1
+    line_has_token = False
+    depth = 0
+    statement = ""
+    position = 0
+    match_token = _TOKEN_RE.match
+    while match := match_token(text, position):
+        position = match.end()
+        kind = match.lastgroup or "op"
+        value = match.group(kind)
+        if kind == "comment":
+            comments.append(_Comment(value, line, len(tokens), own_line=not line_has_token))
+            if "\n" not in value:
+                continue
+        if kind in ("newline", "comment"):
+            # Multi-line comments act like newlines.
+            if tokens and tokens[-1].kind != ";" and _ends_statement(tokens[-1]):
+                tokens.append(_Token(";", ";", line))
+            line += value.count("\n")
+            line_has_token = False
+            continue
+        if depth == 0 and (not tokens or tokens[-1].kind == ";"):
+            statement = value
+        if kind == "op" and value in "([{":
+            if value == "{" and depth == 0 and statement == "func" and tokens[-1].text not in ("struct", "interface"):
+                end = _skip_block(text, position)
+                tokens.append(_Token("op", "{", line))
+                line += text.count("\n", position, end)
+                tokens.append(_Token("op", "}", line))
+                position = end + 1
+                line_has_token = True
+                continue
+            depth += 1
+        elif kind == "op" and value in ")]}":
+            depth -= 1
+        tokens.append(_Token(";" if value == ";" else kind, value, line))
+        line += value.count("\n")
+        line_has_token = True
+    if tokens and tokens[-1].kind != ";" and _ends_statement(tokens[-1]):
+        tokens.append(_Token(";", ";", line))
+    return tokens, comments
+
+
+def _comment_text(comments: list[_Comment]) -> str:
+    """Extract the text of a comment group, like `go/ast.CommentGroup.Text`.
+
+    Parameters:
+        comments: The comments of the group.
+
+    Returns:
+        The text, without comment markers, directives, surrounding blank lines and repeated blank lines.
+    """
+    lines: list[str] = []
+    for comment in comments:
+        text = comment.text
+        if text.startswith("//"):
+            text = text[2:]
+            if text.startswith(" "):
+                text = text[1:]
+            elif text and _DIRECTIVE_RE.match(text):
+                continue
+        else:
+            text = text[2:-2]
+        lines.extend(line.rstrip() for line in text.split("\n"))
+    kept: list[str] = []
+    for line in lines:
+        if line or (kept and kept[-1]):
+            kept.append(line)
+    if kept and kept[-1]:
+        kept.append("")
+    return "\n".join(kept)
+
+
+def _lead_comments(tokens: list[_Token], comments: list[_Comment]) -> dict[int, str]:
+    """Find the doc comments of tokens: comment groups on their own lines, ending right above the token.
+
+    Parameters:
+        tokens: The tokens of a file.
+        comments: The comments of the file.
+
+    Returns:
+        The text of the doc comments, by index of the token they document.
+    """
+    groups: list[list[_Comment]] = []
+    for comment in comments:
+        previous = groups[-1][-1] if groups else None
+        if (
+            previous is None
+            or comment.index != previous.index
+            or comment.start > previous.end + 1
+            or (comment.own_line and not previous.own_line)
+            or (comment.start > previous.end and not groups[-1][0].own_line)
+        ):
+            groups.append([comment])
+        else:
+            groups[-1].append(comment)
+    docs = {}
+    for group in groups:
+        index = group[0].index
+        if group[0].own_line and index < len(tokens) and tokens[index].line == group[-1].end + 1:
+            docs[index] = _comment_text(group)
+    return docs
+
+
+# Type expressions are parsed into small tuples, tagged by kind, to be printed like the Go printer does.
+_Node = tuple[Any, ...]
+# Struct fields and interface elements: names, type, tag and line comment.
+_Fields = list[tuple[list[str], Union[_Node, None], Union[str, None], Union[str, None]]]
+
+
+def _is_exported(name: str) -> bool:
+    return name[:1].isupper()
+
+
+def _base_type_name(node: _Node | None) -> tuple[str, bool]:
+    """Find the name of the named type in a type expression, like `go/doc`.
+
+    Parameters:
+        node: The type expression.
+
+    Returns:
+        The type name, and whether it is imported from another package.
+    """
+    while node is not None:
+        kind = node[0]
+        if kind == "ident":
+            return node[1], False
+        if kind == "sel":
+            return node[2], True
+        if kind in ("ptr", "paren", "index"):
+            node = node[1]
+        else:
+            break
+    return "", False
+
+
+class _Parser:
+    """Parse the declarations of a Go file, from its tokens."""
+
+    def __init__(self, tokens: list[_Token], comments: list[_Comment]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+        # Comments ending the line of a token, by index of the semicolon inserted after it.
+        self.trailing = {comment.index: comment.text for comment in comments if not comment.own_line}
+
+    def peek(self, offset: int = 0) -> str:
+        index = self.pos + offset
+        return self.tokens[index].text if index < len(self.tokens) else ""
+
+    def next(self) -> _Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def accept(self, text: str) -> bool:
+        if self.peek() == text:
+            self.pos += 1
+            return True
+        return False
+
+    def at_ident(self, offset: int = 0) -> bool:
+        index = self.pos + offset
+        return (
+            index < len(self.tokens) and self.tokens[index].kind == "ident" and self.tokens[index].text not in _KEYWORDS
+        )
+
+    def at_type(self, offset: int = 0) -> bool:
+        return self.at_ident(offset) or self.peek(offset) in _TYPE_START
+
+    def closing(self, index: int) -> int:
+        """Return the index of the bracket closing the one at the given index."""
+        depth = 0
+        while index < len(self.tokens):
+            text = self.tokens[index].text
+            if text in "([{":
+                depth += 1
+            elif text in ")]}":
+                depth -= 1
+                if depth == 0:
+                    return index
+            index += 1
+        return len(self.tokens) - 1
+
+    def skip_statement(self) -> None:
+        """Skip tokens up to the end of the current statement, and its semicolon."""
+        while self.pos < len(self.tokens):
+            text = self.peek()
+            if text in ("(", "[", "{"):
+                self.pos = self.closing(self.pos) + 1
+            elif text in (";", ")", "}"):
+                self.accept(";")
+                return
+            else:
+                self.pos += 1
+
+    def source(self, start: int, end: int) -> str:
+        """Print the tokens of an expression, spacing binary operators."""
+        parts = []
+        for token in self.tokens[start:end]:
+            if token.kind == "op" and token.text not in "()[].":
+                parts.append(f" {token.text} " if token.text != "," else ", ")
+            else:
+                parts.append(token.text)
+        return "".join(parts).replace("  ", " ").strip()
+
+    def line_comment(self) -> str | None:
+        """Return the comment ending the line of the last struct field or interface element parsed."""
+        return self.trailing.get(self.pos) if self.peek() == ";" else None
+
+    # Types.
+
+    def parse_type(self) -> _Node | None:
+        text = self.peek()
+        if self.at_ident():
+            name = self.next().text
+            node: _Node = ("ident", name)
+            if self.peek() == "." and self.at_ident(1):
+                self.pos += 1
+                node = ("sel", name, self.next().text)
+            if self.peek() == "[" and not self.array_follows():
+                end = self.closing(self.pos)
+                self.pos += 1
+                arguments = []
+                while self.pos < end:
+                    arguments.append(self.parse_constraint())
+                    self.accept(",")
+                self.pos = end + 1
+                node = ("index", node, arguments)
+            return node
+        if text == "*":
+            self.pos += 1
+            return ("ptr", self.parse_type())
+        if text == "(":
+            self.pos += 1
+            node = ("paren", self.parse_type())
+            self.accept(")")
+            return node
+        if text == "...":
+            self.pos += 1
+            return ("ellipsis", self.parse_type())
+        if text == "[":
+            end = self.closing(self.pos)
+            length = self.source(self.pos + 1, end)
+            self.pos = end + 1
+            return ("array", length, self.parse_type()) if length else ("slice", self.parse_type())
+        if text == "map":
+            self.pos += 1
+            end = self.closing(self.pos)
+            self.pos += 1
+            key = self.parse_type()
+            self.pos = end + 1
+            return ("map", key, self.parse_type())
+        if text == "chan":
+            self.pos += 1
+            direction = "chan<- " if self.accept("<-") else "chan "
+            return ("chan", direction, self.parse_type())
+        if text == "<-" and self.peek(1) == "chan":
+            self.pos += 2
+            return ("chan", "<-chan ", self.parse_type())
+        if text == "func":
+            self.pos += 1
+            return ("func", *self.parse_signature())
+        if text == "struct":
+            return self.parse_struct()
+        if text == "interface":
+            return self.parse_interface()
+        return None
+
+    def array_follows(self) -> bool:
+        """Tell whether the bracket after an identifier starts an array or slice type, rather than type arguments."""
+        end = self.closing(self.pos)
+        return end == self.pos + 1 or self.at_type(end - self.pos + 1)
+
+    def parse_constraint(self) -> _Node | None:
+        terms: list[_Node | None] = []
+        while True:
+            if self.accept("~"):
+                terms.append(("tilde", self.parse_type()))
+            else:
+                terms.append(self.parse_type())
+            if not self.accept("|"):
+                break
+        return terms[0] if len(terms) == 1 else ("union", terms)
+
+    def parse_params(self, *, constraints: bool = False) -> list[tuple[list[str], _Node | None]]:
+        """Parse a parameter list, its opening parenthesis or bracket included.
+
+        Returns:
+            The parameters, grouped like in the source: names (possibly none) and type.
+        """
+        end = self.closing(self.pos)
+        self.pos += 1
+        entries: list[tuple[str | None, _Node | None]] = []
+        while self.pos < end:
+            start = self.pos
+            following = self.peek(1)
+            if (
+                self.at_ident()
+                and following not in (",", ")", "]", ".", "|", "")
+                and (following != "[" or self.array_follows_at(1))
+            ):
+                name = self.next().text
+                entries.append((name, self.parse_constraint() if constraints else self.parse_type()))
+            else:
+                entries.append((None, self.parse_constraint() if constraints else self.parse_type()))
+            if self.pos == start:
+                self.pos += 1
+            self.accept(",")
+        self.pos = end + 1
+
+        if not any(name for name, _ in entries):
+            return [([], node) for _, node in entries]
+        # All parameters are named: lone identifiers are names sharing the type that follows them.
+        params: list[tuple[list[str], _Node | None]] = []
+        names: list[str] = []
+        for param, node in entries:
+            if param is None:
+                names.append(node[1] if node and node[0] == "ident" else "")
+            else:
+                params.append(([*names, param], node))
+                names = []
+        return params
+
+    def array_follows_at(self, offset: int) -> bool:
+        self.pos += offset
+        try:
+            return self.array_follows()
+        finally:
+            self.pos -= offset
+
+    def parse_signature(self) -> tuple[list, list]:
+        params = self.parse_params() if self.peek() == "(" else []
+        results: list[tuple[list[str], _Node | None]] = []
+        if self.peek() == "(":
+            results = self.parse_params()
+        elif self.at_type() and self.peek() != "(":
+            results = [([], self.parse_type())]
+        return params, results
+
+    def parse_struct(self) -> _Node:
+        line = self.next().line
+        end = self.closing(self.pos)
+        one_line = self.tokens[end].line == line
+        self.pos += 1
+        fields: _Fields = []
+        while self.pos < end:
+            if self.accept(";"):
+                continue
+            start = self.pos
+            names: list[str] = []
+            if self.at_ident() and self.peek(1) == ",":
+                while self.at_ident() and self.peek(1) == ",":
+                    names.append(self.next().text)
+                    self.pos += 1
+                names.append(self.next().text)
+                node = self.parse_type()
+            elif self.at_ident() and self.at_type(1) and (self.peek(1) != "[" or self.array_follows_at(1)):
+                names.append(self.next().text)
+                node = self.parse_type()
+            else:
+                node = self.parse_type()
+            tag = self.next().text if self.pos < end and self.tokens[self.pos].kind == "literal" else None
+            fields.append((names, node, tag, self.line_comment()))
+            if self.pos == start:
+                self.pos += 1
+            while self.pos < end and self.peek() != ";":
+                self.pos += 1
+        self.pos = end + 1
+        return ("struct", fields, one_line)
+
+    def parse_interface(self) -> _Node:
+        line = self.next().line
+        end = self.closing(self.pos)
+        one_line = self.tokens[end].line == line
+        self.pos += 1
+        elements: _Fields = []
+        while self.pos < end:
+            if self.accept(";"):
+                continue
+            start = self.pos
+            if self.at_ident() and self.peek(1) == "(":
+                name = self.next().text
+                elements.append(([name], ("method", *self.parse_signature()), None, None))
+            else:
+                elements.append(([], self.parse_constraint(), None, None))
+            elements[-1] = (*elements[-1][:3], self.line_comment())
+            if self.pos == start:
+                self.pos += 1
+            while self.pos < end and self.peek() != ";":
+                self.pos += 1
+        self.pos = end + 1
+        return ("interface", elements, one_line)
+
+
+def _print_params(params: list[tuple[list[str], _Node | None]], depth: int) -> str:
+    return ", ".join(
+        f"{', '.join(names)} {_print_type(node, depth)}" if names else _print_type(node, depth)
+        for names, node in params
+    )
+
+
+def _print_signature(params: list, results: list, depth: int) -> str:
+    signature = f"({_print_params(params, depth)})"
+    if len(results) == 1 and not results[0][0]:
+        return f"{signature} {_print_type(results[0][1], depth)}"
+    if results:
+        return f"{signature} ({_print_params(results, depth)})"
+    return signature
+
+
+def _print_members(keyword: str, members: _Fields, depth: int, *, one_line: bool) -> str:
+    """Print a struct or interface type, on one line when it is small enough like the Go printer."""
+    # Like the Go printer, names, types and tags are aligned in columns unless there is a single member.
+    separator = " " if len(members) == 1 else "\t"
+
+    def member(names: list[str], node: _Node | None, tag: str | None, comment: str | None, depth: int) -> str:
+        if node is not None and node[0] == "method":
+            printed = names[0] + _print_signature(node[1], node[2], depth)
+        else:
+            printed = _print_type(node, depth)
+            if names:
+                printed = f"{', '.join(names)}{separator}{printed}"
+        if tag:
+            printed = f"{printed}{separator}{tag}"
+        return f"{printed}\t{comment}" if comment else printed
+
+    if one_line:
+        if not members:
+            return f"{keyword}{{}}"
+        names, node, tag, comment = members[0]
+        if len(members) == 1 and tag is None and comment is None:
+            printed = member(names, node, None, None, depth)
+            size = (1 if names else 0) + len(
+                "func" + _print_signature(node[1], node[2], depth)
+                if node and node[0] == "method"
+                else _print_type(node, depth),
+            )
+            if size <= _ONE_LINE_MAX_SIZE and "\n" not in printed:
+                return f"{keyword}{{ {printed} }}"
+    indent = "\t" * (depth + 1)
+    lines = "".join(indent + member(*fields, depth + 1) + "\n" for fields in members)
+    return f"{keyword} {{\n{lines}{indent[:-1]}}}"
+
+
+def _print_type(node: _Node | None, depth: int = 0) -> str:
+    """Print a type expression like the Go printer does.
+
+    Parameters:
+        node: The parsed type expression.
+        depth: The indentation depth of multi-line struct and interface types.
+
+    Returns:
+        The printed type.
+    """
+    if node is None:
+        return ""
+    kind = node[0]
+    if kind == "ident":
+        return node[1]
+    if kind == "sel":
+        return f"{node[1]}.{node[2]}"
+    if kind == "index":
+        return f"{_print_type(node[1], depth)}[{', '.join(_print_type(arg, depth) for arg in node[2])}]"
+    if kind == "ptr":
+        return "*" + _print_type(node[1], depth)
+    if kind == "paren":
+        return f"({_print_type(node[1], depth)})"
+    if kind == "ellipsis":
+        return "..." + _print_type(node[1], depth)
+    if kind == "slice":
+        return "[]" + _print_type(node[1], depth)
+    if kind == "array":
+        return f"[{node[1]}]{_print_type(node[2], depth)}"
+    if kind == "map":
+        return f"map[{_print_type(node[1], depth)}]{_print_type(node[2], depth)}"
+    if kind == "chan":
+        return node[1] + _print_type(node[2], depth)
+    if kind == "func":
+        return "func" + _print_signature(node[1], node[2], depth)
+    if kind == "tilde":
+        return "~" + _print_type(node[1], depth)
+    if kind == "union":
+        return " | ".join(_print_type(term, depth) for term in node[1])
+    if kind in ("struct", "interface"):
+        return _print_members(kind, node[1], depth, one_line=node[2])
+    return ""
+
+
+class _File:
+    """The declarations of a Go file, before they are assembled into a package."""
+
+    def __init__(self, path: str, text: str) -> None:
+        self.path = path
+        self.package = ""
+        self.doc: str | None = None
+        self.imports: list[str] = []
+        # Exported declarations, in source order.
+        self.values: list[tuple[str, int, str, list[tuple[list[str], str]]]] = []
+        self.types: list[tuple[str, str, _Node | None]] = []
+        self.funcs: list[tuple[str, int, str, _Node | None, list, list, list[str]]] = []
+
+        tokens, comments = _tokenize(text)
+        self.docs = _lead_comments(tokens, comments)
+        self.parser = _Parser(tokens, comments)
+        self.parse()
+
+    def parse(self) -> None:
+        parser = self.parser
+        tokens = parser.tokens
+        while parser.pos < len(tokens):
+            index = parser.pos
+            keyword = parser.next()
+            if keyword.text == "package" and parser.at_ident():
+                self.package = parser.next().text
+                self.doc = self.docs.get(index)
+            elif keyword.text == "import":
+                self.parse_group(self.parse_import)
+            elif keyword.text in ("const", "var"):
+                self.parse_values(keyword, self.docs.get(index, ""))
+            elif keyword.text == "type":
+                self.parse_group(partial(self.parse_type_spec, self.docs.get(index, ""), grouped=parser.peek() == "("))
+            elif keyword.text == "func":
+                self.parse_func(keyword, self.docs.get(index, ""))
+            elif keyword.kind != ";":
+                parser.pos -= 1
+                parser.skip_statement()
+
+    def parse_group(self, parse_spec: Callable[[], None]) -> None:
+        parser = self.parser
+        if not parser.accept("("):
+            parse_spec()
+            parser.skip_statement()
+            return
+        while parser.pos < len(parser.tokens) and not parser.accept(")"):
+            if parser.accept(";"):
+                continue
+            parse_spec()
+            parser.skip_statement()
+        parser.accept(";")
+
+    def parse_import(self) -> None:
+        parser = self.parser
+        if parser.at_ident() or parser.peek() == ".":
+            parser.pos += 1
+        if parser.pos < len(parser.tokens) and parser.tokens[parser.pos].kind == "literal":
+            self.imports.append(parser.next().text[1:-1])
+
+    def parse_values(self, keyword: _Token, doc: str) -> None:
+        parser = self.parser
+        # Specs with exported names, with the name of their type in the package.
+        specs: list[tuple[list[str], str]] = []
+        previous = ""
+
+        def parse_spec() -> None:
+            nonlocal previous
+            names = []
+            while parser.at_ident():
+                names.append(parser.next().text)
+                if not parser.accept(","):
+                    break
+            node = None if parser.peek() in ("=", ";", ")") else parser.parse_type()
+            has_values = parser.peek() == "="
+            # The type of constants repeating the previous expression is the previous type.
+            if node is not None:
+                name, imported = _base_type_name(node)
+                type_name = "" if imported else name
+            elif keyword.text == "const" and not has_values:
+                type_name = previous
+            else:
+                type_name = ""
+            previous = type_name
+            if not any(_is_exported(name) for name in names):
+                return
+            if has_values or node is None:
+                # Unexported names are kept as blanks to match values, or the position of `iota`.
+                specs.append(([name if _is_exported(name) else "_" for name in names], type_name))
+            else:
+                specs.append(([name for name in names if _is_exported(name)], type_name))
+
+        self.parse_group(parse_spec)
+        if specs:
+            self.values.append((keyword.text, keyword.line, doc, specs))
+
+    def parse_type_spec(self, decl_doc: str, *, grouped: bool) -> None:
+        parser = self.parser
+        index = parser.pos
+        if not parser.at_ident():
+            return
+        name = parser.next().text
+        doc = (self.docs.get(index) if grouped else None) or decl_doc
+        if parser.peek() == "[" and parser.at_ident(1) and parser.peek(2) != "]":
+            parser.parse_params(constraints=True)
+        parser.accept("=")
+        self.types.append((name, doc, parser.parse_type()))
+
+    def parse_func(self, keyword: _Token, doc: str) -> None:
+        parser = self.parser
+        receiver = parser.parse_params() if parser.peek() == "(" else None
+        if not parser.at_ident():
+            parser.skip_statement()
+            return
+        name = parser.next().text
+        type_params = parser.parse_params(constraints=True) if parser.peek() == "[" else []
+        params, results = parser.parse_signature()
+        if parser.peek() == "{":
+            parser.pos = parser.closing(parser.pos) + 1
+        recv_node = receiver[0][1] if receiver else None
+        type_param_names = [name for names, _ in type_params for name in names]
+        if _is_exported(name):
+            self.funcs.append((name, keyword.line, doc, recv_node, params, results, type_param_names))
+
+
+def _go_files(directory: Path) -> list[str]:
+    try:
+        return sorted(entry.path for entry in os.scandir(directory) if entry.name.endswith(".go") and entry.is_file())
+    except OSError:
+        return []
+
+
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as file:
+        return file.read()
+
+
+class _Type:
+    """A named type of the package being assembled, with its associated declarations."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.declared = False
+        self.doc = ""
+        self.node: _Node | None = None
+        self.values: list[tuple[str, int, dict]] = []
+        self.funcs: dict[str, dict] = {}
+        # Methods by name, with their embedding level: promoted methods conflicting at the same level are None.
+        self.methods: dict[str, tuple[int, dict | None]] = {}
+        # Embedded types of the package, and whether they are embedded through a pointer.
+        self.embedded: dict[str, bool] = {}
+
+
+def _set_func(funcs: dict[str, dict], func: dict) -> None:
+    # Functions declared in several files, for different build constraints, are documented once:
+    # the first documented one wins, like with `go/doc`.
+    old = funcs.get(func["name"])
+    if old is None or not old["doc"]:
+        funcs[func["name"]] = func
+
+
+def _sorted_values(values: list[tuple[str, int, dict]], kind: str) -> list[dict]:
+    # Single declarations are sorted by name, after groups kept in source order.
+    return [value for _, _, value in sorted(entry for entry in values if entry[2]["type"] == kind)]
+
+
+def _factory_type(results: list[tuple[list[str], _Node | None]], type_params: list[str]) -> str:
+    """Find the type a function is a factory of, like `go/doc`.
+
+    Parameters:
+        results: The results of the function.
+        type_params: The type parameters of the function.
+
+    Returns:
+        The name of the only exported type of the package returned, possibly in a slice or array, or an empty string.
+    """
+    found = ""
+    for _, node in results:
+        if node is not None and node[0] in ("slice", "array"):
+            node = node[-1]  # noqa: PLW2901
+        name, imported = _base_type_name(node)
+        if imported or not _is_exported(name) or name in _PREDECLARED_TYPES or name in type_params:
+            continue
+        if found:
+            return ""
+        found = name
+    return found
+
+
+def _parse_package(directory: Path) -> dict:
+    """Collect the documentation of a Go package, in the same shape as godocjson output.
+
+    Only exported declarations are collected. Like `go/doc`, constants and variables of a type,
+    and functions returning a single type of the package, are documented with that type,
+    as well as the methods promoted from unexported embedded types. Struct types also list
+    their exported fields, which godocjson does not provide.
+
+    Parameters:
+        directory: The package directory.
+
+    Returns:
+        The documentation data of the package.
+
+    Raises:
+        ValueError: When the directory contains no Go file.
+    """
+    files = [_File(path, _read_file(path)) for path in _go_files(directory)]
+    names = [file.package for file in files if file.package]
+    if not names:
+        raise ValueError("Provided package contains empty file")
+    # Files of external test packages (`pkg_test`) are left out.
+    package_name = next((name for name in names if not name.endswith("_test")), names[0])
+    files = [file for file in files if file.package == package_name]
+    import_path = str(directory)
+
+    types: dict[str, _Type] = {}
+    for file in files:
+        for name, doc, node in file.types:
+            typ = types.setdefault(name, _Type(name))
+            typ.declared = True
+            typ.doc = doc
+            typ.node = node
+            # Like with `go/doc`, only the types embedded in exported types can promote methods.
+            if node is None or node[0] not in ("struct", "interface") or not _is_exported(name):
+                continue
+            for field_names, field_node, *_ in node[1]:
+                if field_names or field_node is None:
+                    continue
+                embedded_name, imported = _base_type_name(field_node)
+                if embedded_name and not imported:
+                    types.setdefault(embedded_name, _Type(embedded_name))
+                    typ.embedded[embedded_name] = field_node[0] == "ptr"
+
+    def documented_type(name: str) -> _Type | None:
+        typ = types.get(name)
+        return typ if typ is not None and typ.declared and _is_exported(name) else None
+
+    values: list[tuple[str, int, dict]] = []
+    funcs: dict[str, dict] = {}
+    order = count()
+    for file in files:
+        for kind, line, doc, specs in file.values:
+            value = {
+                "packageName": package_name,
+                "packageImportPath": import_path,
+                "doc": doc,
+                "names": [name for names, _ in specs for name in names],
+                "type": kind,
+                "filename": file.path,
+                "line": line,
+            }
+            sort_name = specs[0][0][0] if len(specs) == 1 else ""
+            # Declarations are documented with the type of most of their specs.
+            type_names = [type_name for _, type_name in specs if type_name]
+            owner = None
+            if type_names and len(set(type_names)) == 1 and len(type_names) >= int(len(specs) * 0.75):
+                owner = documented_type(type_names[0])
+            (values if owner is None else owner.values).append((sort_name, next(order), value))
+
+        for name, line, doc, recv_node, params, results, type_params in file.funcs:
+            func = {
+                "doc": doc,
+                "name": name,
+                "packageName": package_name,
+                "packageImportPath": import_path,
+                "type": "func",
+                "filename": file.path,
+                "line": line,
+                "parameters": [
+                    {"type": _print_type(node), "name": param} for names, node in params for param in names or [""]
+                ],
+                "results": [
+                    {"type": _print_type(node), "name": result} for names, node in results for result in names or [""]
+                ],
+                "recv": "",
+                "orig": "",
+            }
+            if recv_node is None:
+                owner = documented_type(_factory_type(results, type_params))
+                _set_func(funcs if owner is None else owner.funcs, func)
+                continue
+            recv_name, imported = _base_type_name(recv_node)
+            if recv_name and not imported:
+                func["recv"] = func["orig"] = _print_type(recv_node)
+                methods = types.setdefault(recv_name, _Type(recv_name)).methods
+                old = methods.get(name)
+                if old is None or not (old[1] and old[1]["doc"]):
+                    methods[name] = (0, func)
+
+    for typ in types.values():
+        if typ.node is not None and typ.node[0] == "struct":
+            _collect_embedded_methods(types, typ.methods, typ, typ.name, embedded_is_ptr=False, level=1, visited=set())
+
+    documented_types = []
+    for name in sorted(types):
+        typ = types[name]
+        if documented_type(name) is None:
+            continue
+        entry = {
+            "packageName": package_name,
+            "packageImportPath": import_path,
+            "doc": typ.doc,
+            "name": name,
+            "type": "type",
+            "filename": "",
+            "line": 0,
+            "consts": _sorted_values(typ.values, "const"),
+            "vars": _sorted_values(typ.values, "var"),
+            "funcs": [typ.funcs[key] for key in sorted(typ.funcs)],
+            # Only methods promoted from unexported types are documented, others are documented with their type.
+            "methods": [
+                method
+                for level, method in (typ.methods[key] for key in sorted(typ.methods))
+                if method is not None and (level == 0 or not _is_exported(method["orig"].lstrip("*")))
+            ],
+        }
+        if typ.node is not None and typ.node[0] == "struct":
+            entry["fields"] = [
+                {"name": field_name, "type": _print_type(node)} if names else {"name": _print_type(node), "type": ""}
+                for names, node, *_ in typ.node[1]
+                for field_name in names or [_base_type_name(node)[0]]
+                if _is_exported(field_name)
+            ]
+        documented_types.append(entry)
+
+    return {
+        "type": "package",
+        "doc": "\n".join(file.doc for file in files if file.doc),
+        "name": package_name,
+        "importPath": import_path,
+        "imports": sorted({path for file in files for path in file.imports}),
+        "filenames": [file.path for file in files],
+        "notes": {},
+        "bugs": None,
+        "consts": _sorted_values(values, "const"),
+        "types": documented_types,
+        "vars": _sorted_values(values, "var"),
+        "funcs": [funcs[key] for key in sorted(funcs)],
+    }
+
+
+def _collect_embedded_methods(
+    types: dict[str, _Type],
+    methods: dict[str, tuple[int, dict | None]],
+    typ: _Type,
+    recv_name: str,
+    *,
+    embedded_is_ptr: bool,
+    level: int,
+    visited: set[str],
+) -> None:
+    """Add the methods promoted from the types embedded in a struct to its method set, like `go/doc`.
+
+    Parameters:
+        types: The types of the package.
+        methods: The method set to update.
+        typ: The type whose embedded types are visited.
+        recv_name: The name of the struct type, receiver of the promoted methods.
+        embedded_is_ptr: Whether the type is embedded through a pointer.
+        level: The embedding depth: methods at a lower depth win, conflicting ones at the same depth are dropped.
+        visited: The types being visited, to stop at embedding cycles.
+    """
+    visited.add(typ.name)
+    for name, is_ptr in typ.embedded.items():
+        embedded = types[name]
+        this_is_ptr = embedded_is_ptr or is_ptr
+        for method_name, (method_level, method) in embedded.methods.items():
+            if method_level != 0 or method is None:
+                continue
+            recv = recv_name
+            if not this_is_ptr and method["orig"].startswith("*"):
+                recv = "*" + recv
+            old = methods.get(method_name)
+            if old is None or level < old[0]:
+                methods[method_name] = (level, {**method, "recv": recv})
+            elif level == old[0]:
+                methods[method_name] = (level, None)
+        if name not in visited:
+            _collect_embedded_methods(
+                types,
+                methods,
+                embedded,
+                recv_name,
+                embedded_is_ptr=this_is_ptr,
+                level=level + 1,
+                visited=visited,
+            )
+    visited.discard(typ.name)
@@ -1,13 +1,78 @@
-import subprocess
-from os.path import expanduser, isfile
+from __future__ import annotations
+
+import functools
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
 
 from jinja2 import Environment, Template, TemplateNotFound, pass_context, pass_environment
-from jinja2.runtime import Context
 from markupsafe import Markup
 from mkdocstrings import get_logger
 
+if TYPE_CHECKING:
+    from jinja2.runtime import Context
+
+    from mkdocstrings_handlers.go._internal.config import GoOptions
+    from mkdocstrings_handlers.go._internal.formatting import _Formatter
+
 _logger = get_logger(__name__)
 
+_TEMPLATES_DIR = str(Path(__file__).parent.parent / "templates")
+
+
+class _HighlightCache:
+    """Remember highlighted code, bounded by the size of the cached text and HTML.
+
+    Highlighting is keyed by the text and every parameter of the `highlight` filter
+    (language, classes, line numbers...), so identical signatures and source blocks
+    are lexed only once per build.
+    """
+
+    def __init__(self, max_size: int = 32 * 1024 * 1024) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            max_size: The maximum total size of the cached text and HTML, in characters.
+        """
+        self.max_size = max_size
+        """The maximum total size of the cached text and HTML, in characters."""
+        self.hits = 0
+        """The number of highlights served from the cache."""
+        self.misses = 0
+        """The number of highlights computed."""
+        self._entries: OrderedDict[tuple, tuple[Markup, int]] = OrderedDict()
+        self._size = 0
+
+    def wrap(self, highlight: Callable[..., Markup]) -> Callable[..., Markup]:
+        """Wrap a `highlight` filter to go through the cache.
+
+        Parameters:
+            highlight: The `highlight` filter of the Jinja environment.
+
+        Returns:
+            A filter with the same signature.
+        """
+
+        def cached_highlight(src: str, *args: Any, **kwargs: Any) -> Markup:
+            key = (type(src), str(src), repr(args), repr(sorted(kwargs.items())))
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+
+            self.misses += 1
+            html = highlight(src, *args, **kwargs)
+            size = len(key[1]) + len(html)
+            if size <= self.max_size:
+                self._entries[key] = (html, size)
+                self._size += size
+                while self._size > self.max_size:
+                    self._size -= self._entries.popitem(last=False)[1][1]
+            return html
+
+        return cached_highlight
+
 
 @pass_context
 def do_format_types(ctx: Context, _: str) -> str:
@@ -25,30 +90,78 @@ def do_format_types(ctx: Context, _: str) -> str:
     return template.render(data=data)
 
 
-def _format_signature(name: Markup, signature: str, line_length: int) -> str:
+def _is_builtin_template(env: Environment, name: str) -> bool:
+    # Whether the template and its base are ours, and not overridden by custom templates.
+    return all(
+        (env.get_template(template).filename or "").startswith(_TEMPLATES_DIR) for template in (name, f"_base/{name}")
+    )
+
+
+def _render_signature(context: Context, template_name: str, obj: dict, **variables: Any) -> str:
+    """Return the signature of an object.
+
+    Signatures are precomputed at collection time, and only rendered
+    with their template when users override it.
+
+    Parameters:
+        context: The Jinja context of the calling template.
+        template_name: The name of the signature template.
+        obj: The object.
+        **variables: The variables the template expects.
+
+    Returns:
+        The signature, empty when signatures are not shown.
+    """
+    env = context.environment
+    if "signature" in obj and _is_builtin_template(env, template_name):
+        return obj["signature"] if getattr(context.get("config"), "show_signature", False) else ""
+    template = env.get_template(template_name)
+    return template.render(context.parent, **variables, signature=True)
+
+
+def _format_signature(name: Markup, signature: str, line_length: int, formatter: _Formatter) -> str:
     name = str(name).strip()  # type: ignore[assignment]
     signature = signature.strip()
     if len(name + signature) < line_length:
         return name + signature
+    return formatter.format_signature(name + signature, line_length)
+
+
+def _with_formatter(function: Callable, formatter: _Formatter) -> Callable:
+    """Bind the formatter of a handler to a filter, keeping what Jinja passes to the filter.
+
+    Parameters:
+        function: The filter, taking a `formatter` keyword argument.
+        formatter: The formatter of the handler.
+
+    Returns:
+        The bound filter.
+    """
+    return functools.update_wrapper(functools.partial(function, formatter=formatter), function)
+
+
+def _iter_objects(data: Any) -> Any:
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from _iter_objects(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _iter_objects(item)
 
-    # try to use golines formatter if installed
-    full = name + signature
-    if isfile(expanduser("~/go/bin/golines")):
-        formatted = subprocess.run(  # noqa: S603
-            [expanduser("~/go/bin/golines"), f"--max-len={line_length}"],
-            input=full,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if formatted.stdout != "":
-            return formatted.stdout
-
-    # try to manualy format
-    code = name + signature
-    code = code.replace("(", "\n(\n")
-    code = code.replace(")", "\n)\n")
-    return code.replace(", ", ",\n")
+
+def _prepare_formatting(data: dict, options: GoOptions, formatter: _Formatter) -> None:
+    """Format in a single batch the source blocks that rendering the data will format.
+
+    Parameters:
+        data: The collected data about to be rendered.
+        options: The rendering options.
+        formatter: The formatter of the handler.
+    """
+    if not (options.show_source and options.format_code and formatter.available):
+        return
+    snippets = [obj["code"] for obj in _iter_objects(data) if obj.get("code")]
+    formatter.format_many(snippets, options.line_length)
 
 
 def _format_type_signature(signature: str) -> str:
@@ -59,6 +172,8 @@ def do_format_code(
     code: str,
     line_length: int,
     format_code: bool, # noqa: FBT001
+    *,
+    formatter: _Formatter,
 ) -> str:
     """Format source code block.
 
@@ -66,26 +181,21 @@ def do_format_code(
         code: go code to format
         line_length: line length specified in GoOptions
         format_code: flag wether to perform formatting specified in GoOptions
+        formatter: The formatter of the handler, bound when the filter is registered.
 
 
-    Formats given code bloc using golines formatter.
-    If golines is unavailable code is left unformatted.
+    Formats given code bloc using the configured formatter.
+    If no formatter is available code is left unformatted.
 
     Returns:
         The same code, formatted.
     """
-    if not format_code or not isfile(expanduser("~/go/bin/golines")):
+    if not format_code:
         return code
-    formatted = subprocess.run(  # noqa: S603
-        [expanduser("~/go/bin/golines"), f"--max-len={line_length}"],
-        input=code,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if formatted.stdout != "":
-        return formatted.stdout
-    # golines failed - no format
+    formatted = formatter.format(code, line_length)
+    if formatted != "":
+        return formatted
+    # formatting failed - no format
     return code
 
 
@@ -95,6 +205,8 @@ def do_format_signature(
     callable_path: Markup,
     function: dict,
     line_length: int,
+    *,
+    formatter: _Formatter,
 ) -> str:
     """Format a signature.
 
@@ -103,20 +215,16 @@ def do_format_signature(
         callable_path: The path of the callable we render the signature of.
         function: The function we render the signature of.
         line_length: The line length.
+        formatter: The formatter of the handler, bound when the filter is registered.
 
-    Formats given signature using golines formatter.
-    If golines is unavailable code is left unformatted.
+    Wraps the signature to the line length, one parameter per line.
 
     Returns:
         The same code, formatted.
     """
     env = context.environment
-    template = env.get_template("signature.html.jinja")
-
-    new_context = context.parent
-
-    signature = template.render(new_context, function=function, signature=True)
-    signature = _format_signature(callable_path, signature, line_length)
+    signature = _render_signature(context, "signature.html.jinja", function, function=function)
+    signature = _format_signature(callable_path, signature, line_length, formatter)
 
     return str(
         env.filters["highlight"](
@@ -146,10 +254,7 @@ def do_format_struct_signature(
         Highlighted formatted signature
     """
     env = context.environment
-    template = env.get_template("struct_signature.html.jinja")
-
-    new_context = context.parent
-    signature = template.render(new_context, struct=struct, signature=True)
+    signature = _render_signature(context, "struct_signature.html.jinja", struct, struct=struct)
     signature = _format_type_signature(signature)
 
     return str(
@@ -180,10 +285,7 @@ def do_format_const_signature(
         Highlighted const declaration
     """
     env = context.environment
-    template = env.get_template("const_signature.html.jinja")
-
-    new_context = context.parent
-    signature = template.render(new_context, const=const, signature=True)
+    signature = _render_signature(context, "const_signature.html.jinja", const, const=const)
     signature = _format_type_signature(signature)
 
     return str(
@@ -201,6 +303,7 @@ _TEMPLATE_MAP = {
     "func": "function.html.jinja",
     "type": "struct.html.jinja",
     "package": "package.html.jinja",
+    "packages": "packages.html.jinja",
     "const": "const.html.jinja",
 }
 
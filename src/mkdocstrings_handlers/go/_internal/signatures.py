@@ -0,0 +1,225 @@
+# Building and layout of Go signatures.
+
+from __future__ import annotations
+
+from typing import Any
+
+from markupsafe import escape
+
+_OPENING = {"(": ")", "[": "]", "{": "}"}
+_CLOSING = frozenset(_OPENING.values())
+# golines measures tabs as 4 columns.
+_TAB_WIDTH = 4
+
+
+def _skip_string(text: str, index: int) -> int:
+    quote = text[index]
+    index += 1
+    while index < len(text) and text[index] != quote:
+        index += 2 if quote != "`" and text[index] == "\\" else 1
+    return index
+
+
+def _match_bracket(text: str, start: int) -> int:
+    """Find the bracket closing the one at the given index.
+
+    Parameters:
+        text: The Go code.
+        start: The index of an opening bracket.
+
+    Returns:
+        The index of the closing bracket, or -1 if it is not closed.
+    """
+    depth = 0
+    index = start
+    while index < len(text):
+        char = text[index]
+        if char in _OPENING:
+            depth += 1
+        elif char in _CLOSING:
+            depth -= 1
+            if depth == 0:
+                return index
+        elif char in "\"'`":
+            index = _skip_string(text, index)
+        index += 1
+    return -1
+
+
+def _split_list(text: str) -> list[str]:
+    """Split a comma-separated list on its top-level commas, ignoring commas of nested types.
+
+    Parameters:
+        text: The contents of a parameter, result or type parameter list.
+
+    Returns:
+        The stripped items of the list.
+    """
+    items = []
+    depth = 0
+    start = index = 0
+    while index < len(text):
+        char = text[index]
+        if char in _OPENING:
+            depth += 1
+        elif char in _CLOSING:
+            depth -= 1
+        elif char in "\"'`":
+            index = _skip_string(text, index)
+        elif char == "," and depth == 0:
+            items.append(text[start:index].strip())
+            start = index + 1
+        index += 1
+    items.append(text[start:].strip())
+    return [item for item in items if item]
+
+
+def _width(line: str) -> int:
+    return len(line.expandtabs(_TAB_WIDTH))
+
+
+def _wrap_list(opening: str, items: list[str], closing: str) -> str:
+    if not items:
+        return opening + closing
+    return opening + "\n" + "".join(f"\t{item},\n" for item in items) + closing
+
+
+def _wrap_signature(code: str, line_length: int) -> str:
+    """Wrap a Go function signature to the given line length, the way golines does.
+
+    Parameters are put one per line, with trailing commas. Results are wrapped the same way
+    when the closing line is still too long, and so are type parameters when the opening line is.
+    Nested types (func types, maps, anonymous structs...) are kept on a single line.
+
+    Parameters:
+        code: The signature, for example `func Map[T, U any](items []T, f func(T) U) ([]U, error)`.
+        line_length: The maximum line length.
+
+    Returns:
+        The wrapped signature, or the stripped signature if it fits or cannot be parsed.
+    """
+    code = code.strip()
+    if _width(code) <= line_length:
+        return code
+
+    # A receiver is part of the head, and is never wrapped.
+    start = 0
+    if code.startswith("func") and code[4:].lstrip().startswith("("):
+        start = _match_bracket(code, code.index("(")) + 1
+        if start == 0:
+            return code
+    params_start = code.find("(", start)
+    if params_start == -1:
+        return code
+    head = code[:params_start].rstrip()
+
+    type_params: list[str] | None = None
+    if head.endswith("]"):
+        type_params_start = head.find("[", start)
+        if type_params_start == -1 or _match_bracket(head, type_params_start) != len(head) - 1:
+            return code
+        type_params = _split_list(head[type_params_start + 1 : -1])
+        head = head[:type_params_start]
+
+    params_end = _match_bracket(code, params_start)
+    if params_end == -1:
+        return code
+    params = _split_list(code[params_start + 1 : params_end])
+
+    results = code[params_end + 1 :].strip()
+    result_list: list[str] | None = None
+    if results.startswith("(") and _match_bracket(results, 0) == len(results) - 1:
+        result_list = _split_list(results[1:-1])
+
+    opening = head
+    if type_params is not None:
+        opening += "[" + ", ".join(type_params) + "]"
+        if _width(opening + "(") > line_length:
+            opening = _wrap_list(head + "[", type_params, "]")
+
+    signature = _wrap_list(opening + "(", params, ")")
+    if not results:
+        return signature
+    last_line = signature.rsplit("\n", 1)[-1]
+    if result_list and _width(f"{last_line} {results}") > line_length:
+        return signature + " " + _wrap_list("(", result_list, ")")
+    return f"{signature} {results}"
+
+
+# The builders below produce exactly what the signature templates render (stripped),
+# including the escaping done by the autoescaping Jinja environment.
+
+
+def _text(value: Any) -> str:
+    return str(escape(value))
+
+
+def _func_signature(func: dict) -> str:
+    """Build the parameter and result lists of a function, like `signature.html.jinja`.
+
+    Parameters:
+        func: The godocjson data of a function or method.
+
+    Returns:
+        The signature, without the `func` keyword and name.
+    """
+    params = ", ".join(
+        f"{_text(param.get('name', ''))} {_text(param.get('type', ''))}" for param in func.get("parameters") or ()
+    )
+    results = ", ".join(
+        f"{_text(result['name'])} {_text(result.get('type', ''))}"
+        if result.get("name")
+        else _text(result.get("type", ""))
+        for result in func.get("results") or ()
+    )
+    return f"({params}) ({results})"
+
+
+def _struct_signature(struct: dict) -> str:
+    """Build the signature of a type, like `struct_signature.html.jinja`.
+
+    Parameters:
+        struct: The godocjson data of a type.
+
+    Returns:
+        The signature.
+    """
+    fields = struct.get("fields")
+    if not fields:
+        return f"type {_text(struct.get('name', ''))} struct    {{}}"
+    members = ", ".join(f"      {_text(field.get('name', ''))} {_text(field.get('type', ''))}" for field in fields)
+    return f"type {_text(struct.get('name', ''))} struct  ({members}  )"
+
+
+def _const_signature(const: dict) -> str:
+    """Build the signature of a constant, like `const_signature.html.jinja`.
+
+    Parameters:
+        const: The godocjson data of a constant declaration.
+
+    Returns:
+        The signature.
+    """
+    names = const.get("names") or [""]
+    signature = f"const {_text(names[0])}"
+    if "value" in const:
+        signature += f" = {_text(const['value'])}"
+    return signature
+
+
+def _add_signatures(package: dict) -> None:
+    """Attach their signature to the functions, types and constants of a package.
+
+    Parameters:
+        package: The godocjson data of a package, updated in place.
+    """
+    for const in package.get("consts") or ():
+        const["signature"] = _const_signature(const)
+    for func in package.get("funcs") or ():
+        func["signature"] = _func_signature(func)
+    for type_ in package.get("types") or ():
+        type_["signature"] = _struct_signature(type_)
+        for const in type_.get("consts") or ():
+            const["signature"] = _const_signature(const)
+        for func in (*(type_.get("funcs") or ()), *(type_.get("methods") or ())):
+            func["signature"] = _func_signature(func)
@@ -0,0 +1,241 @@
+# Scanning and caching of Go source files.
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Tokens that matter to find declarations: brackets, newlines, and everything
+# that can contain brackets or newlines without being code (comments, strings, runes).
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<newline>\n)
+    |(?P<open>[({\[])
+    |(?P<close>[)}\]])
+    |(?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<raw>`[^`]*`)
+    |"(?:\\.|[^"\\\n])*"
+    |'(?:\\.|[^'\\\n])*'
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_DECL_RE = re.compile(r"[ \t]*(?P<keyword>func|type|const|var|import)\b[ \t]*(?:(?P<group>\()|(?P<name>[^\W\d]\w*))?")
+_SPEC_RE = re.compile(r"[ \t]*(?P<name>[^\W\d]\w*)")
+# A line ending with one of these characters continues on the next line (no automatic semicolon).
+_CONTINUATION_CHARS = frozenset(",.=+-*/%&|^<>!:")
+
+
+@dataclass
+class _Outline:
+    """Top-level declarations of a Go source file."""
+
+    types: dict[str, int] = field(default_factory=dict)
+    """Type names mapped to the line of their declaration, including specs of `type (...)` groups."""
+    spans: dict[int, int] = field(default_factory=dict)
+    """First lines of declarations (and of grouped type specs) mapped to their last line."""
+
+
+def _scan_declarations(text: str) -> _Outline:
+    """Find the top-level declarations of a Go source file, in a single pass.
+
+    Brackets, comments, strings and runes are tracked so that nested code never matches,
+    and a declaration ends on the first line where brackets are balanced and
+    Go would insert an automatic semicolon.
+
+    Parameters:
+        text: The contents of the Go source file.
+
+    Returns:
+        The outline of the file, with 1-based line numbers.
+    """
+    outline = _Outline()
+    types, spans = outline.types, outline.spans
+    depth = 0
+    line = 1
+    line_start = 0
+    comment_start = comment_end = -1
+    decl_line = spec_line = 0  # First line of the current declaration and type spec, 0 when outside.
+    type_group = False
+
+    def ends_statement(pos: int) -> bool:
+        end = pos
+        if comment_end >= line_start and not text[comment_end:pos].strip():
+            end = comment_start
+        code = text[min(line_start, end) : end].rstrip()
+        return bool(code) and code[-1] not in _CONTINUATION_CHARS
+
+    def start_declaration(pos: int) -> None:
+        nonlocal decl_line, type_group
+        if match := _DECL_RE.match(text, pos):
+            decl_line = line
+            if match["keyword"] == "type":
+                if match["group"]:
+                    type_group = True
+                elif match["name"]:
+                    types.setdefault(match["name"], line)
+
+    start_declaration(0)
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "newline":
+            if decl_line and (depth == 0 or (spec_line and depth == 1)) and ends_statement(match.start()):
+                if depth == 0:
+                    spans[decl_line] = line
+                    decl_line = 0
+                    type_group = False
+                else:
+                    spans[spec_line] = line
+                    spec_line = 0
+            line += 1
+            line_start = match.end()
+            if depth == 0:
+                if not decl_line:
+                    start_declaration(line_start)
+            elif depth == 1 and type_group and not spec_line and (spec := _SPEC_RE.match(text, line_start)):
+                spec_line = line
+                types.setdefault(spec["name"], line)
+        elif kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth = max(depth - 1, 0)
+            if depth == 0 and spec_line:
+                spans[spec_line] = line
+                spec_line = 0
+        elif kind == "comment":
+            comment_start, comment_end = match.span()
+            if text[comment_start + 1] == "*":
+                line += match.group().count("\n")
+        elif kind == "raw":
+            line += match.group().count("\n")
+
+    if spec_line:
+        spans[spec_line] = line
+    if decl_line:
+        spans[decl_line] = line
+    return outline
+
+
+class _SourceCache:
+    """A bounded cache of the lines of source files, validated by modification time.
+
+    Files are read once per build, and read again only when they change on disk.
+    The same immutable sequence of lines is handed out to every caller, without copies.
+    The cache is thread-safe: files are read outside of its lock.
+    """
+
+    def __init__(self, max_files: int = 256) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            max_files: The maximum number of files kept in memory, least recently used files are dropped first.
+        """
+        self.max_files = max_files
+        """The maximum number of files kept in memory."""
+        self.hits = 0
+        """The number of reads served from memory."""
+        self.misses = 0
+        """The number of reads that went to the disk."""
+        self._files: OrderedDict[str, tuple[int, tuple[str, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def lines(self, path: str) -> Sequence[str]:
+        """Return the lines of a file, with their line endings.
+
+        Parameters:
+            path: The path of the file.
+
+        Returns:
+            The lines of the file.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == mtime:
+                self.hits += 1
+                self._files.move_to_end(path)
+                return cached[1]
+            self.misses += 1
+
+        with open(path, encoding="utf-8", errors="replace") as file:
+            lines = tuple(file)
+        with self._lock:
+            self._files[path] = (mtime, lines)
+            self._files.move_to_end(path)
+            if len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return lines
+
+
+class _DeclarationIndex:
+    """Outlines of the top-level declarations of Go files and package directories.
+
+    Files are scanned once, and scanned again only when their modification time changes.
+    Lookups are thread-safe: concurrent scans of the same file are redundant, not harmful.
+    """
+
+    def __init__(self, sources: _SourceCache) -> None:
+        """Initialize the index.
+
+        Parameters:
+            sources: The cache through which source files are read.
+        """
+        self._sources = sources
+        self._files: dict[str, tuple[int, _Outline]] = {}
+        self._directories: dict[str, tuple[tuple, dict[str, tuple[str, int]]]] = {}
+
+    def _scan_file(self, path: str, mtime: int) -> _Outline:
+        cached = self._files.get(path)
+        if cached is None or cached[0] != mtime:
+            text = "".join(self._sources.lines(path))
+            cached = self._files[path] = (mtime, _scan_declarations(text))
+        return cached[1]
+
+    def outline(self, path: str) -> _Outline:
+        """Return the outline of a Go file.
+
+        Parameters:
+            path: The path of the file.
+
+        Returns:
+            The outline of the file.
+        """
+        return self._scan_file(path, os.stat(path).st_mtime_ns)
+
+    def find_type(self, directory: str, name: str) -> tuple[str, int] | None:
+        """Find the declaration of a type.
+
+        Parameters:
+            directory: The package directory.
+            name: The name of the type.
+
+        Returns:
+            A tuple of the file path and line number of the declaration, or None if not found.
+        """
+        try:
+            files = sorted(
+                (entry.path, entry.stat().st_mtime_ns)
+                for entry in os.scandir(directory)
+                if entry.name.endswith(".go") and entry.is_file()
+            )
+        except OSError:
+            return None
+
+        signature = tuple(files)
+        cached = self._directories.get(directory)
+        if cached is None or cached[0] != signature:
+            declarations: dict[str, tuple[str, int]] = {}
+            for path, mtime in files:
+                for type_name, line in self._scan_file(path, mtime).types.items():
+                    declarations.setdefault(type_name, (path, line))
+            cached = self._directories[directory] = (signature, declarations)
+        return cached[1].get(name)
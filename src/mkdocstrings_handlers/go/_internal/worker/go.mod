@@ -0,0 +1,3 @@
+module mkdocstrings-go/worker
+
+go 1.20
@@ -0,0 +1,180 @@
+// Command worker documents Go packages like godocjson, in a long-running process.
+//
+// Each line of the standard input is a request: a package directory encoded as a JSON string,
+// or an empty line to check that the worker is alive. Each request is answered with a line of JSON
+// on the standard output: {"package": ...} with the output of godocjson, or {"error": ...}.
+// An empty object answers empty requests, and is written once the worker is ready.
+package main
+
+import (
+	"bufio"
+	"bytes"
+	"encoding/json"
+	"go/ast"
+	"go/doc"
+	"go/parser"
+	"go/printer"
+	"go/token"
+	"os"
+)
+
+type Param struct {
+	Type string `json:"type"`
+	Name string `json:"name"`
+}
+
+type Func struct {
+	Doc               string  `json:"doc"`
+	Name              string  `json:"name"`
+	PackageName       string  `json:"packageName"`
+	PackageImportPath string  `json:"packageImportPath"`
+	Type              string  `json:"type"`
+	Filename          string  `json:"filename"`
+	Line              int     `json:"line"`
+	Parameters        []Param `json:"parameters"`
+	Results           []Param `json:"results"`
+	Recv              string  `json:"recv"`
+	Orig              string  `json:"orig"`
+}
+
+type Value struct {
+	PackageName       string   `json:"packageName"`
+	PackageImportPath string   `json:"packageImportPath"`
+	Doc               string   `json:"doc"`
+	Names             []string `json:"names"`
+	Type              string   `json:"type"`
+	Filename          string   `json:"filename"`
+	Line              int      `json:"line"`
+}
+
+type Type struct {
+	PackageName       string  `json:"packageName"`
+	PackageImportPath string  `json:"packageImportPath"`
+	Doc               string  `json:"doc"`
+	Name              string  `json:"name"`
+	Type              string  `json:"type"`
+	Filename          string  `json:"filename"`
+	Line              int     `json:"line"`
+	Consts            []Value `json:"consts"`
+	Vars              []Value `json:"vars"`
+	Funcs             []Func  `json:"funcs"`
+	Methods           []Func  `json:"methods"`
+}
+
+type Package struct {
+	Type       string                 `json:"type"`
+	Doc        string                 `json:"doc"`
+	Name       string                 `json:"name"`
+	ImportPath string                 `json:"importPath"`
+	Imports    []string               `json:"imports"`
+	Filenames  []string               `json:"filenames"`
+	Notes      map[string]interface{} `json:"notes"`
+	Bugs       []string               `json:"bugs"`
+	Consts     []Value                `json:"consts"`
+	Types      []Type                 `json:"types"`
+	Vars       []Value                `json:"vars"`
+	Funcs      []Func                 `json:"funcs"`
+}
+
+type Response struct {
+	Package *Package `json:"package,omitempty"`
+	Error   string   `json:"error,omitempty"`
+}
+
+// documenter converts the documentation of a package, with the file set it was parsed with.
+type documenter struct {
+	fset *token.FileSet
+	pkg  *doc.Package
+}
+
+func (d documenter) expr(e ast.Expr) string {
+	var b bytes.Buffer
+	printer.Fprint(&b, d.fset, e)
+	return b.String()
+}
+
+func (d documenter) params(fl *ast.FieldList) []Param {
+	out := []Param{}
+	if fl == nil {
+		return out
+	}
+	for _, f := range fl.List {
+		t := d.expr(f.Type)
+		if len(f.Names) == 0 {
+			out = append(out, Param{t, ""})
+		}
+		for _, n := range f.Names {
+			out = append(out, Param{t, n.Name})
+		}
+	}
+	return out
+}
+
+func (d documenter) funcs(fs []*doc.Func) []Func {
+	out := []Func{}
+	for _, f := range fs {
+		pos := d.fset.Position(f.Decl.Pos())
+		out = append(out, Func{f.Doc, f.Name, d.pkg.Name, d.pkg.ImportPath, "func", pos.Filename, pos.Line,
+			d.params(f.Decl.Type.Params), d.params(f.Decl.Type.Results), f.Recv, f.Orig})
+	}
+	return out
+}
+
+func (d documenter) values(vs []*doc.Value, kind string) []Value {
+	out := []Value{}
+	for _, v := range vs {
+		pos := d.fset.Position(v.Decl.Pos())
+		out = append(out, Value{d.pkg.Name, d.pkg.ImportPath, v.Doc, v.Names, kind, pos.Filename, pos.Line})
+	}
+	return out
+}
+
+// document parses a package directory, with a new file set so that memory is released between requests.
+func document(path string) Response {
+	fset := token.NewFileSet()
+	pkgs, err := parser.ParseDir(fset, path, nil, parser.ParseComments)
+	if err != nil {
+		return Response{Error: err.Error()}
+	}
+	for _, astPkg := range pkgs {
+		d := documenter{fset, doc.New(astPkg, path, 0)}
+		p := d.pkg
+		types := []Type{}
+		for _, t := range p.Types {
+			types = append(types, Type{p.Name, p.ImportPath, t.Doc, t.Name, "type", "", 0,
+				d.values(t.Consts, "const"), d.values(t.Vars, "var"), d.funcs(t.Funcs), d.funcs(t.Methods)})
+		}
+		imports := p.Imports
+		if imports == nil {
+			imports = []string{}
+		}
+		return Response{Package: &Package{"package", p.Doc, p.Name, p.ImportPath, imports, p.Filenames,
+			map[string]interface{}{}, nil, d.values(p.Consts, "const"), types, d.values(p.Vars, "var"), d.funcs(p.Funcs)}}
+	}
+	// Like godocjson, directories without packages are documented by nothing.
+	return Response{}
+}
+
+func main() {
+	scanner := bufio.NewScanner(os.Stdin)
+	scanner.Buffer(make([]byte, 64*1024), 16*1024*1024)
+	out := bufio.NewWriter(os.Stdout)
+	encoder := json.NewEncoder(out)
+	encoder.SetEscapeHTML(false)
+
+	encoder.Encode(Response{})
+	out.Flush()
+	for scanner.Scan() {
+		var response Response
+		if line := scanner.Bytes(); len(line) > 0 {
+			var path string
+			if err := json.Unmarshal(line, &path); err != nil {
+				response = Response{Error: "invalid request: " + err.Error()}
+			} else {
+				response = document(path)
+			}
+		}
+		encoder.Encode(response)
+		out.Flush()
+	}
+}
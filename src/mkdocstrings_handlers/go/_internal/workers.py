@@ -0,0 +1,325 @@
+# A pool of long-running processes documenting Go packages.
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from mkdocstrings import get_logger
+
+from mkdocstrings_handlers.go._internal.cache import _file_identity
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+_logger = get_logger(__name__)
+
+# The sources of the worker command, built with `go build` on first use.
+_WORKER_SOURCES = Path(__file__).parent / "worker"
+
+# Idle workers are checked before being reused after this many seconds, for example between `mkdocs serve` builds.
+_IDLE_CHECK = 30.0
+# Seconds given to workers to exit once their input is closed, before they are killed.
+_SHUTDOWN_TIMEOUT = 5.0
+# Seconds given to workers to answer a request, before they are killed.
+_REQUEST_TIMEOUT = 60.0
+
+
+def _build_worker(go: str, cache_dir: Path) -> Path:
+    """Build the worker command into the cache directory, unless it was already built.
+
+    Parameters:
+        go: The path of the go command.
+        cache_dir: The directory of the persistent caches.
+
+    Returns:
+        The path of the worker executable.
+
+    Raises:
+        RuntimeError: If the worker cannot be built.
+    """
+    digest = hashlib.sha256(_file_identity(Path(go)).encode())
+    for name in sorted(os.listdir(_WORKER_SOURCES)):
+        digest.update(name.encode())
+        digest.update((_WORKER_SOURCES / name).read_bytes())
+    executable = cache_dir / "worker" / f"worker-{digest.hexdigest()[:16]}{'.exe' if os.name == 'nt' else ''}"
+    if executable.exists():
+        return executable
+
+    executable.parent.mkdir(parents=True, exist_ok=True)
+    # Build next to the final path then rename, so that concurrent builds never run partial executables.
+    fd, tmp = tempfile.mkstemp(dir=executable.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        subprocess.run(  # noqa: S603
+            [go, "build", "-o", tmp, "."],
+            cwd=_WORKER_SOURCES,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        os.replace(tmp, executable)
+    except subprocess.CalledProcessError as error:
+        raise RuntimeError(f"Could not build the godocjson worker:\n{error.stderr.strip()}") from error
+    finally:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+    _logger.debug("Built the godocjson worker %s", executable)
+    return executable
+
+
+class _Worker:
+    """A worker process, answering one request at a time."""
+
+    def __init__(self, executable: Path, timeout: float = _REQUEST_TIMEOUT) -> None:
+        """Start the worker and wait until it is ready.
+
+        Parameters:
+            executable: The path of the worker executable.
+            timeout: Seconds given to the worker to answer a request.
+        """
+        # The error output goes to a file rather than a pipe, which would block the worker once full.
+        self._stderr = tempfile.TemporaryFile("w+", encoding="utf-8")  # noqa: SIM115
+        try:
+            self.process = subprocess.Popen(  # noqa: S603
+                [executable],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self._stderr,
+                text=True,
+                encoding="utf-8",
+            )
+        except OSError:
+            self._stderr.close()
+            raise
+        """The worker process."""
+        self.timeout = timeout
+        """Seconds given to the worker to answer a request."""
+        self.last_used = time.monotonic()
+        """When the worker last answered a request."""
+        self.error_output = ""
+        """What the worker wrote on its error output, once it is closed."""
+        self._stdin: IO[str] = self.process.stdin  # type: ignore[assignment]
+        self._stdout: IO[str] = self.process.stdout  # type: ignore[assignment]
+        # Responses are read by a thread, so that waiting for them can time out.
+        self._lines: queue.Queue[str] = queue.Queue()
+        threading.Thread(target=self._read_lines, name="godocjson-worker-reader", daemon=True).start()
+        # The worker announces it is ready with an empty response.
+        try:
+            self._read()
+        except (OSError, EOFError, ValueError):
+            self.close()
+            raise
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is still running."""
+        return self.process.poll() is None
+
+    def request(self, line: str) -> dict:
+        """Send a request and wait for its response.
+
+        Parameters:
+            line: The request, without its line ending.
+
+        Returns:
+            The response.
+        """
+        self._stdin.write(line + "\n")
+        self._stdin.flush()
+        response = self._read()
+        self.last_used = time.monotonic()
+        return response
+
+    def ping(self) -> bool:
+        """Check that the worker still answers requests.
+
+        Returns:
+            Whether the worker is healthy.
+        """
+        try:
+            return self.alive and self.request("") == {}
+        except (OSError, EOFError, ValueError):
+            return False
+
+    def _read(self) -> dict:
+        try:
+            line = self._lines.get(timeout=self.timeout)
+        except queue.Empty:
+            self.process.kill()
+            raise TimeoutError(f"the worker did not answer within {self.timeout:g} seconds") from None
+        if not line:
+            raise EOFError("the worker exited")
+        return json.loads(line)
+
+    def _read_lines(self) -> None:
+        with contextlib.suppress(OSError, ValueError):
+            for line in self._stdout:
+                self._lines.put(line)
+        # An empty line signals the end of the output.
+        self._lines.put("")
+
+    def close(self) -> None:
+        """Stop the worker, killing it if it does not exit in time."""
+        with contextlib.suppress(OSError):
+            self._stdin.close()
+        try:
+            self.process.wait(_SHUTDOWN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        with contextlib.suppress(OSError, ValueError):
+            self._stderr.seek(0)
+            self.error_output = self._stderr.read().strip()
+        for stream in (self._stdout, self._stderr):
+            with contextlib.suppress(OSError):
+                stream.close()
+
+
+class _WorkerPool:
+    """A pool of worker processes, started on demand and restarted when they crash.
+
+    The pool is thread-safe: each thread sends its requests to an idle worker,
+    or waits for one when all the workers are busy.
+    Workers are stopped when the pool is closed, at the latest when Python exits.
+    """
+
+    def __init__(self, executable: Path, size: int, timeout: float = _REQUEST_TIMEOUT) -> None:
+        """Initialize the pool.
+
+        Parameters:
+            executable: The path of the worker executable.
+            size: The maximum number of workers.
+            timeout: Seconds given to the workers to answer a request.
+        """
+        self.executable = executable
+        """The path of the worker executable."""
+        self.size = max(size, 1)
+        """The maximum number of workers."""
+        self.timeout = timeout
+        """Seconds given to the workers to answer a request."""
+        self.restarts = 0
+        """The number of workers restarted after they crashed or stopped answering."""
+        self._idle: list[_Worker] = []
+        self._started = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        atexit.register(self.close)
+
+    def request(self, directory: Path) -> dict:
+        """Document a package with one of the workers.
+
+        A worker that crashes is replaced, and the request is sent again once to the new worker.
+        A worker that does not answer in time is killed and replaced, but the request is not sent again.
+
+        Parameters:
+            directory: The package directory.
+
+        Returns:
+            The response of the worker.
+
+        Raises:
+            RuntimeError: If the worker crashes twice.
+            TimeoutError: If the worker does not answer in time.
+        """
+        line = json.dumps(str(directory))
+        for attempt in range(2):
+            worker = self._acquire()
+            try:
+                response = worker.request(line)
+            except TimeoutError:
+                worker.close()
+                self._release(None)
+                self.restarts += 1
+                _logger.debug("Killed godocjson worker, stuck on %s", directory)
+                raise
+            except (OSError, EOFError, ValueError) as error:
+                worker.close()
+                self._release(None)
+                self.restarts += 1
+                _logger.debug("Restarting crashed godocjson worker (%s)", error)
+                if attempt:
+                    raise RuntimeError(f"godocjson worker crashed:\n{worker.error_output}") from error
+                continue
+            self._release(worker)
+            return response
+        raise AssertionError("unreachable")
+
+    def map(self, directories: Sequence[Path]) -> list[dict | Exception]:
+        """Document several packages, with all the workers in parallel.
+
+        Parameters:
+            directories: The package directories.
+
+        Returns:
+            The response for each package, or the error raised while requesting it.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as pool:
+            futures = [pool.submit(self.request, directory) for directory in directories]
+        return [future.exception() or future.result() for future in futures]  # type: ignore[misc]
+
+    def _acquire(self) -> _Worker:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("The godocjson worker pool is closed")
+                if self._idle:
+                    worker: _Worker | None = self._idle.pop()
+                    break
+                if self._started < self.size:
+                    self._started += 1
+                    worker = None
+                    break
+                self._condition.wait()
+
+        # Health check: workers idle for a while may have been stopped, or may hang.
+        if worker is not None and (
+            not worker.alive or (time.monotonic() - worker.last_used > _IDLE_CHECK and not worker.ping())
+        ):
+            _logger.debug("Restarting unhealthy godocjson worker")
+            self.restarts += 1
+            worker.close()
+            worker = None
+        if worker is None:
+            try:
+                worker = _Worker(self.executable, self.timeout)
+            except (OSError, EOFError, ValueError) as error:
+                self._release(None)
+                raise RuntimeError(f"Could not start the godocjson worker: {error}") from error
+        return worker
+
+    def _release(self, worker: _Worker | None) -> None:
+        with self._condition:
+            if worker is not None and not self._closed:
+                self._idle.append(worker)
+                worker = None
+            else:
+                self._started -= 1
+            self._condition.notify()
+        if worker is not None:
+            worker.close()
+
+    def close(self) -> None:
+        """Stop the idle workers, and the busy ones once they answer."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+            self._condition.notify_all()
+        for worker in idle:
+            worker.close()
+        atexit.unregister(self.close)
+        _logger.debug("Stopped godocjson workers (%d restarts)", self.restarts)
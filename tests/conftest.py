@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
@@ -19,10 +20,28 @@ if TYPE_CHECKING:
 
     from mkdocstrings_handlers.go import GoHandler
 
+# The Go build cache also honors `XDG_CACHE_HOME`: keep the user one, so that the worker is not rebuilt from scratch.
+_GOCACHE = os.environ.get("GOCACHE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "go-build",
+)
+
 
 # --------------------------------------------
 # Function-scoped fixtures.
 # --------------------------------------------
+@pytest.fixture(autouse=True)
+def _isolated_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Keep the persistent caches of each test in its temporary directory, away from the user cache.
+
+    Parameters:
+        monkeypatch: Pytest fixture.
+        tmp_path: Pytest fixture.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("GOCACHE", _GOCACHE)
+
+
 @pytest.fixture(name="mkdocs_conf")
 def fixture_mkdocs_conf(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[MkDocsConfig]:
     """Yield a MkDocs configuration object.
@@ -80,6 +99,22 @@ def fixture_handler(plugin: MkdocstringsPlugin, ext_markdown: Markdown) -> GoHan
 # --------------------------------------------
 # Session-scoped fixtures.
 # --------------------------------------------
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_session_cache(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Keep the persistent caches of session-scoped handlers away from the user cache.
+
+    Parameters:
+        tmp_path_factory: Pytest fixture.
+
+    Yields:
+        Nothing.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+        monkeypatch.setenv("GOCACHE", _GOCACHE)
+        yield
+
+
 @pytest.fixture(name="session_mkdocs_conf", scope="session")
 def fixture_session_mkdocs_conf(
     request: pytest.FixtureRequest,
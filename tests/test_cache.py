@@ -0,0 +1,107 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.go._internal.cache import _DiskCache, _hash_package
+from mkdocstrings_handlers.go._internal.config import GoConfig, GoOptions
+from mkdocstrings_handlers.go._internal.handler import GoHandler
+
+
+def test_disk_cache_roundtrip(tmp_path: Path) -> None:
+    cache = _DiskCache(tmp_path / "cache", max_size=1024)
+    assert cache.get("key") is None
+    cache.set("key", {"name": "pkg", "funcs": []})
+    assert cache.get("key") == {"name": "pkg", "funcs": []}
+
+
+def test_disk_cache_drops_corrupted_entries(tmp_path: Path) -> None:
+    cache = _DiskCache(tmp_path, max_size=1024)
+    (tmp_path / "key.json").write_text("{not json", encoding="utf-8")
+    assert cache.get("key") is None
+    assert not (tmp_path / "key.json").exists()
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = _DiskCache(tmp_path, max_size=350)
+    for index, key in enumerate(("a", "b", "c")):
+        cache.set(key, "x" * 100)
+        os.utime(tmp_path / f"{key}.json", ns=(index, index))
+    # Reading "a" makes "b" the least recently used entry.
+    assert cache.get("a") is not None
+    cache.set("d", "x" * 100)
+    assert sorted(path.stem for path in tmp_path.glob("*.json")) == ["a", "c", "d"]
+
+
+def test_disk_cache_rewrites_keep_size(tmp_path: Path) -> None:
+    cache = _DiskCache(tmp_path, max_size=1024)
+    cache.set("a", "x" * 100)
+    cache.set("b", "x" * 100)
+    size = cache._size
+    assert size == 204
+    for _ in range(20):
+        cache.set("a", "x" * 100)
+    assert cache._size == size
+    cache.set("a", "x" * 50)
+    assert cache._size == size - 50
+
+
+def test_package_hash_follows_go_sources(tmp_path: Path) -> None:
+    (tmp_path / "a.go").write_text("package a\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("readme", encoding="utf-8")
+    key = _hash_package(tmp_path, "salt")
+    (tmp_path / "README.md").write_text("changed", encoding="utf-8")
+    assert _hash_package(tmp_path, "salt") == key
+    assert _hash_package(tmp_path, "other salt") != key
+    (tmp_path / "a.go").write_text("package a\n\nconst X = 1\n", encoding="utf-8")
+    assert _hash_package(tmp_path, "salt") != key
+
+
+def _handler(search_path: Path, cache_dir: Path, **config: object) -> GoHandler:
+    return GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(search_path)], cache_dir=str(cache_dir), **config),
+        mdx=[],
+        mdx_config={},
+    )
+
+
+def _fake_godocjson(calls: list) -> object:
+    def run(path: Path) -> dict:
+        calls.append(path)
+        return {"type": "package", "name": "utils", "doc": "", "types": [], "funcs": [], "consts": [], "vars": []}
+
+    return run
+
+
+def test_unchanged_packages_skip_godocjson(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "src" / "utils"
+    package.mkdir(parents=True)
+    (package / "utils.go").write_text("package utils\n", encoding="utf-8")
+    calls: list = []
+
+    for _ in range(2):
+        handler = _handler(tmp_path / "src", tmp_path / "cache")
+        monkeypatch.setattr(handler._collector, "collect", _fake_godocjson(calls))
+        handler.collect("utils", GoOptions())
+    assert len(calls) == 1
+
+    (package / "utils.go").write_text("package utils\n\nvar X int\n", encoding="utf-8")
+    handler = _handler(tmp_path / "src", tmp_path / "cache")
+    monkeypatch.setattr(handler._collector, "collect", _fake_godocjson(calls))
+    handler.collect("utils", GoOptions())
+    assert len(calls) == 2
+
+
+def test_disabled_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "src" / "utils"
+    package.mkdir(parents=True)
+    (package / "utils.go").write_text("package utils\n", encoding="utf-8")
+    calls: list = []
+
+    for _ in range(2):
+        handler = _handler(tmp_path / "src", tmp_path / "cache", cache=False)
+        monkeypatch.setattr(handler._collector, "collect", _fake_godocjson(calls))
+        handler.collect("utils", GoOptions())
+    assert len(calls) == 2
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.go._internal import collectors
+from mkdocstrings_handlers.go._internal.collectors import (
+    _COLLECTORS,
+    _CollectorOptions,
+    _GodocjsonCollector,
+    _PythonCollector,
+    _select_collector,
+    _SnapshotCollector,
+)
+from mkdocstrings_handlers.go._internal.config import GoConfig, GoOptions
+from mkdocstrings_handlers.go._internal.handler import GoHandler
+
+
+@pytest.fixture(name="package")
+def fixture_package(tmp_path: Path) -> Path:
+    directory = tmp_path / "src" / "store"
+    directory.mkdir(parents=True)
+    (directory / "store.go").write_text("// Package store.\npackage store\n\n// Open opens.\nfunc Open() {}\n")
+    return directory
+
+
+def test_registered_collectors() -> None:
+    assert set(_COLLECTORS) == {"godocjson", "python", "snapshot", "worker"}
+    assert not _COLLECTORS["godocjson"].capabilities.fields
+    assert _COLLECTORS["python"].capabilities.batching
+    assert _COLLECTORS["snapshot"].capabilities.persistent
+
+
+def test_select_collector(tmp_path: Path) -> None:
+    missing = _CollectorOptions(godocjson_path=str(tmp_path / "godocjson"))
+    assert isinstance(_select_collector("auto", missing), _PythonCollector)
+    # Unavailable engines are replaced by available ones.
+    assert isinstance(_select_collector("godocjson", missing), _PythonCollector)
+    assert isinstance(_select_collector("snapshot", missing), _PythonCollector)
+    snapshot = _CollectorOptions(godocjson_path=str(tmp_path / "godocjson"), snapshot=tmp_path / "snapshot.json")
+    assert isinstance(_select_collector("auto", snapshot), _SnapshotCollector)
+    assert isinstance(_select_collector("godocjson", _CollectorOptions(godocjson_path="python")), _GodocjsonCollector)
+
+
+def test_snapshot_round_trip(package: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    options = _CollectorOptions(godocjson_path=str(tmp_path / "godocjson"), snapshot=tmp_path / "snapshot.json")
+    collector = _SnapshotCollector(options)
+    data = collector.collect(package)
+    collector.close()
+    snapshot = json.loads(options.snapshot.read_text())  # type: ignore[union-attr]
+    # Paths are stored relative to the snapshot and to the package, for the snapshot to be portable.
+    assert list(snapshot["packages"]) == ["src/store"]
+    assert snapshot["packages"]["src/store"]["data"]["filenames"] == ["/store.go"]
+
+    # Unchanged packages are read from the snapshot.
+    monkeypatch.setattr(collectors, "_parse_package", lambda directory: pytest.fail(f"Parsed {directory}"))
+    collector = _SnapshotCollector(options)
+    assert collector.collect(package) == data
+    assert collector.hits == 1
+
+    # Modified packages are collected again.
+    monkeypatch.undo()
+    (package / "store.go").write_text("// Package store.\npackage store\n\n// Close closes.\nfunc Close() {}\n")
+    assert [func["name"] for func in collector.collect(package)["funcs"]] == ["Close"]
+    collector.close()
+    snapshot = json.loads(options.snapshot.read_text())  # type: ignore[union-attr]
+    assert snapshot["packages"]["src/store"]["data"]["funcs"][0]["name"] == "Close"
+
+
+def test_collect_from_snapshot(package: Path, tmp_path: Path) -> None:
+    def handler() -> GoHandler:
+        return GoHandler(
+            base_dir=tmp_path,
+            config=GoConfig.from_data(paths=["src"], cache=False, snapshot="snapshot.json"),
+            mdx=[],
+            mdx_config={},
+        )
+
+    first = handler()
+    assert first.collect("store.Open", GoOptions())["name"] == "Open"
+    first.teardown()
+    assert (tmp_path / "snapshot.json").exists()
+
+    second = handler()
+    assert second.collect("store.Open", GoOptions())["filename"] == str(package / "store.go")
+    assert isinstance(second._collector, _SnapshotCollector)
+    assert second._collector.hits == 1
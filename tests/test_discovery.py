@@ -0,0 +1,81 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.go._internal.config import GoConfig, GoOptions
+from mkdocstrings_handlers.go._internal.discovery import _decode_stream, _discover, _go_list, _scan
+from mkdocstrings_handlers.go._internal.handler import GoHandler
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture(name="module")
+def fixture_module(tmp_path: Path) -> Path:
+    _write(tmp_path / "go.mod", "module example.com/app\n\ngo 1.21\n")
+    _write(tmp_path / "main.go", 'package main\n\nimport "example.com/app/store"\n\nfunc main() { store.Open() }\n')
+    _write(
+        tmp_path / "store" / "store.go",
+        'package store\n\nimport (\n\t"fmt"\n\tos "os" // Files.\n)\n\nfunc Open() { fmt.Println(os.Args) }\n',
+    )
+    _write(tmp_path / "store" / "store_test.go", 'package store\n\nimport "testing"\n\nfunc TestA(*testing.T) {}\n')
+    _write(tmp_path / "store" / "testdata" / "broken.go", "package broken\n")
+    _write(tmp_path / ".hidden" / "hidden.go", "package hidden\n")
+    return tmp_path
+
+
+def test_decode_stream() -> None:
+    text = '{"Dir": "/a", "Imports": ["fmt"]}\n{\n\t"Dir": "/b {"\n}\n'
+    chunks = [text[index : index + 7] for index in range(0, len(text), 7)]
+    assert list(_decode_stream(chunks)) == [{"Dir": "/a", "Imports": ["fmt"]}, {"Dir": "/b {"}]
+    with pytest.raises(ValueError, match="Truncated"):
+        list(_decode_stream(['{"Dir": "/a"}{"Dir"']))
+
+
+def test_scan(module: Path) -> None:
+    packages = {package.import_path: package for package in _scan(str(module))}
+    assert set(packages) == {"example.com/app", "example.com/app/store"}
+    store = packages["example.com/app/store"]
+    assert store.directory == module / "store"
+    assert store.name == "store"
+    assert store.go_files == ("store.go", "store_test.go")
+    assert store.imports == ("fmt", "os")
+    assert packages["example.com/app"].imports == ("example.com/app/store",)
+
+
+def test_scan_without_module(tmp_path: Path) -> None:
+    _write(tmp_path / "pkg" / "utils" / "helper.go", "package utils\n")
+    assert [package.import_path for package in _scan(str(tmp_path))] == ["pkg/utils"]
+
+
+@pytest.mark.skipif(shutil.which("go") is None, reason="Go is not installed")
+def test_go_list_matches_scan(module: Path) -> None:
+    assert sorted(_go_list(str(module), shutil.which("go") or "go"), key=str) == sorted(
+        _scan(str(module)),
+        key=str,
+    )
+
+
+def test_discovery_falls_back_to_scan(tmp_path: Path) -> None:
+    # `go list` needs a module: without one, packages are found by walking the file system.
+    _write(tmp_path / "pkg" / "helper.go", "package pkg\n")
+    assert [(root, package.import_path) for root, package in _discover([str(tmp_path)])] == [(str(tmp_path), "pkg")]
+    assert _discover([str(tmp_path)], "none") == []
+
+
+def test_collect_discovered_packages(module: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(module)], cache=False),
+        mdx=[],
+        mdx_config={},
+    )
+    monkeypatch.setattr(handler._collector, "collect", lambda path: {"type": "package", "name": path.name})
+    # Packages are not looked up one by one.
+    monkeypatch.setattr(handler._locations, "find", lambda pkg_path: pytest.fail(f"Probed {pkg_path}"))
+    assert handler.collect("store", GoOptions())["name"] == "store"
+    assert handler.collect("example.com/app/store", GoOptions())["name"] == "store"
+    assert handler._package_files[(module / "store").resolve()] == ("store.go", "store_test.go")
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.go._internal import formatting
+from mkdocstrings_handlers.go._internal.cache import _DiskCache
+from mkdocstrings_handlers.go._internal.config import GoConfig
+from mkdocstrings_handlers.go._internal.formatting import _Formatter
+from mkdocstrings_handlers.go._internal.handler import GoHandler
+
+
+def _formatter(golines: str, cache: _DiskCache | None = None) -> _Formatter:
+    formatter = _Formatter()
+    formatter.configure("golines", golines, cache)
+    return formatter
+
+
+def _fake_golines(tmp_path: Path, *, batches: bool = True) -> str:
+    # Upper-cases the func keyword, and fails on batches of several snippets when asked to.
+    script = tmp_path / "golines"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "code = sys.stdin.read()\n"
+        f"if {not batches} and code.count('mkdocstrings-go: snippet') > 1:\n"
+        "    sys.exit(1)\n"
+        "sys.stdout.write(code.replace('func', 'FUNC'))\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_snippets_formatted_in_one_run(tmp_path: Path) -> None:
+    formatter = _formatter(_fake_golines(tmp_path))
+    snippets = ["func a() {}", "func b(x int) {\n\treturn\n}\n", "func a() {}"]
+    formatter.format_many(snippets, 80)
+    assert formatter.runs == 1
+    assert formatter.format("func a() {}", 80) == "FUNC a() {}\n"
+    assert formatter.format("func b(x int) {\n\treturn\n}\n", 80) == "FUNC b(x int) {\n\treturn\n}\n"
+    assert formatter.runs == 1
+    # Results depend on the line length.
+    formatter.format("func a() {}", 40)
+    assert formatter.runs == 2
+
+
+def test_failed_batch_falls_back_to_single_snippets(tmp_path: Path) -> None:
+    formatter = _formatter(_fake_golines(tmp_path, batches=False))
+    formatter.format_many(["func a() {}", "func b() {}"], 80)
+    assert formatter.runs == 3
+    assert formatter.format("func b() {}", 80) == "FUNC b() {}\n"
+
+
+def test_same_result_alone_or_in_batch(tmp_path: Path) -> None:
+    golines = _fake_golines(tmp_path)
+    snippets = ["\nfunc a() {}\n\n", "func b() {}"]
+    batched = _formatter(golines)
+    batched.format_many(snippets, 80)
+    alone = _formatter(golines)
+    assert [alone.format(code, 80) for code in snippets] == [batched.format(code, 80) for code in snippets]
+
+
+def test_missing_formatter(tmp_path: Path) -> None:
+    formatter = _formatter(str(tmp_path / "missing"))
+    assert formatter.backend == "python"
+    formatter.format_many(["func a() {}", "func b() {}"], 80)
+    assert formatter.format("func a() {}", 80) == ""
+    assert formatter.runs == 0
+    assert formatter.format_signature("func a(first int, second int) ()", 20) == (
+        "func a(\n\tfirst int,\n\tsecond int,\n) ()"
+    )
+
+
+def test_backend_detection(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("PATH", str(tmp_path))
+    formatter = _Formatter()
+    formatter.configure()
+    assert formatter.backend == "python"
+
+    (tmp_path / "tools").mkdir()
+    (tmp_path / "gofmt").symlink_to(_fake_golines(tmp_path / "tools"))
+    formatter.configure()
+    assert (formatter.backend, formatter.executable) == ("gofmt", str(tmp_path / "gofmt"))
+
+    formatter.configure("none")
+    assert formatter.format_signature("func a(first int, second int) ()", 20) == "func a(first int, second int) ()"
+
+
+def test_backend_selected_on_first_use(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    probes = []
+    monkeypatch.setattr(formatting, "_probe_version", lambda executable: probes.append(executable) or "1.0")
+    formatter = _Formatter()
+    formatter.configure("golines", _fake_golines(tmp_path))
+    assert formatter.format_signature("func a(first int, second int) ()", 20).startswith("func a(\n")
+    assert probes == []
+    assert formatter.version == "1.0"
+    formatter.format("func a() {}", 80)
+    assert len(probes) == 1
+
+
+def test_formatted_snippets_persisted(tmp_path: Path) -> None:
+    golines = _fake_golines(tmp_path)
+    formatter = _formatter(golines, _DiskCache(tmp_path / "format", max_size=1024 * 1024))
+    formatter.format_many(["func a() {}", "func b() {}"], 80)
+    assert formatter.runs == 1
+
+    formatter = _formatter(golines, _DiskCache(tmp_path / "format", max_size=1024 * 1024))
+    assert formatter.format("func a() {}", 80) == "FUNC a() {}\n"
+    assert formatter.runs == 0
+
+    # A new golines executable invalidates the results.
+    os.utime(golines, ns=(0, 0))
+    formatter.configure("golines", golines, formatter.cache)
+    formatter.format("func a() {}", 80)
+    assert formatter.runs == 1
+
+
+def test_snippets_formatted_asynchronously(tmp_path: Path) -> None:
+    formatter = _formatter(_fake_golines(tmp_path))
+    asyncio.run(formatter.format_many_async(["func a() {}", "func b() {}", "func a() {}"], 80))
+    assert formatter.runs == 1
+    assert formatter.format("func b() {}", 80) == "FUNC b() {}\n"
+    assert formatter.runs == 1
+
+    formatter = _formatter(_fake_golines(tmp_path, batches=False))
+    asyncio.run(formatter.format_many_async(["func a() {}", "func b() {}"], 80))
+    assert formatter.runs == 3
+    assert formatter.format("func b() {}", 80) == "FUNC b() {}\n"
+
+
+def test_formatter_per_handler(tmp_path: Path) -> None:
+    handlers = [
+        GoHandler(base_dir=tmp_path, config=GoConfig.from_data(formatter=backend), mdx=[], mdx_config={})
+        for backend in ("python", "none")
+    ]
+    assert [handler._formatter.backend for handler in handlers] == ["python", "none"]
+    for handler in handlers:
+        handler.env.filters["highlight"] = str
+        handler.update_env({})
+        assert handler.env.filters["format_code"].keywords["formatter"] is handler._formatter
+        assert handler.env.filters["format_signature"].keywords["formatter"] is handler._formatter
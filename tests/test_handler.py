@@ -1,4 +1,6 @@
+import asyncio
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -224,6 +226,7 @@ def test_collect_with_package_dock(go_project: Path) -> None:
                 "doc": "",
                 "name": "MyType",
                 "type": "type",
+                "signature": "type MyType struct    {}",
                 "relative_path": "pkg/utils/helper.go",
                 "filename": "",
                 "line": 5,
@@ -238,6 +241,7 @@ def test_collect_with_package_dock(go_project: Path) -> None:
                         "packageName": "utils",
                         "packageImportPath": str(go_project / "pkg" / "utils"),
                         "type": "func",
+                        "signature": "() (string)",
                         "filename": str(go_project / "pkg" / "utils" / "helper.go"),
                         "line": 11,
                         "parameters": [],
@@ -258,6 +262,7 @@ def test_collect_with_package_dock(go_project: Path) -> None:
                 "packageName": "utils",
                 "packageImportPath": str(go_project / "pkg" / "utils"),
                 "type": "func",
+                "signature": "() (string)",
                 "filename": str(go_project / "pkg" / "utils" / "helper.go"),
                 "line": 7,
                 "parameters": [],
@@ -314,6 +319,7 @@ def test_collect_function_from_fqn(go_project: Path) -> None:
         "packageName": "utils",
         "packageImportPath": str(go_project / "pkg" / "utils"),
         "type": "func",
+        "signature": "() (string)",
         "filename": str(go_project / "pkg" / "utils" / "helper.go"),
         "line": 7,
         "parameters": [],
@@ -341,6 +347,7 @@ def test_collect_method_from_fqn(go_project: Path) -> None:
         "packageName": "utils",
         "packageImportPath": str(go_project / "pkg" / "utils"),
         "type": "func",
+        "signature": "() (string)",
         "filename": str(go_project / "pkg" / "utils" / "helper.go"),
         "line": 11,
         "parameters": [],
@@ -368,6 +375,7 @@ def test_collect_interface_from_fqname(go_project_extended: Path) -> None:
         "doc": "Interface declaration\n",
         "name": "Greeter",
         "type": "type",
+        "signature": "type Greeter struct    {}",
         "filename": "",
         "line": 17,
         "consts": [],
@@ -395,6 +403,7 @@ def test_collect_const_from_fqname(go_project_extended: Path) -> None:
         "doc": "Another constant\n",
         "names": ["Number"],
         "type": "const",
+        "signature": "const Number",
         "filename": str(go_project_extended / "pkg" / "helper.go"),
         "line": 11,
         "relative_path": "pkg/helper.go",
@@ -408,6 +417,7 @@ def test_collect_const_from_fqname(go_project_extended: Path) -> None:
         "doc": "Constant declaration\n",
         "names": ["Version"],
         "type": "const",
+        "signature": "const Version",
         "filename": str(go_project_extended / "pkg" / "helper.go"),
         "line": 8,
         "relative_path": "pkg/helper.go",
@@ -514,6 +524,7 @@ def test_collect_method_from_fqn_mismatch(go_project_name_mismatch: Path) -> Non
         "packageName": "hello",
         "packageImportPath": str(go_project_name_mismatch / "pkg" / "utils"),
         "type": "func",
+        "signature": "() (string)",
         "filename": str(go_project_name_mismatch / "pkg" / "utils" / "helper.go"),
         "line": 11,
         "parameters": [],
@@ -553,6 +564,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                 "doc": "Another constant\n",
                 "names": ["Number"],
                 "type": "const",
+                "signature": "const Number",
                 "filename": str(go_project_extended / "pkg" / "helper.go"),
                 "line": 11,
                 "code": "    const Number = 777\n",
@@ -564,6 +576,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                 "doc": "Constant declaration\n",
                 "names": ["Version"],
                 "type": "const",
+                "signature": "const Version",
                 "filename": str(go_project_extended / "pkg" / "helper.go"),
                 "line": 8,
                 "code": '    const Version = "1.0.0"\n',
@@ -577,6 +590,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                 "doc": "Interface declaration\n",
                 "name": "Greeter",
                 "type": "type",
+                "signature": "type Greeter struct    {}",
                 "filename": "",
                 "line": 17,
                 "consts": [],
@@ -592,6 +606,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                 "doc": "Struct type with a field\n",
                 "name": "MyType",
                 "type": "type",
+                "signature": "type MyType struct    {}",
                 "filename": "",
                 "line": 22,
                 "consts": [],
@@ -606,6 +621,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                         "packageName": "pkg",
                         "packageImportPath": str(go_project_extended / "pkg"),
                         "type": "func",
+                        "signature": "(name string) (string)",
                         "filename": str(go_project_extended / "pkg" / "helper.go"),
                         "line": 37,
                         "parameters": [{"type": "string", "name": "name"}],
@@ -621,6 +637,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                         "packageName": "pkg",
                         "packageImportPath": str(go_project_extended / "pkg"),
                         "type": "func",
+                        "signature": "() (string)",
                         "filename": str(go_project_extended / "pkg" / "helper.go"),
                         "line": 27,
                         "parameters": [],
@@ -638,6 +655,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                 "doc": "Embedded struct - Person\n",
                 "name": "Person",
                 "type": "type",
+                "signature": "type Person struct    {}",
                 "filename": "",
                 "line": 42,
                 "consts": [],
@@ -679,6 +697,7 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
                 "packageName": "pkg",
                 "packageImportPath": str(go_project_extended / "pkg"),
                 "type": "func",
+                "signature": "() (string)",
                 "filename": str(go_project_extended / "pkg" / "helper.go"),
                 "line": 32,
                 "parameters": [],
@@ -690,3 +709,240 @@ def test_whole_package_extended(go_project_extended: Path) -> None:
             },
         ],
     }
+
+
+def test_package_parsed_once_per_build(go_project_extended: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(go_project_extended)]),
+        mdx=[],
+        mdx_config={},
+    )
+    calls = []
+    run_godocjson = handler._collector.collect
+    monkeypatch.setattr(handler._collector, "collect", lambda path: calls.append(path) or run_godocjson(path))
+
+    for identifier in ("pkg", "pkg.Greeter", "pkg.MyType.Method", "pkg.Hello", "pkg.C"):
+        handler.collect(identifier, GoOptions())
+
+    assert len(calls) == 1
+    assert handler._collected["pkg.Hello"]["code"] == '    func Hello() string {\n        return "hello"\n    }\n'
+    assert "code" not in handler._load_package(calls[0])["funcs"][0]
+
+
+def test_prefetch_packages_referenced_in_pages(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("alpha", "beta", "gamma"):
+        (tmp_path / "src" / name).mkdir(parents=True)
+    docs_dir = tmp_path / "docs"
+    (docs_dir / "api").mkdir(parents=True)
+    (docs_dir / "index.md").write_text("# Home\n\n::: alpha\n\n::: alpha.Type\n", encoding="utf-8")
+    (docs_dir / "api" / "more.md").write_text("## ::: beta.Func\n\n::: gamma\n\n::: missing.Thing\n", encoding="utf-8")
+
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(tmp_path / "src")], cache=False, workers=2),
+        docs_dir=str(docs_dir),
+        mdx=[],
+        mdx_config={},
+    )
+    calls = []
+
+    def run_godocjson(path: Path) -> dict:
+        calls.append(path.name)
+        return {"type": "package", "name": path.name, "doc": "", "types": [], "funcs": [], "consts": [], "vars": []}
+
+    monkeypatch.setattr(handler._collector, "collect", run_godocjson)
+
+    handler.collect("gamma", GoOptions())
+    assert sorted(calls) == ["alpha", "beta", "gamma"]
+    handler.collect("alpha", GoOptions())
+    assert len(calls) == 3
+
+
+def test_package_sources_read_once(go_project_extended: Path) -> None:
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(go_project_extended)]),
+        mdx=[],
+        mdx_config={},
+    )
+    handler.collect("pkg", GoOptions())
+    handler.collect("pkg.Person", GoOptions())
+    assert handler._sources.misses == 1
+    assert handler._sources.hits > 10
+
+
+def test_no_source_reads_without_show_source(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "utils").mkdir()
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(tmp_path)], cache=False),
+        mdx=[],
+        mdx_config={},
+    )
+    func = {"name": "Hello", "type": "func", "filename": str(tmp_path / "utils" / "missing.go"), "line": 3}
+    package = {"type": "package", "name": "utils", "doc": "", "funcs": [func], "types": [], "consts": [], "vars": []}
+    monkeypatch.setattr(handler._collector, "collect", lambda _: package)
+
+    for identifier in ("utils", "utils.Hello"):
+        item = handler.collect(identifier, GoOptions(show_source=False))
+        assert item["code"] is None
+        assert item["relative_path"] is None
+    assert handler._sources.misses == 0
+
+    with pytest.raises(FileNotFoundError, match="Source file not found"):
+        handler.collect("utils.Hello", GoOptions(show_source=True))
+
+
+def test_options_validated_once_per_set(monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(options={"show_source": False, "extra": {"a": 1}}),
+        mdx=[],
+        mdx_config={},
+    )
+    calls = []
+    from_data = GoOptions.from_data
+    monkeypatch.setattr(GoOptions, "from_data", lambda **data: calls.append(data) or from_data(**data))
+
+    options = handler.get_options({"heading_level": 3, "extra": {"b": [1, 2]}})
+    assert handler.get_options({"extra": {"b": [1, 2]}, "heading_level": 3}) is options
+    assert len(calls) == 1
+    # Values of different types are different options.
+    assert handler.get_options({"heading_level": 3, "extra": {"b": [True, 2]}}) is not options
+    assert len(calls) == 2
+
+
+def test_collect_package_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "go.mod").write_text("module example.com/app\n", encoding="utf-8")
+    for directory in ("", "internal/store", "internal/store/sql", "internal/broken", "web"):
+        (tmp_path / directory).mkdir(parents=True, exist_ok=True)
+        name = Path(directory).name or "app"
+        (tmp_path / directory / f"{name}.go").write_text(f"package {name}\n", encoding="utf-8")
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(tmp_path)], cache=False, workers=2),
+        mdx=[],
+        mdx_config={},
+    )
+
+    def run_godocjson(path: Path) -> dict:
+        if path.name == "broken":
+            raise RuntimeError("godocjson failed")
+        return {"type": "package", "name": path.name, "doc": "", "types": [], "funcs": [], "consts": [], "vars": []}
+
+    monkeypatch.setattr(handler._collector, "collect", run_godocjson)
+
+    def names(identifier: str) -> list[str]:
+        item = handler.collect(identifier, GoOptions())
+        assert item["type"] == "packages"
+        return [package["name"] for package in item["packages"]]
+
+    # The package that cannot be parsed is skipped.
+    assert sorted(names("./...")) == sorted([tmp_path.name, "sql", "store", "web"])
+    assert sorted(names("internal/...")) == ["sql", "store"]
+    assert sorted(names("example.com/app/internal/store/...")) == ["sql", "store"]
+    assert handler._collected["internal/..."]["name"] == "internal/..."
+    with pytest.raises(ValueError, match="No packages found"):
+        handler.collect("missing/...", GoOptions())
+
+
+def test_collect_async(go_project_extended: Path) -> None:
+    def handler() -> GoHandler:
+        return GoHandler(
+            base_dir=Path("."),
+            config=GoConfig.from_data(paths=[str(go_project_extended)], cache=False, workers=2),
+            mdx=[],
+            mdx_config={},
+        )
+
+    identifiers = ["pkg", "pkg.MyType", "pkg.MyType.Greet", "pkg.Hello", "pkg.Version", "./..."]
+    options = GoOptions(show_source=True)
+    expected = [handler().collect(identifier, options) for identifier in identifiers]
+
+    async_handler = handler()
+    assert asyncio.run(async_handler.collect_many_async(identifiers, options, concurrency=3)) == expected
+    # Each package is collected once.
+    assert list(async_handler._packages) == [(go_project_extended / "pkg").resolve()]
+    assert asyncio.run(async_handler.collect_async("pkg.Hello", options)) == expected[3]
+
+    results = asyncio.run(async_handler.collect_many_async(["pkg.Missing", "pkg.Hello"], return_exceptions=True))
+    assert isinstance(results[0], ValueError)
+    assert results[1]["name"] == "Hello"
+    with pytest.raises(ValueError, match="No data found"):
+        asyncio.run(async_handler.collect_many_async(["pkg.Hello", "pkg.Missing"]))
+
+
+def test_concurrent_async_collection_of_one_package(go_project_extended: Path) -> None:
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(go_project_extended)], cache=False),
+        mdx=[],
+        mdx_config={},
+    )
+    collect_async = handler._collector.collect_async
+    calls = []
+
+    async def slow_collect_async(directory: Path) -> dict:
+        calls.append(directory)
+        await asyncio.sleep(0.05)
+        return await collect_async(directory)
+
+    handler._collector.collect_async = slow_collect_async  # type: ignore[method-assign]
+
+    async def collect_all() -> list:
+        identifiers = ["pkg.MyType", "pkg.MyType.Greet", "pkg.Hello", "pkg.Version"]
+        return await asyncio.gather(*(handler.collect_async(identifier, GoOptions()) for identifier in identifiers))
+
+    results = asyncio.run(collect_all())
+    assert [item["name"] for item in results[:3]] == ["MyType", "Greet", "Hello"]
+    assert len(calls) == 1
+
+
+def test_concurrent_collection(tmp_path: Path) -> None:
+    (tmp_path / "go.mod").write_text("module example.com/app\n", encoding="utf-8")
+    identifiers = []
+    for number in range(20):
+        name = f"pkg{number}"
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f"{name}.go").write_text(
+            f"package {name}\n\n// Func{number} works.\nfunc Func{number}() int {{\n\treturn {number}\n}}\n\n"
+            f"// Type{number} holds.\ntype Type{number} struct {{\n\tID int\n}}\n\n"
+            f"// Get gets.\nfunc (t *Type{number}) Get() int {{\n\treturn t.ID\n}}\n",
+            encoding="utf-8",
+        )
+        identifiers += [
+            name,
+            f"{name}.Func{number}",
+            f"{name}.Type{number}.Get",
+            f"example.com/app/{name}.Type{number}",
+        ]
+
+    def handler() -> GoHandler:
+        return GoHandler(
+            base_dir=Path("."),
+            config=GoConfig.from_data(paths=[str(tmp_path)], cache=False, collector="python"),
+            mdx=[],
+            mdx_config={},
+        )
+
+    options = GoOptions(show_source=True)
+    expected = {identifier: handler().collect(identifier, options) for identifier in identifiers}
+    # Relative paths start from the package path of each identifier.
+    assert expected["pkg3.Func3"]["relative_path"] == "pkg3/pkg3.go"
+    assert expected["example.com/app/pkg3.Type3"]["relative_path"] == str(tmp_path / "pkg3" / "pkg3.go")
+
+    # Switch threads as often as possible, to interleave collections.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        shared = handler()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda identifier: shared.collect(identifier, options), identifiers * 3))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert results == [expected[identifier] for identifier in identifiers * 3]
+    # Each package is collected once, and each collected identifier is kept.
+    assert len(shared._packages) == 20
+    assert set(shared._collected) == set(identifiers)
@@ -1,8 +1,8 @@
+from pathlib import Path
+
 import pytest
 
-from mkdocstrings_handlers.go._internal.handler import (
-    _find_dicts_with_value,
-)
+from mkdocstrings_handlers.go._internal.helpers import _find_autodoc_identifiers, _find_dicts_with_value
 
 data = {
     "type": "package",
@@ -81,3 +81,15 @@ def test_name_search(example_data: dict) -> None:
             "type": "const",
         },
     ]
+
+
+def test_autodoc_identifiers(tmp_path: Path) -> None:
+    (tmp_path / "index.md").write_text(
+        "# API\n\n::: pkg.Hello\n\n## ::: pkg.MyType\n    options:\n      show_source: false\n\n"
+        "````md\n::: pkg.InFence\n```\n::: pkg.StillInFence\n````\n\n"
+        "~~~~\n::: pkg.InTildes\n~~~~\n\n"
+        "::: package.module\n    handler: python\n    options:\n      handler: go\n\n"
+        "::: pkg.Explicit\n    handler: 'go'\n",
+        encoding="utf-8",
+    )
+    assert _find_autodoc_identifiers(str(tmp_path)) == ["pkg.Hello", "pkg.MyType", "pkg.Explicit"]
@@ -0,0 +1,63 @@
+import pytest
+
+from mkdocstrings_handlers.go._internal.index import _SymbolIndex
+
+data = {
+    "type": "package",
+    "name": "pkg",
+    "consts": [{"names": ["Version", "Number"], "type": "const", "filename": "a.go", "line": 3}],
+    "vars": [{"names": ["DefaultName"], "type": "var", "filename": "a.go", "line": 5}],
+    "funcs": [
+        {"name": "Hello", "type": "func", "filename": "a_linux.go", "line": 7},
+        {"name": "Hello", "type": "func", "filename": "a_windows.go", "line": 7},
+    ],
+    "types": [
+        {
+            "name": "MyType",
+            "type": "type",
+            "consts": [{"names": ["Zero"], "type": "const", "filename": "b.go", "line": 2}],
+            "vars": [],
+            "funcs": [{"name": "NewMyType", "type": "func", "filename": "b.go", "line": 4}],
+            "methods": [
+                {"name": "Greet", "type": "func", "recv": "MyType", "filename": "b.go", "line": 8},
+                {"name": "String", "type": "func", "recv": "MyType", "filename": "b.go", "line": 12},
+            ],
+        },
+        {
+            "name": "Other",
+            "type": "type",
+            "methods": [{"name": "String", "type": "func", "recv": "*Other", "filename": "c.go", "line": 3}],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def index() -> _SymbolIndex:
+    return _SymbolIndex(data)
+
+
+def test_lookup_package_level_names(index: _SymbolIndex) -> None:
+    assert index.lookup("Number") is data["consts"][0]
+    assert index.lookup("DefaultName") is data["vars"][0]
+    assert index.lookup("MyType") is data["types"][0]
+    assert index.lookup("Zero") is data["types"][0]["consts"][0]
+    assert index.lookup("NewMyType") is data["types"][0]["funcs"][0]
+    assert index.lookup("Nothing") is None
+
+
+def test_lookup_members(index: _SymbolIndex) -> None:
+    assert index.lookup("MyType", "Greet") is data["types"][0]["methods"][0]
+    assert index.lookup("Other", "String") is data["types"][1]["methods"][0]
+    assert index.lookup("MyType", "NewMyType") is data["types"][0]["funcs"][0]
+    assert index.lookup("Other", "Greet") is None
+    # Unique method names can be referenced without their receiver.
+    assert index.lookup("Greet") is data["types"][0]["methods"][0]
+
+
+def test_ambiguous_names(index: _SymbolIndex) -> None:
+    assert index.ambiguous == ["Hello"]
+    with pytest.raises(ValueError, match=r"Ambiguous name 'Hello'.*a_linux\.go:7.*a_windows\.go:7"):
+        index.lookup("Hello")
+    with pytest.raises(ValueError, match="Ambiguous name 'String'"):
+        index.lookup("String")
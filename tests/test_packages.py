@@ -0,0 +1,127 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.go._internal.config import GoConfig, GoOptions
+from mkdocstrings_handlers.go._internal.handler import GoHandler
+from mkdocstrings_handlers.go._internal.packages import _ModuleTrie, _PackageIndex
+
+
+def _touch(directory: Path) -> None:
+    # File systems with coarse timestamps could otherwise keep the same modification time.
+    stat = directory.stat()
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_lookups_are_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "a" / "pkg").mkdir(parents=True)
+    index = _PackageIndex([str(tmp_path / "a"), str(tmp_path / "b")])
+    probes = []
+    probe = index._probe
+    monkeypatch.setattr(index, "_probe", lambda pkg_path: probes.append(pkg_path) or probe(pkg_path))
+
+    for _ in range(3):
+        assert index.find("pkg") == tmp_path / "a" / "pkg"
+        assert index.find("missing/pkg") is None
+    assert probes == ["pkg", "missing/pkg"]
+
+
+def test_directories_appearing_and_disappearing(tmp_path: Path) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b" / "pkg").mkdir(parents=True)
+    index = _PackageIndex([str(tmp_path / "a"), str(tmp_path / "b")])
+    assert index.find("pkg") == tmp_path / "b" / "pkg"
+    assert index.find("nested/pkg") is None
+
+    # A package in a search path with higher precedence wins.
+    (tmp_path / "a" / "pkg").mkdir()
+    _touch(tmp_path / "a")
+    assert index.find("pkg") == tmp_path / "a" / "pkg"
+
+    (tmp_path / "a" / "pkg").rmdir()
+    _touch(tmp_path / "a")
+    assert index.find("pkg") == tmp_path / "b" / "pkg"
+
+    (tmp_path / "b" / "nested" / "pkg").mkdir(parents=True)
+    _touch(tmp_path / "b")
+    assert index.find("nested/pkg") == tmp_path / "b" / "nested" / "pkg"
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_module_trie(tmp_path: Path) -> None:
+    _write(tmp_path / "go.work", "go 1.22\n\nuse (\n\t./api\n\t../shared // outside the search path\n)\n")
+    _write(
+        tmp_path / "api" / "go.mod",
+        "module example.com/mono/api\n\nreplace gopkg.in/yaml.v3 => ./third_party/yaml\n",
+    )
+    _write(tmp_path / "services" / "billing" / "go.mod", "module example.com/mono/services/billing\n")
+    _write(tmp_path / "services" / "billing" / "testdata" / "go.mod", "module example.com/ignored\n")
+    _write(tmp_path.parent / "shared" / "go.mod", "module example.com/shared\n")
+    for directory in ("api/v1", "api/third_party/yaml", "services/billing/internal/store"):
+        (tmp_path / directory).mkdir(parents=True)
+
+    trie = _ModuleTrie.scan([str(tmp_path)])
+    assert trie.resolve("example.com/mono/api/v1") == tmp_path / "api" / "v1"
+    assert trie.resolve("example.com/mono/api") == tmp_path / "api"
+    assert trie.resolve("example.com/mono/services/billing/internal/store") == (
+        tmp_path / "services" / "billing" / "internal" / "store"
+    )
+    assert trie.resolve("gopkg.in/yaml.v3") == tmp_path / "api" / "third_party" / "yaml"
+    assert trie.resolve("example.com/shared") == tmp_path.parent / "shared"
+    assert trie.resolve("example.com/mono/api/missing") is None
+    assert trie.resolve("example.com/ignored") is None
+    assert trie.resolve("pkg/utils") is None
+
+
+def test_module_trie_nested_modules(tmp_path: Path) -> None:
+    _write(tmp_path / "go.work", "go 1.22\n\nuse (\n\t./app\n\t./tools\n)\n")
+    _write(tmp_path / "app" / "go.mod", "module example.com/app\n")
+    _write(tmp_path / "tools" / "go.mod", "module example.com/app/tools\n")
+    for directory in ("app/tools/legacy", "tools/lint"):
+        (tmp_path / directory).mkdir(parents=True)
+
+    trie = _ModuleTrie.scan([str(tmp_path)])
+    assert trie.resolve("example.com/app/tools/lint") == tmp_path / "tools" / "lint"
+    # Not in the nested module: found in the enclosing one.
+    assert trie.resolve("example.com/app/tools/legacy") == tmp_path / "app" / "tools" / "legacy"
+    assert trie.resolve("example.com/app/tools/missing") is None
+
+
+def test_collect_full_import_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _write(tmp_path / "go.mod", "module github.com/org/repo\n\nreplace gopkg.in/yaml.v3 => ./yaml\n")
+    _write(tmp_path / "pkg" / "load.go", "package pkg\n\nfunc Load() {\n}\n")
+    _write(tmp_path / "yaml" / "node.go", "package yaml\n\ntype Node struct {\n}\n\nfunc (n *Node) Decode() {\n}\n")
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(tmp_path)], cache=False),
+        mdx=[],
+        mdx_config={},
+    )
+
+    def run_godocjson(path: Path) -> dict:
+        source = str(path / ("load.go" if path.name == "pkg" else "node.go"))
+        func = {"name": "Load", "type": "func", "filename": source, "line": 3, "parameters": [], "results": []}
+        method = {**func, "name": "Decode", "line": 6}
+        node = {"name": "Node", "type": "type", "packageImportPath": str(path), "methods": [method]}
+        return {
+            "type": "package",
+            "name": path.name,
+            "doc": "",
+            "filenames": [source],
+            "funcs": [func],
+            "types": [node] if path.name == "yaml" else [],
+        }
+
+    monkeypatch.setattr(handler._collector, "collect", run_godocjson)
+    assert handler.collect("github.com/org/repo/pkg.Load", GoOptions())["name"] == "Load"
+    assert handler.collect("github.com/org/repo/pkg", GoOptions())["name"] == "pkg"
+    assert handler.collect("gopkg.in/yaml.v3.Node.Decode", GoOptions())["name"] == "Decode"
+    assert handler.collect("gopkg.in/yaml.v3", GoOptions())["name"] == "yaml"
+    assert handler.collect("pkg.Load", GoOptions())["name"] == "Load"
+    with pytest.raises(ValueError, match="Invalid FQN"):
+        handler.collect("pkg.Node.Decode.Extra", GoOptions())
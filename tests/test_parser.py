@@ -0,0 +1,159 @@
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.go._internal.config import GoConfig, GoOptions
+from mkdocstrings_handlers.go._internal.handler import GoHandler
+from mkdocstrings_handlers.go._internal.parser import _parse_package
+
+_GODOCJSON = Path("~/go/bin/godocjson").expanduser()
+
+_SOURCES = {
+    "doc.go": """// Package store keeps things.
+//
+//go:generate echo
+package store
+
+import (
+\t"fmt"
+\tstr "strings"
+)
+
+// Kind is a kind.
+type Kind int
+
+// Kinds.
+const (
+\tSmall Kind = iota
+\tLarge
+\thuge
+)
+
+// Limit is the maximum size.
+const Limit = 10
+
+var ErrMissing, errHidden = fmt.Errorf("missing"), str.ToUpper("")
+""",
+    "store.go": """package store
+
+import "fmt"
+
+type base struct{}
+
+// Close closes.
+func (b *base) Close() error { return nil }
+
+func (b base) Name() string { if true { return "}" }; return "" }
+
+// Store stores values.
+type Store[K comparable, V any] struct {
+\tbase
+\tfmt.Stringer
+\tItems, Spare map[K]V `json:"items"`
+\tlimit int
+\tHook func(k K) (v V, err error) // Hook is called.
+}
+
+// Open opens a store.
+func Open[K comparable, V any](path string, kinds ...Kind) (*Store[K, V], error) {
+\treturn nil, nil
+}
+
+/*
+Kinds lists
+  all kinds.
+*/
+func Kinds() []Kind { return nil }
+
+// Get gets.
+func (s *Store[K, V]) Get(k K) (v V, ok bool) { return }
+
+func Walk(fn func(string, int) bool, ch <-chan struct{ X int }) {}
+
+func internal() {}
+""",
+    "store_test.go": "package store_test\n\nfunc TestStore() {}\n",
+}
+
+
+@pytest.fixture(name="package")
+def fixture_package(tmp_path: Path) -> Path:
+    directory = tmp_path / "store"
+    directory.mkdir()
+    for name, text in _SOURCES.items():
+        (directory / name).write_text(text, encoding="utf-8")
+    return directory
+
+
+def test_parse_package(package: Path) -> None:
+    data = _parse_package(package)
+    assert data["name"] == "store"
+    assert data["doc"] == "Package store keeps things.\n"
+    assert data["imports"] == ["fmt", "strings"]
+    assert data["filenames"] == [str(package / "doc.go"), str(package / "store.go")]
+    assert [const["names"] for const in data["consts"]] == [["Limit"]]
+    # Unexported names are blanked out when there are values.
+    assert [var["names"] for var in data["vars"]] == [["ErrMissing", "_"]]
+    assert [func["name"] for func in data["funcs"]] == ["Walk"]
+    assert [param["type"] for param in data["funcs"][0]["parameters"]] == [
+        "func(string, int) bool",
+        "<-chan struct{ X int }",
+    ]
+
+    kind, store = data["types"]
+    assert kind["consts"][0]["names"] == ["Small", "Large"]
+    assert kind["consts"][0]["doc"] == "Kinds.\n"
+    assert [func["name"] for func in kind["funcs"]] == ["Kinds"]
+    assert kind["funcs"][0]["doc"] == "Kinds lists\n  all kinds.\n"
+
+    assert store["doc"] == "Store stores values.\n"
+    # Only exported fields are documented, embedded ones by their type.
+    assert store["fields"] == [
+        {"name": "fmt.Stringer", "type": ""},
+        {"name": "Items", "type": "map[K]V"},
+        {"name": "Spare", "type": "map[K]V"},
+        {"name": "Hook", "type": "func(k K) (v V, err error)"},
+    ]
+    open_func = store["funcs"][0]
+    assert open_func["name"] == "Open"
+    assert open_func["line"] == 22
+    assert open_func["parameters"] == [{"type": "string", "name": "path"}, {"type": "...Kind", "name": "kinds"}]
+    assert open_func["results"] == [{"type": "*Store[K, V]", "name": ""}, {"type": "error", "name": ""}]
+    # Methods of unexported embedded types are promoted.
+    assert [(method["name"], method["recv"], method["orig"]) for method in store["methods"]] == [
+        ("Close", "*Store", "*base"),
+        ("Get", "*Store[K, V]", "*Store[K, V]"),
+        ("Name", "Store", "base"),
+    ]
+
+
+@pytest.mark.skipif(not _GODOCJSON.exists(), reason="godocjson is not installed")
+def test_parity_with_godocjson(package: Path) -> None:
+    # With several packages in a directory, godocjson documents any of them.
+    (package / "store_test.go").unlink()
+    result = subprocess.run([_GODOCJSON, package], capture_output=True, text=True, check=True)  # noqa: S603
+    expected = json.loads(result.stdout)
+    data = _parse_package(package)
+    for typ in data["types"]:
+        typ.pop("fields", None)
+    assert data == expected
+
+
+def test_empty_package(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="empty"):
+        _parse_package(tmp_path)
+
+
+def test_collect_with_python_collector(package: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = GoHandler(
+        base_dir=Path("."),
+        config=GoConfig.from_data(paths=[str(package.parent)], cache=False, collector="python"),
+        mdx=[],
+        mdx_config={},
+    )
+    assert handler._collector.name == "python"
+    monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: pytest.fail(f"Ran {args}"))
+    assert handler.collect("store.Store.Get", GoOptions())["name"] == "Get"
+    assert handler.collect("store.Limit", GoOptions())["names"] == ["Limit"]
@@ -1,6 +1,15 @@
+import functools
 import re
+from pathlib import Path
+from typing import Callable
 
-from mkdocstrings_handlers.go._internal import config, handler
+import pytest
+from markdown.extensions.toc import TocExtension, slugify
+
+from mkdocstrings_handlers.go._internal import config, handler, rendering
+from mkdocstrings_handlers.go._internal import handler as handler_module
+from mkdocstrings_handlers.go._internal.cache import _DiskCache, _MemoryCache
+from mkdocstrings_handlers.go._internal.signatures import _const_signature, _func_signature, _struct_signature
 
 
 def normalize_html(html: str) -> str:
@@ -313,3 +322,142 @@ def test_const_alone(handler : handler.GoHandler) -> None:
             </div>"""
     assert normalize_html(html) == normalize_html(res)
 
+
+
+def test_rendered_html_reused(handler: handler.GoHandler, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    handler._fragment_cache = _DiskCache(tmp_path / "html", 1024 * 1024)
+    data = {
+        "packageName": "utils",
+        "packageImportPath": "test_folder",
+        "doc": "A constant\n",
+        "names": ["Reused"],
+        "type": "const",
+        "filename": "reused.go",
+        "line": 3,
+        "code": "const Reused = 1\n",
+    }
+    options = config.GoOptions(show_root_heading=True)
+    html = handler.render(data, options)
+    assert (handler._fragment_hits, handler._fragment_misses) == (0, 1)
+    headings = [(heading.tag, dict(heading.attrib)) for heading in handler.get_headings()]
+    assert headings
+
+    def fail(*_: object) -> None:
+        raise AssertionError("templates rendered again")
+
+    monkeypatch.setattr(rendering, "do_get_template", fail)
+    assert handler.render(data, options) == html
+    assert (handler._fragment_hits, handler._fragment_misses) == (1, 1)
+    # Headings are registered again, for the table of contents.
+    assert [(heading.tag, dict(heading.attrib)) for heading in handler.get_headings()] == headings
+    # The fragment is also read back from disk, as in the next build.
+    handler._fragments = _MemoryCache(max_entries=1024)
+    assert handler.render(data, options) == html
+    assert (handler._fragment_hits, handler._fragment_misses) == (2, 1)
+    with pytest.raises(AssertionError, match="templates rendered again"):
+        handler.render(data, config.GoOptions(show_root_heading=False))
+
+
+def test_fragments_invalidated_by_dependencies(handler: handler.GoHandler, monkeypatch: pytest.MonkeyPatch) -> None:
+    data = {"type": "const", "names": ["Reused"], "code": "const Reused = 1\n"}
+    options = config.GoOptions()
+    key = handler._fragment_key(data, options)
+    assert handler._fragment_key(data, options) == key
+
+    get_version = handler_module._get_version
+    monkeypatch.setattr(
+        handler_module,
+        "_get_version",
+        lambda dist="mkdocstrings-go": "0.0.1" if dist == "Pygments" else get_version(dist),
+    )
+    handler._fragment_salt = None
+    assert handler._fragment_key(data, options) != key
+
+
+def test_fragments_salt_stable(handler: handler.GoHandler) -> None:
+    handler.mdx = [TocExtension(slugify=slugify), "admonition"]
+    handler.mdx_config = {"toc": {"slugify": functools.partial(slugify, separator="_")}}
+    handler._fragment_salt = None
+    handler._fragment_key({"type": "const"}, config.GoOptions())
+    # Memory addresses would change the salt, and invalidate the rendered HTML, on every build.
+    assert " at 0x" not in handler._fragment_salt  # type: ignore[operator]
+    assert "markdown.extensions.toc.TocExtension" in handler._fragment_salt  # type: ignore[operator]
+    assert "markdown.extensions.toc.slugify" in handler._fragment_salt  # type: ignore[operator]
+
+
+def test_highlight_cache() -> None:
+    calls = []
+
+    def highlight(src: str, **_: object) -> str:
+        calls.append(src)
+        return f"<code>{src}</code>"
+
+    cache = rendering._HighlightCache(max_size=60)
+    cached_highlight = cache.wrap(highlight)
+    assert cached_highlight("func a()", language="go") == "<code>func a()</code>"
+    cached_highlight("func a()", language="go")
+    cached_highlight("func a()", language="go", linenums=True)
+    assert calls == ["func a()", "func a()"]
+    assert (cache.hits, cache.misses) == (1, 2)
+    # The first entry is evicted to make room.
+    cached_highlight("func b()", language="go")
+    cached_highlight("func a()", language="go")
+    assert calls == ["func a()", "func a()", "func b()", "func a()"]
+
+
+@pytest.mark.parametrize(
+    ("template", "variable", "obj", "build"),
+    [
+        ("signature.html.jinja", "function", {"parameters": [], "results": []}, _func_signature),
+        (
+            "signature.html.jinja",
+            "function",
+            {
+                "parameters": [{"name": "ch", "type": "<-chan int"}, {"name": "", "type": "...string"}],
+                "results": [{"name": "n", "type": "int"}, {"name": "", "type": "error"}],
+            },
+            _func_signature,
+        ),
+        ("struct_signature.html.jinja", "struct", {"name": "Empty"}, _struct_signature),
+        (
+            "struct_signature.html.jinja",
+            "struct",
+            {"name": "Pair", "fields": [{"name": "A", "type": "int"}, {"name": "B", "type": "map[string]any"}]},
+            _struct_signature,
+        ),
+        ("const_signature.html.jinja", "const", {"names": ["Number"]}, _const_signature),
+        ("const_signature.html.jinja", "const", {"names": ["Name", "Other"], "value": '"go"'}, _const_signature),
+    ],
+)
+def test_precomputed_signatures_match_templates(
+    handler: handler.GoHandler,
+    template: str,
+    variable: str,
+    obj: dict,
+    build: Callable[[dict], str],
+) -> None:
+    rendered = handler.env.get_template(template).render(config=config.GoOptions(), **{variable: obj}, signature=True)
+    assert build(obj) == rendered.strip()
+
+
+def test_precomputed_signatures_used(handler: handler.GoHandler) -> None:
+    const = {"names": ["Number"], "type": "const", "signature": "const Precomputed"}
+    context = handler.env.from_string("").new_context({"config": config.GoOptions()})
+    assert rendering._render_signature(context, "const_signature.html.jinja", const, const=const) == "const Precomputed"
+    context = handler.env.from_string("").new_context({"config": config.GoOptions(show_signature=False)})
+    assert rendering._render_signature(context, "const_signature.html.jinja", const, const=const) == ""
+
+
+def test_render_package_tree(handler: handler.GoHandler) -> None:
+    packages = [
+        {"type": "package", "doc": f"{name} doc", "name": name, "importPath": f"/app/{name}", "types": [], "funcs": []}
+        for name in ("store", "web")
+    ]
+    html = handler.render(
+        {"type": "packages", "name": "./...", "packages": packages},
+        config.GoOptions(show_root_heading=True),
+    )
+    assert re.search(r'<h2 id="\./\.\.\."[^>]*>\s*<code>\./\.\.\.</code>', html)
+    for name in ("store", "web"):
+        assert re.search(rf'<h3 id="/app/{name}"[^>]*>\s*<code>{name}</code>', html)
+        assert f"{name} doc" in html
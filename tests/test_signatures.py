@@ -0,0 +1,42 @@
+import pytest
+
+from mkdocstrings_handlers.go._internal.signatures import _split_list, _wrap_signature
+
+
+def test_split_list_ignores_nested_commas() -> None:
+    assert _split_list('f func(a, b int) (int, error), m map[K]V, s struct{ X int `json:"a,b"` },') == [
+        "f func(a, b int) (int, error)",
+        "m map[K]V",
+        's struct{ X int `json:"a,b"` }',
+    ]
+
+
+@pytest.mark.parametrize(
+    ("signature", "expected"),
+    [
+        ("func Short(a int) ()", "func Short(a int) ()"),
+        (
+            "func Handle(w http.ResponseWriter, cb func(a, b int) error) ()",
+            "func Handle(\n\tw http.ResponseWriter,\n\tcb func(a, b int) error,\n) ()",
+        ),
+        (
+            "func Map[T, U any](items []T, f func(T) (U, error)) ([]U, error)",
+            "func Map[T, U any](\n\titems []T,\n\tf func(T) (U, error),\n) ([]U, error)",
+        ),
+        (
+            "func Results() (first VeryLongTypeName, second AnotherLongTypeName)",
+            "func Results() (\n\tfirst VeryLongTypeName,\n\tsecond AnotherLongTypeName,\n)",
+        ),
+        (
+            "func (r *Receiver) Method(first int, second string) (int)",
+            "func (r *Receiver) Method(\n\tfirst int,\n\tsecond string,\n) (int)",
+        ),
+        (
+            "func Generic[Key comparable, Value interface{ ~int | ~string }](m map[Key]Value) ()",
+            "func Generic[\n\tKey comparable,\n\tValue interface{ ~int | ~string },\n](\n\tm map[Key]Value,\n) ()",
+        ),
+        ("func Broken(first int, second string, third bool", "func Broken(first int, second string, third bool"),
+    ],
+)
+def test_wrap_signature(signature: str, expected: str) -> None:
+    assert _wrap_signature(signature, 40) == expected
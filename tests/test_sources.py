@@ -0,0 +1,131 @@
+import os
+from pathlib import Path
+
+from mkdocstrings_handlers.go._internal.helpers import _extract_go_block
+from mkdocstrings_handlers.go._internal.sources import _DeclarationIndex, _scan_declarations, _SourceCache
+
+source = """package shapes
+
+// Usage mentions the types: type Circle struct{}
+const Usage = `
+type Square struct {
+`
+
+func describe() string {
+	type local struct{}
+	return "type Circle"
+}
+
+type Point struct {
+	X, Y int
+}
+
+type (
+	// Circle is round.
+	Circle struct {
+		Center Point
+		Radius float64
+	}
+	Unit = Point
+)
+
+    type Indented interface {
+        Area() float64
+    }
+"""
+
+
+def test_scan_type_declarations() -> None:
+    assert _scan_declarations(source).types == {
+        "Point": 13,
+        "Circle": 19,
+        "Unit": 23,
+        "Indented": 26,
+    }
+
+
+def test_declaration_index_follows_file_changes(tmp_path: Path) -> None:
+    index = _DeclarationIndex(_SourceCache())
+    (tmp_path / "a.go").write_text(source, encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("type Nope struct{}\n", encoding="utf-8")
+    assert index.find_type(str(tmp_path), "Circle") == (str(tmp_path / "a.go"), 19)
+    assert index.find_type(str(tmp_path), "Nope") is None
+
+    (tmp_path / "b.go").write_text("package shapes\n\ntype Nope struct{}\n", encoding="utf-8")
+    assert index.find_type(str(tmp_path), "Nope") == (str(tmp_path / "b.go"), 3)
+
+    (tmp_path / "a.go").write_text("package shapes\n\n\ntype Circle struct{}\n", encoding="utf-8")
+    os.utime(tmp_path / "a.go", ns=(1, 1))
+    assert index.find_type(str(tmp_path), "Circle") == (str(tmp_path / "a.go"), 4)
+
+
+def test_source_cache_reads_each_file_once(tmp_path: Path) -> None:
+    cache = _SourceCache(max_files=2)
+    paths = [str(tmp_path / f"{name}.go") for name in "abc"]
+    for path in paths:
+        Path(path).write_text("package p\n\nvar X int\n", encoding="utf-8")
+
+    lines = cache.lines(paths[0])
+    assert lines == ("package p\n", "\n", "var X int\n")
+    assert cache.lines(paths[0]) is lines
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.lines(paths[1])
+    cache.lines(paths[2])
+    assert len(cache) == 2
+    cache.lines(paths[0])
+    assert (cache.hits, cache.misses) == (1, 4)
+
+    Path(paths[0]).write_text("package p\n", encoding="utf-8")
+    os.utime(paths[0], ns=(1, 1))
+    assert cache.lines(paths[0]) == ("package p\n",)
+    assert (cache.hits, cache.misses) == (1, 5)
+
+
+def test_scan_declaration_spans() -> None:
+    assert _scan_declarations(source).spans == {
+        4: 6,  # const Usage = `...`
+        8: 11,  # func describe
+        13: 15,  # type Point
+        17: 24,  # type (...)
+        19: 22,  # Circle
+        23: 23,  # Unit
+        26: 28,  # type Indented
+    }
+
+
+def test_spans_ignore_brackets_in_strings_and_comments() -> None:
+    text = """package p
+
+import (
+	"fmt"
+)
+
+func Open() string { return "{" }
+
+// Close handles '}' too.
+func Close[T any](values ...T) (
+	n int,
+	err error,
+) {
+	r := '}' /* } */
+	_ = r
+	return len(values), fmt.Errorf("})")
+}
+
+var Total = 1 +
+	2
+
+var (
+	A int
+	B = "(" // )
+)
+"""
+    assert _scan_declarations(text).spans == {3: 5, 7: 7, 10: 17, 19: 20, 22: 25}
+
+
+def test_spans_match_bracket_counting_extractor() -> None:
+    lines = [line + "\n" for line in source.splitlines()]
+    outline = _scan_declarations(source)
+    for start, kind in ((8, "func"), (13, "type"), (19, "type"), (26, "type")):
+        assert lines[start - 1 : outline.spans[start]] == _extract_go_block(lines, start, kind)
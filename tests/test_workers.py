@@ -0,0 +1,132 @@
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from mkdocstrings_handlers.go._internal.collectors import _CollectorOptions, _WorkerCollector
+from mkdocstrings_handlers.go._internal.config import GoConfig, GoOptions
+from mkdocstrings_handlers.go._internal.handler import GoHandler
+from mkdocstrings_handlers.go._internal.workers import _build_worker, _WorkerPool
+
+_GO = shutil.which("go")
+_GODOCJSON = Path("~/go/bin/godocjson").expanduser()
+
+pytestmark = pytest.mark.skipif(_GO is None, reason="Go is not installed")
+
+
+@pytest.fixture(scope="module", name="executable")
+def fixture_executable(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return _build_worker(_GO or "go", tmp_path_factory.mktemp("cache"))
+
+
+@pytest.fixture(name="package")
+def fixture_package(tmp_path: Path) -> Path:
+    directory = tmp_path / "store"
+    directory.mkdir()
+    (directory / "store.go").write_text(
+        "// Package store.\npackage store\n\n// Open opens.\nfunc Open(path string) (*Store, error) { return nil, nil }\n\n"
+        "// Store stores.\ntype Store struct{}\n\n// Get gets.\nfunc (s *Store) Get(key string) string { return key }\n",
+    )
+    return directory
+
+
+@pytest.fixture(name="stuck_worker")
+def fixture_stuck_worker(tmp_path: Path) -> Path:
+    script = tmp_path / "stuck_worker"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        "print('{}', flush=True)\n"
+        "for line in sys.stdin:\n"
+        "    sys.stderr.write('stuck\\n' * 100_000)\n"
+        "    sys.stderr.flush()\n"
+        "    time.sleep(60)\n",
+    )
+    script.chmod(0o755)
+    return script
+
+
+def test_build_once(executable: Path) -> None:
+    assert _build_worker(_GO or "go", executable.parent.parent) == executable
+
+
+def test_pool(executable: Path, package: Path, tmp_path: Path) -> None:
+    pool = _WorkerPool(executable, 2)
+    try:
+        data = pool.request(package)["package"]
+        assert data["name"] == "store"
+        assert [func["name"] for func in data["types"][0]["funcs"]] == ["Open"]
+        assert "error" in pool.request(tmp_path / "missing")
+        assert pool.request(tmp_path) == {}
+
+        # Crashed workers are restarted, and the request sent again.
+        (worker,) = pool._idle
+        worker.process.kill()
+        worker.process.wait()
+        assert pool.request(package)["package"] == data
+        assert pool.restarts == 1
+
+        responses = pool.map([package] * 5)
+        assert all(response["package"] == data for response in responses)  # type: ignore[index]
+        processes = [worker.process for worker in pool._idle]
+        assert 1 <= len(processes) <= 2
+    finally:
+        pool.close()
+    assert all(process.poll() is not None for process in processes)
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.request(package)
+
+
+@pytest.mark.skipif(not _GODOCJSON.exists(), reason="godocjson is not installed")
+def test_parity_with_godocjson(package: Path, tmp_path: Path) -> None:
+    result = subprocess.run([_GODOCJSON, package], capture_output=True, text=True, check=True)  # noqa: S603
+    collector = _WorkerCollector(_CollectorOptions(cache_dir=tmp_path, workers=1))
+    try:
+        assert collector.collect(package) == json.loads(result.stdout)
+        with pytest.raises(ValueError, match="empty"):
+            collector.collect(tmp_path)
+    finally:
+        collector.close()
+
+
+@pytest.mark.usefixtures("package")
+def test_collect_with_workers(tmp_path: Path) -> None:
+    handler = GoHandler(
+        base_dir=tmp_path,
+        config=GoConfig.from_data(paths=["."], collector="worker", cache_dir="cache", workers=2),
+        mdx=[],
+        mdx_config={},
+    )
+    assert handler.collect("store.Store.Get", GoOptions())["name"] == "Get"
+    pool = handler._collector.pool  # type: ignore[attr-defined]
+    handler.teardown()
+    assert not pool._idle
+
+
+def test_stuck_worker_killed(stuck_worker: Path, tmp_path: Path) -> None:
+    pool = _WorkerPool(stuck_worker, 1, timeout=1.0)
+    try:
+        worker = pool._acquire()
+        pool._release(worker)
+        with pytest.raises(TimeoutError):
+            pool.request(tmp_path)
+        # The error output was written to a file, it never blocked the worker.
+        assert worker.error_output.startswith("stuck")
+        assert worker.process.poll() is not None
+        assert pool.restarts == 1
+    finally:
+        pool.close()
+
+
+@pytest.mark.skipif(not _GODOCJSON.exists(), reason="godocjson is not installed")
+def test_stuck_worker_replaced_by_godocjson(stuck_worker: Path, package: Path, tmp_path: Path) -> None:
+    collector = _WorkerCollector(_CollectorOptions(godocjson_path=str(_GODOCJSON), cache_dir=tmp_path, workers=1))
+    collector._pool = _WorkerPool(stuck_worker, 1, timeout=1.0)
+    try:
+        assert collector.collect(package)["name"] == "store"
+        assert collector.collect_many([package])[package]["name"] == "store"  # type: ignore[index]
+    finally:
+        collector.close()